@@ -1,43 +1,122 @@
 """
-Real Estate Module Demonstration Script
-=======================================
+Real Estate Module Simulation Engine
+====================================
 
-This script demonstrates the structure and features of the Real Estate module without requiring
-a running Odoo server. It shows the data models, relationships, and business logic.
+This script mirrors the data models and business rules of the Real Estate module without requiring
+a running Odoo server. It runs scripted market scenarios (listing -> offers -> accept -> sell) over
+millions of events and reports their throughput, to check business-rule changes offline.
+
+    python demo_real_estate.py --scenario balanced --events 2000000
+    python demo_real_estate.py --interactive
 """
 
-import os
+import argparse
+import bisect
+import itertools
+import json
+import random
 import sys
+import time
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
-import json
-from typing import Dict, List, Any, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional
 
 # ----------------------------------------------------------------------------------
 # Mock Odoo Environment
 # ----------------------------------------------------------------------------------
 
+class Index:
+    """Set of record ids supporting O(1) add, discard and random choice"""
+    __slots__ = ('_ids', '_positions')
+
+    def __init__(self):
+        self._ids = []
+        self._positions = {}
+
+    def add(self, record_id):
+        if record_id not in self._positions:
+            self._positions[record_id] = len(self._ids)
+            self._ids.append(record_id)
+
+    def discard(self, record_id):
+        position = self._positions.pop(record_id, None)
+        if position is None:
+            return
+        # Move the last id into the freed slot
+        last = self._ids.pop()
+        if last != record_id:
+            self._ids[position] = last
+            self._positions[last] = position
+
+    def choice(self, rng):
+        return self._ids[int(rng.random() * len(self._ids))] if self._ids else None
+
+    def __contains__(self, record_id):
+        return record_id in self._positions
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+
+class Environment:
+    """Record store of a simulation: id sequences, records and indexes"""
+
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self._sequences = defaultdict(lambda: itertools.count(1))
+        self.records = defaultdict(dict)
+        # Property indexes, by field and value
+        self.indexes = {fname: defaultdict(Index) for fname in Property._indexed}
+
+    def next_id(self, model):
+        return next(self._sequences[model])
+
+    def create(self, model_class, values=None, **kwargs):
+        record = model_class(self, values, **kwargs)
+        self.records[model_class._name][record.id] = record
+        return record
+
+    def browse(self, model_class, record_id):
+        return self.records[model_class._name].get(record_id)
+
+    def search(self, fname, value):
+        """Ids of the properties having the given value, from the indexes"""
+        return self.indexes[fname][value]
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+
 class Model:
-    """Base class to mimic Odoo's model system"""
+    """Base class to mimic Odoo's model system, with one slot per field"""
+    __slots__ = ('env', 'id')
     _name = None
     _description = None
     _order = None
-    
-    def __init__(self, values=None):
-        self.id = id(self)
-        self._values = values or {}
-        for key, value in self._values.items():
+    # Default values of the fields, callables are called on creation
+    _defaults: Dict[str, Any] = {}
+
+    def __init__(self, env, values=None):
+        self.env = env
+        self.id = env.next_id(self._name)
+        for key, default in self._defaults.items():
+            setattr(self, key, default() if callable(default) else default)
+        for key, value in (values or {}).items():
             setattr(self, key, value)
-    
+
     def write(self, values):
         """Update record values"""
         for key, value in values.items():
             setattr(self, key, value)
-            self._values[key] = value
         return True
-    
+
     def get_values(self):
         """Get all values as a dictionary"""
-        return {k: getattr(self, k, None) for k in self._values.keys()}
+        return {key: getattr(self, key) for key in self._defaults}
 
     def __str__(self):
         return f"{self._name}({self.id})"
@@ -55,19 +134,17 @@ class PropertyType(Model):
     _name = 'real.estate.property.type'
     _description = 'Real Estate Property Type'
     _order = 'sequence, name'
-    
-    def __init__(self, values=None):
-        values = values or {}
-        default_values = {
-            'name': '',
-            'sequence': 10,
-            'property_ids': [],
-            'property_count': 0,
-            'description': '',
-            'color': 0,
-        }
-        default_values.update(values)
-        super().__init__(default_values)
+    _defaults = {
+        'name': '',
+        'sequence': 10,
+        'description': '',
+        'color': 0,
+    }
+    __slots__ = tuple(_defaults)
+
+    @property
+    def property_count(self):
+        return len(self.env.search('property_type_id', self.id))
 
 
 class PropertyTag(Model):
@@ -75,15 +152,11 @@ class PropertyTag(Model):
     _name = 'real.estate.property.tag'
     _description = 'Real Estate Property Tag'
     _order = 'name'
-    
-    def __init__(self, values=None):
-        values = values or {}
-        default_values = {
-            'name': '',
-            'color': 0,
-        }
-        default_values.update(values)
-        super().__init__(default_values)
+    _defaults = {
+        'name': '',
+        'color': 0,
+    }
+    __slots__ = tuple(_defaults)
 
 
 class PropertyImage(Model):
@@ -91,18 +164,14 @@ class PropertyImage(Model):
     _name = 'real.estate.property.image'
     _description = 'Property Image'
     _order = 'sequence, id'
-    
-    def __init__(self, values=None):
-        values = values or {}
-        default_values = {
-            'name': '',
-            'sequence': 10,
-            'image': None,  # This would be binary data in real Odoo
-            'property_id': None,
-            'description': '',
-        }
-        default_values.update(values)
-        super().__init__(default_values)
+    _defaults = {
+        'name': '',
+        'sequence': 10,
+        'image': None,  # This would be binary data in real Odoo
+        'property_id': None,
+        'description': '',
+    }
+    __slots__ = tuple(_defaults)
 
 
 class PropertyOffer(Model):
@@ -110,45 +179,64 @@ class PropertyOffer(Model):
     _name = 'real.estate.property.offer'
     _description = 'Real Estate Property Offer'
     _order = 'price desc'
-    
-    def __init__(self, values=None, property_obj=None):
-        values = values or {}
-        default_values = {
-            'price': 0.0,
-            'status': 'pending',  # pending, accepted, refused
-            'partner_id': None,  # Would be res.partner in real Odoo
-            'property_id': property_obj.id if property_obj else None,
-            'validity': 7,
-            'date_deadline': (datetime.now() + timedelta(days=7)).date(),
-            'create_date': datetime.now(),
-        }
-        default_values.update(values)
-        super().__init__(default_values)
+    _defaults = {
+        'price': 0.0,
+        'status': 'pending',  # pending, accepted, refused
+        'partner_id': None,  # Would be res.partner in real Odoo
+        'property_id': None,
+        'validity': 7,
+        'date_deadline': lambda: (datetime.now() + timedelta(days=7)).date(),
+        'create_date': datetime.now,
+    }
+    __slots__ = tuple(_defaults) + ('_property',)
+
+    def __init__(self, env, values=None, property_obj=None):
+        super().__init__(env, values)
         self._property = property_obj
-    
+        if property_obj:
+            self.property_id = property_obj.id
+
+    def _check_accept(self):
+        """Return why this offer cannot be accepted, or None"""
+        prop = self._property
+        if not prop:
+            return "Property not found for this offer"
+        if prop.state in ['offer_accepted', 'sold', 'canceled']:
+            return f"Cannot accept an offer for a property in '{prop.state}' state"
+        # The selling price constraint of the property
+        if self.price < prop.expected_price * 0.9:
+            return "The selling price cannot be lower than 90% of the expected price"
+        return None
+
     def action_accept(self):
-        """Accept this offer"""
-        if not self._property:
-            print("Error: Property not found for this offer")
+        """Accept this offer, refusing the other offers of the property"""
+        error = self._check_accept()
+        if error:
+            self.env.log(f"Error: {error}")
             return False
-        
-        # Update offer status
-        self.write({'status': 'accepted'})
-        
+        self._accept()
+        self.env.log(f"✅ Offer accepted: ${self.price} from {self.partner_id}")
+        return True
+
+    def _accept(self):
+        """Accept this offer once checked by ``_check_accept``"""
+        prop = self._property
+        for offer in prop.offers:
+            if offer is not self and offer.status != 'refused':
+                offer.status = 'refused'
+        self.status = 'accepted'
+
         # Update property state and selling info
-        self._property.write({
+        prop.write({
             'state': 'offer_accepted',
             'selling_price': self.price,
             'buyer_id': self.partner_id,
         })
-        
-        print(f"✅ Offer accepted: ${self.price} from {self.partner_id}")
-        return True
-    
+
     def action_refuse(self):
         """Refuse this offer"""
-        self.write({'status': 'refused'})
-        print(f"❌ Offer refused: ${self.price} from {self.partner_id}")
+        self.status = 'refused'
+        self.env.log(f"❌ Offer refused: ${self.price} from {self.partner_id}")
         return True
 
 
@@ -157,154 +245,323 @@ class Property(Model):
     _name = 'real.estate.property'
     _description = 'Real Estate Property'
     _order = 'id desc'
-    
-    def __init__(self, values=None):
-        values = values or {}
-        default_values = {
-            'name': '',
-            'description': '',
-            'postcode': '',
-            'date_availability': (datetime.now() + timedelta(days=90)).date(),
-            'expected_price': 0.0,
-            'selling_price': 0.0,
-            'bedrooms': 2,
-            'living_area': 0,
-            'facades': 0,
-            'garage': False,
-            'garden': False,
-            'garden_area': 0,
-            'garden_orientation': False,  # north, south, east, west
-            'state': 'new',  # new, offer_received, offer_accepted, sold, canceled
-            'active': True,
-            'property_type_id': None,
-            'user_id': None,  # Would be res.users in real Odoo
-            'buyer_id': None,  # Would be res.partner in real Odoo
-            'tag_ids': [],  # Would be m2m in real Odoo
-            'offer_ids': [],  # Would be o2m in real Odoo
-            'total_area': 0,
-            'best_offer': 0.0,
-            'address': '',
-            'city': '',
-            'country_id': None,
-            'property_image_ids': [],
-            'main_image_id': None,
-            'amenities': '',
-            'furnished': False,
-        }
-        default_values.update(values)
-        super().__init__(default_values)
-        self._offers = []
-        
+    _defaults = {
+        'name': '',
+        'description': '',
+        'postcode': '',
+        'date_availability': lambda: (datetime.now() + timedelta(days=90)).date(),
+        'expected_price': 0.0,
+        'selling_price': 0.0,
+        'bedrooms': 2,
+        'living_area': 0,
+        'facades': 0,
+        'garage': False,
+        'garden': False,
+        'garden_area': 0,
+        'garden_orientation': False,  # north, south, east, west
+        'state': 'new',  # new, offer_received, offer_accepted, sold, canceled
+        'active': True,
+        'property_type_id': None,
+        'user_id': None,  # Would be res.users in real Odoo
+        'buyer_id': None,  # Would be res.partner in real Odoo
+        'tag_ids': set,  # Would be m2m in real Odoo
+        'total_area': 0,
+        'best_offer': 0.0,
+        'address': '',
+        'city': '',
+        'country_id': None,
+        'main_image_id': None,
+        'amenities': '',
+        'furnished': False,
+    }
+    # Offers of the property, in creation (hence ascending price) order
+    __slots__ = tuple(_defaults) + ('offers',)
+    # Fields with an index in the environment
+    _indexed = ('state', 'property_type_id', 'tag_ids', 'city')
+
+    def __init__(self, env, values=None):
+        super().__init__(env, values)
+        self.offers = []
+
         # Handle garden defaults
         if self.garden and self.garden_area == 0:
             self.garden_area = 10
             self.garden_orientation = 'north'
-            
+
         # Calculate derived fields
         self._compute_total_area()
-    
+        self._add_to_indexes()
+
+    def _add_to_indexes(self):
+        indexes = self.env.indexes
+        indexes['state'][self.state].add(self.id)
+        indexes['property_type_id'][self.property_type_id].add(self.id)
+        indexes['city'][self.city].add(self.id)
+        for tag_id in self.tag_ids:
+            indexes['tag_ids'][tag_id].add(self.id)
+
+    def write(self, values):
+        """Update record values and the indexes of the changed fields"""
+        indexes = self.env.indexes
+        for key, value in values.items():
+            if key in indexes:
+                if key == 'tag_ids':
+                    for tag_id in self.tag_ids - value:
+                        indexes[key][tag_id].discard(self.id)
+                    for tag_id in value - self.tag_ids:
+                        indexes[key][tag_id].add(self.id)
+                    value = set(value)
+                else:
+                    indexes[key][getattr(self, key)].discard(self.id)
+                    indexes[key][value].add(self.id)
+            setattr(self, key, value)
+        if 'living_area' in values or 'garden_area' in values:
+            self._compute_total_area()
+        return True
+
     def _compute_total_area(self):
         """Compute the total area"""
         self.total_area = self.living_area + self.garden_area
-    
+
     def _compute_best_offer(self):
         """Compute best offer"""
-        if self._offers:
-            self.best_offer = max(offer.price for offer in self._offers)
-        else:
-            self.best_offer = 0.0
-    
+        self.best_offer = max((offer.price for offer in self.offers), default=0.0)
+
+    def _check_offer(self, price):
+        """Return why an offer at ``price`` is refused, or None"""
+        if self.state in ['sold', 'canceled']:
+            return f"Cannot create offer for property in '{self.state}' state"
+
+        # Offers are created in ascending price order, the best one is the max
+        if self.offers and price <= self.best_offer:
+            return f"Offer must be higher than ${self.best_offer}"
+        return None
+
     def create_offer(self, price, partner_id):
         """Create a new offer for this property"""
-        if self.state in ['sold', 'canceled']:
-            print(f"Error: Cannot create offer for property in '{self.state}' state")
+        error = self._check_offer(price)
+        if error:
+            self.env.log(f"Error: {error}")
             return None
-            
-        # Check if price is higher than existing offers
-        if self._offers:
-            max_offer = max(offer.price for offer in self._offers)
-            if price <= max_offer:
-                print(f"Error: Offer must be higher than ${max_offer}")
-                return None
-        
-        # Create the offer
-        offer = PropertyOffer({
+        offer = self._add_offer(price, partner_id)
+        self.env.log(f"🏠 New offer created: ${price} for property '{self.name}'")
+        return offer
+
+    def _add_offer(self, price, partner_id):
+        """Create an offer once checked by ``_check_offer``"""
+        offer = self.env.create(PropertyOffer, {
             'price': price,
             'partner_id': partner_id,
-            'property_id': self.id,
         }, property_obj=self)
-        
-        self._offers.append(offer)
-        self.offer_ids.append(offer.id)
-        
+        self.offers.append(offer)
+        # A concurrent writer may have added a better offer since the check
+        self.best_offer = max(self.best_offer, price)
+
         # Update state if this is the first offer
         if self.state == 'new':
-            self.state = 'offer_received'
-            
-        # Update best offer
-        self._compute_best_offer()
-        
-        print(f"🏠 New offer created: ${price} for property '{self.name}'")
+            self.write({'state': 'offer_received'})
         return offer
-    
+
     def action_sold(self):
         """Mark the property as sold"""
         if self.state == 'canceled':
-            print("Error: Canceled properties cannot be sold")
+            self.env.log("Error: Canceled properties cannot be sold")
             return False
         if not self.buyer_id:
-            print("Error: Cannot sell a property without a buyer")
+            self.env.log("Error: Cannot sell a property without a buyer")
             return False
-            
-        self.state = 'sold'
-        print(f"🎉 Property sold: '{self.name}' for ${self.selling_price}")
+
+        self.write({'state': 'sold'})
+        self.env.log(f"🎉 Property sold: '{self.name}' for ${self.selling_price}")
         return True
-    
+
     def action_cancel(self):
         """Cancel the property"""
         if self.state == 'sold':
-            print("Error: Sold properties cannot be canceled")
+            self.env.log("Error: Sold properties cannot be canceled")
             return False
-            
-        self.state = 'canceled'
-        print(f"🚫 Property canceled: '{self.name}'")
+
+        self.write({'state': 'canceled'})
+        self.env.log(f"🚫 Property canceled: '{self.name}'")
         return True
-    
+
     def add_tag(self, tag):
         """Add a tag to the property"""
         if tag.id not in self.tag_ids:
-            self.tag_ids.append(tag.id)
-            print(f"🏷️ Tag added: '{tag.name}' to property '{self.name}'")
+            self.write({'tag_ids': self.tag_ids | {tag.id}})
+            self.env.log(f"🏷️ Tag added: '{tag.name}' to property '{self.name}'")
         return True
-    
+
     def set_property_type(self, property_type):
         """Set the property type"""
-        self.property_type_id = property_type.id
-        print(f"🏢 Property type set: '{property_type.name}' for property '{self.name}'")
+        self.write({'property_type_id': property_type.id})
+        self.env.log(f"🏢 Property type set: '{property_type.name}' for property '{self.name}'")
         return True
 
 
+# ----------------------------------------------------------------------------------
+# Market Scenarios
+# ----------------------------------------------------------------------------------
+
+CITIES = ['New York', 'Miami', 'Chicago', 'Los Angeles', 'Houston', 'Boston', 'Seattle', 'Denver']
+
+# Relative weights of the events of each scenario
+SCENARIOS = {
+    'balanced': {'list': 20, 'offer': 50, 'accept': 12, 'sell': 10, 'refuse': 5, 'cancel': 3},
+    'hot': {'list': 10, 'offer': 70, 'accept': 10, 'sell': 8, 'refuse': 1, 'cancel': 1},
+    'cold': {'list': 35, 'offer': 30, 'accept': 8, 'sell': 6, 'refuse': 11, 'cancel': 10},
+}
+
+
+class MarketSimulation:
+    """Run a stream of random market events against an environment"""
+
+    def __init__(self, env, scenario='balanced', seed=0):
+        self.env = env
+        self.rng = random.Random(seed)
+        weights = SCENARIOS[scenario]
+        self.events = list(weights)
+        self.thresholds = list(itertools.accumulate(weights.values()))
+        self.handlers = {event: getattr(self, f'_event_{event}') for event in self.events}
+        self.done = Counter()
+        self.skipped = Counter()
+        self.types = [env.create(PropertyType, {'name': name, 'sequence': sequence})
+                      for sequence, name in enumerate(['Apartment', 'House', 'Commercial', 'Land'], 1)]
+        self.tags = [env.create(PropertyTag, {'name': name, 'color': color})
+                     for color, name in enumerate(['Renovated', 'Sea View', 'Garden', 'City Center', 'Luxury'], 1)]
+        self.partners = [f'Buyer {index}' for index in range(1, 1001)]
+
+    def _pick(self, *states):
+        """Random property in one of the given states"""
+        indexes = [self.env.search('state', state) for state in states]
+        total = sum(len(index) for index in indexes)
+        if not total:
+            return None
+        position = int(self.rng.random() * total)
+        for index in indexes:
+            if position < len(index):
+                return self.env.browse(Property, index.choice(self.rng))
+            position -= len(index)
+
+    def _event_list(self):
+        rng = self.rng
+        garden = rng.random() < 0.4
+        return self.env.create(Property, {
+            'name': 'Listing',
+            'expected_price': float(rng.randrange(100_000, 1_000_000, 1000)),
+            'bedrooms': rng.randint(1, 5),
+            'living_area': rng.randint(40, 300),
+            'garden': garden,
+            'garden_area': rng.randint(10, 500) if garden else 0,
+            'garage': rng.random() < 0.5,
+            'city': rng.choice(CITIES),
+            'property_type_id': rng.choice(self.types).id,
+            'tag_ids': {tag.id for tag in rng.sample(self.tags, rng.randint(0, 3))},
+        })
+
+    def _event_offer(self):
+        prop = self._pick('new', 'offer_received')
+        if not prop:
+            return None
+        base = max(prop.best_offer, prop.expected_price * 0.8)
+        price = round(base * (1 + self.rng.uniform(0.005, 0.05)), 2)
+        return prop.create_offer(price, self.rng.choice(self.partners))
+
+    def _event_accept(self):
+        prop = self._pick('offer_received')
+        if not prop:
+            return None
+        pending = [offer for offer in prop.offers if offer.status == 'pending']
+        return pending and pending[-1].action_accept()
+
+    def _event_refuse(self):
+        prop = self._pick('offer_received')
+        if not prop:
+            return None
+        pending = [offer for offer in prop.offers if offer.status == 'pending']
+        return pending and pending[0].action_refuse()
+
+    def _event_sell(self):
+        prop = self._pick('offer_accepted')
+        return prop and prop.action_sold()
+
+    def _event_cancel(self):
+        prop = self._pick('new', 'offer_received')
+        return prop and prop.action_cancel()
+
+    def run(self, count, progress=0) -> Iterator[Dict[str, Any]]:
+        """Run ``count`` events, yielding a progress report every ``progress``
+        events and a final one"""
+        rng, events, thresholds, handlers = self.rng, self.events, self.thresholds, self.handlers
+        total = thresholds[-1]
+        start = last = time.perf_counter()
+        last_count = 0
+        for number in range(1, count + 1):
+            event = events[bisect.bisect_right(thresholds, rng.random() * total)]
+            if handlers[event]():
+                self.done[event] += 1
+            else:
+                self.skipped[event] += 1
+            # The last event is covered by the final report
+            if progress and not number % progress and number < count:
+                now = time.perf_counter()
+                yield self.report(number, now - start, (number - last_count) / (now - last))
+                last, last_count = now, number
+        elapsed = time.perf_counter() - start
+        yield self.report(count, elapsed, count / elapsed if elapsed else 0.0)
+
+    def report(self, count, elapsed, throughput):
+        """Throughput and market figures after ``count`` events"""
+        env = self.env
+        return {
+            'events': count,
+            'elapsed': round(elapsed, 3),
+            'events_per_second': round(throughput),
+            'done': dict(self.done),
+            'skipped': dict(self.skipped),
+            'properties': len(env.records[Property._name]),
+            'offers': len(env.records[PropertyOffer._name]),
+            'by_state': {state: len(index) for state, index in env.indexes['state'].items()},
+            'by_type': {t.name: t.property_count for t in self.types},
+            'by_tag': {tag.name: len(env.search('tag_ids', tag.id)) for tag in self.tags},
+            'by_city': {city: len(env.search('city', city)) for city in CITIES},
+        }
+
+
+def print_report(report):
+    """Display a simulation report in a formatted way"""
+    print("=" * 60)
+    print(f"📈 {report['events']:,} events in {report['elapsed']:.2f}s "
+          f"({report['events_per_second']:,} events/s)")
+    print("=" * 60)
+    print(f"Properties: {report['properties']:,} - Offers: {report['offers']:,}")
+    for title, key in [('Events', 'done'), ('Skipped', 'skipped'), ('By state', 'by_state'),
+                       ('By type', 'by_type'), ('By tag', 'by_tag'), ('By city', 'by_city')]:
+        print(f"{title}: " + ", ".join(f"{name} {count:,}" for name, count in report[key].items()))
+    print()
+
+
 # ----------------------------------------------------------------------------------
 # Demo Functions
 # ----------------------------------------------------------------------------------
 
-def create_demo_data():
+def create_demo_data(env):
     """Create demo data for the real estate module"""
     # Create property types
-    apartment = PropertyType({'name': 'Apartment', 'sequence': 10})
-    house = PropertyType({'name': 'House', 'sequence': 20})
-    commercial = PropertyType({'name': 'Commercial', 'sequence': 30})
-    land = PropertyType({'name': 'Land', 'sequence': 40})
-    
+    apartment = env.create(PropertyType, {'name': 'Apartment', 'sequence': 10})
+    house = env.create(PropertyType, {'name': 'House', 'sequence': 20})
+    commercial = env.create(PropertyType, {'name': 'Commercial', 'sequence': 30})
+    land = env.create(PropertyType, {'name': 'Land', 'sequence': 40})
+
     # Create property tags
-    renovated = PropertyTag({'name': 'Renovated', 'color': 1})
-    sea_view = PropertyTag({'name': 'Sea View', 'color': 2})
-    garden = PropertyTag({'name': 'Garden', 'color': 3})
-    city_center = PropertyTag({'name': 'City Center', 'color': 4})
-    luxury = PropertyTag({'name': 'Luxury', 'color': 5})
-    
+    renovated = env.create(PropertyTag, {'name': 'Renovated', 'color': 1})
+    sea_view = env.create(PropertyTag, {'name': 'Sea View', 'color': 2})
+    garden = env.create(PropertyTag, {'name': 'Garden', 'color': 3})
+    city_center = env.create(PropertyTag, {'name': 'City Center', 'color': 4})
+    luxury = env.create(PropertyTag, {'name': 'Luxury', 'color': 5})
+
     # Create properties
-    p1 = Property({
+    p1 = env.create(Property, {
         'name': 'Modern Apartment in City Center',
         'description': 'A beautiful modern apartment in the heart of the city.',
         'expected_price': 250000,
@@ -319,8 +576,8 @@ def create_demo_data():
     p1.set_property_type(apartment)
     p1.add_tag(renovated)
     p1.add_tag(city_center)
-    
-    p2 = Property({
+
+    p2 = env.create(Property, {
         'name': 'Luxury Beach House',
         'description': 'Stunning beach house with amazing ocean views.',
         'expected_price': 750000,
@@ -339,8 +596,8 @@ def create_demo_data():
     p2.add_tag(sea_view)
     p2.add_tag(luxury)
     p2.add_tag(garden)
-    
-    p3 = Property({
+
+    p3 = env.create(Property, {
         'name': 'Commercial Office Space',
         'description': 'Prime location commercial office space for business use.',
         'expected_price': 500000,
@@ -352,15 +609,15 @@ def create_demo_data():
     })
     p3.set_property_type(commercial)
     p3.add_tag(city_center)
-    
+
     # Create offers
     p1.create_offer(230000, 'Alice Brown')
     p1.create_offer(240000, 'Bob Wilson')
-    
+
     p2.create_offer(700000, 'Charlie Davis')
     offer = p2.create_offer(730000, 'Diana Evans')
     offer.action_accept()
-    
+
     return {
         'property_types': [apartment, house, commercial, land],
         'property_tags': [renovated, sea_view, garden, city_center, luxury],
@@ -370,20 +627,21 @@ def create_demo_data():
 
 def display_property(property_obj):
     """Display property details in a formatted way"""
+    env = property_obj.env
     print("=" * 60)
     print(f"🏠 {property_obj.name}")
     print("=" * 60)
-    
+
     # Basic information
     print(f"Description: {property_obj.description}")
     print(f"Status: {property_obj.state}")
     print(f"Expected Price: ${property_obj.expected_price}")
     if property_obj.selling_price:
         print(f"Selling Price: ${property_obj.selling_price}")
-    
+
     # Location
     print(f"Location: {property_obj.address}, {property_obj.city}")
-    
+
     # Features
     print(f"Bedrooms: {property_obj.bedrooms}")
     print(f"Living Area: {property_obj.living_area} sqm")
@@ -394,29 +652,29 @@ def display_property(property_obj):
         print(f"✓ Garden: {property_obj.garden_area} sqm, {property_obj.garden_orientation} orientation")
     if property_obj.furnished:
         print("✓ Furnished")
-    
+
     # Amenities
     if property_obj.amenities:
         print(f"Amenities: {property_obj.amenities}")
-    
+
     # Salesperson
     print(f"Salesperson: {property_obj.user_id}")
-    
+
     # Tags
     if property_obj.tag_ids:
-        print("Tags: " + ", ".join([str(tag_id) for tag_id in property_obj.tag_ids]))
-    
+        print("Tags: " + ", ".join(env.browse(PropertyTag, tag_id).name for tag_id in sorted(property_obj.tag_ids)))
+
     # Offers
-    if property_obj._offers:
+    if property_obj.offers:
         print("\nOffers:")
-        for i, offer in enumerate(property_obj._offers, 1):
+        for i, offer in enumerate(property_obj.offers, 1):
             print(f"  {i}. ${offer.price} from {offer.partner_id} - Status: {offer.status}")
             print(f"     Deadline: {offer.date_deadline}")
-    
+
     # Buyer (if sold)
     if property_obj.state in ['offer_accepted', 'sold'] and property_obj.buyer_id:
         print(f"\nBuyer: {property_obj.buyer_id}")
-    
+
     print()
 
 
@@ -425,15 +683,16 @@ def interactive_demo():
     print("\n" + "=" * 80)
     print(" 🏢 REAL ESTATE MANAGEMENT MODULE DEMO".center(80))
     print("=" * 80 + "\n")
-    
+
     # Create demo data
     print("Initializing demo data...")
-    data = create_demo_data()
-    
+    env = Environment(verbose=True)
+    data = create_demo_data(env)
+
     properties = data['properties']
     property_types = data['property_types']
     property_tags = data['property_tags']
-    
+
     while True:
         print("\nMain Menu:")
         print("1. View all properties")
@@ -444,25 +703,25 @@ def interactive_demo():
         print("6. View property types")
         print("7. View property tags")
         print("8. Exit")
-        
+
         choice = input("\nSelect an option (1-8): ")
-        
+
         if choice == '1':
             # View all properties
             print("\nAll Properties:")
             for i, prop in enumerate(properties, 1):
                 print(f"{i}. {prop.name} - {prop.state} - ${prop.expected_price}")
-        
+
         elif choice == '2':
             # View property details
             if not properties:
                 print("No properties available.")
                 continue
-                
+
             print("\nSelect a property to view details:")
             for i, prop in enumerate(properties, 1):
                 print(f"{i}. {prop.name}")
-                
+
             try:
                 idx = int(input("Enter property number: ")) - 1
                 if 0 <= idx < len(properties):
@@ -471,7 +730,7 @@ def interactive_demo():
                     print("Invalid property number.")
             except ValueError:
                 print("Please enter a valid number.")
-        
+
         elif choice == '3':
             # Create a new property
             name = input("Property Title: ")
@@ -479,15 +738,15 @@ def interactive_demo():
             price = float(input("Expected Price: "))
             bedrooms = int(input("Bedrooms: "))
             area = int(input("Living Area (sqm): "))
-            
+
             print("\nSelect a property type:")
             for i, t in enumerate(property_types, 1):
                 print(f"{i}. {t.name}")
-            
+
             try:
                 type_idx = int(input("Enter type number: ")) - 1
                 if 0 <= type_idx < len(property_types):
-                    prop = Property({
+                    prop = env.create(Property, {
                         'name': name,
                         'description': desc,
                         'expected_price': price,
@@ -502,18 +761,18 @@ def interactive_demo():
                     print("Invalid type number.")
             except ValueError:
                 print("Please enter a valid number.")
-        
+
         elif choice == '4':
             # Create an offer for a property
             if not properties:
                 print("No properties available.")
                 continue
-                
+
             print("\nSelect a property to make an offer:")
             for i, prop in enumerate(properties, 1):
                 if prop.state not in ['sold', 'canceled']:
                     print(f"{i}. {prop.name} - Expected: ${prop.expected_price}")
-                
+
             try:
                 idx = int(input("Enter property number: ")) - 1
                 if 0 <= idx < len(properties):
@@ -521,10 +780,10 @@ def interactive_demo():
                     if prop.state in ['sold', 'canceled']:
                         print("This property is not available for offers.")
                         continue
-                        
+
                     price = float(input("Offer amount: $"))
                     partner = input("Buyer name: ")
-                    
+
                     offer = prop.create_offer(price, partner)
                     if offer:
                         print(f"Offer created successfully!")
@@ -532,33 +791,33 @@ def interactive_demo():
                     print("Invalid property number.")
             except ValueError:
                 print("Please enter a valid number.")
-        
+
         elif choice == '5':
             # Manage property offers
             if not properties:
                 print("No properties available.")
                 continue
-                
+
             print("\nSelect a property to manage offers:")
             for i, prop in enumerate(properties, 1):
-                if prop._offers:
-                    print(f"{i}. {prop.name} - {len(prop._offers)} offer(s)")
-                
+                if prop.offers:
+                    print(f"{i}. {prop.name} - {len(prop.offers)} offer(s)")
+
             try:
                 idx = int(input("Enter property number: ")) - 1
                 if 0 <= idx < len(properties):
                     prop = properties[idx]
-                    if not prop._offers:
+                    if not prop.offers:
                         print("This property has no offers.")
                         continue
-                        
+
                     print(f"\nOffers for '{prop.name}':")
-                    for i, offer in enumerate(prop._offers, 1):
+                    for i, offer in enumerate(prop.offers, 1):
                         print(f"{i}. ${offer.price} from {offer.partner_id} - Status: {offer.status}")
-                    
+
                     offer_idx = int(input("Select offer number to manage: ")) - 1
-                    if 0 <= offer_idx < len(prop._offers):
-                        offer = prop._offers[offer_idx]
+                    if 0 <= offer_idx < len(prop.offers):
+                        offer = prop.offers[offer_idx]
                         if offer.status == 'pending':
                             action = input("Accept or refuse this offer? (a/r): ").lower()
                             if action == 'a':
@@ -575,49 +834,61 @@ def interactive_demo():
                     print("Invalid property number.")
             except ValueError:
                 print("Please enter a valid number.")
-        
+
         elif choice == '6':
-            # View property types
+            # View property types, counted from the type index
             print("\nProperty Types:")
             for i, t in enumerate(property_types, 1):
                 print(f"{i}. {t.name}")
-                
-            # Count properties by type
-            type_counts = {}
-            for prop in properties:
-                if prop.property_type_id:
-                    type_counts[prop.property_type_id] = type_counts.get(prop.property_type_id, 0) + 1
-            
+
             print("\nProperty Count by Type:")
             for t in property_types:
-                count = type_counts.get(t.id, 0)
-                print(f"{t.name}: {count} properties")
-        
+                print(f"{t.name}: {t.property_count} properties")
+
         elif choice == '7':
-            # View property tags
+            # View property tags, counted from the tag index
             print("\nProperty Tags:")
             for i, tag in enumerate(property_tags, 1):
                 print(f"{i}. {tag.name}")
-                
-            # Count properties by tag
-            tag_counts = {}
-            for prop in properties:
-                for tag_id in prop.tag_ids:
-                    tag_counts[tag_id] = tag_counts.get(tag_id, 0) + 1
-            
+
             print("\nProperty Count by Tag:")
             for tag in property_tags:
-                count = tag_counts.get(tag.id, 0)
-                print(f"{tag.name}: {count} properties")
-        
+                print(f"{tag.name}: {len(env.search('tag_ids', tag.id))} properties")
+
         elif choice == '8':
             # Exit
             print("\nThank you for using the Real Estate Management Demo!")
             break
-            
+
         else:
             print("Invalid option. Please try again.")
 
 
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Simulate the Real Estate module without an Odoo server.")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default='balanced',
+                        help="weights of the market events (default: balanced)")
+    parser.add_argument('--events', type=int, default=1_000_000,
+                        help="number of events to run (default: 1000000)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed, for reproducible runs")
+    parser.add_argument('--progress', type=int, default=0, metavar='N',
+                        help="report the throughput every N events")
+    parser.add_argument('--json', action='store_true', help="print the reports as JSON lines")
+    parser.add_argument('--interactive', action='store_true', help="run the interactive demo instead")
+    args = parser.parse_args(argv)
+
+    if args.interactive:
+        interactive_demo()
+        return 0
+
+    simulation = MarketSimulation(Environment(), scenario=args.scenario, seed=args.seed)
+    for report in simulation.run(args.events, progress=args.progress):
+        if args.json:
+            print(json.dumps(report), flush=True)
+        else:
+            print_report(report)
+    return 0
+
+
 if __name__ == "__main__":
-    interactive_demo()
+    sys.exit(main())
@@ -1 +1,6 @@
 from . import models
+from . import controllers
+from . import populate
+from . import report
+from . import wizard
+from . import cli
@@ -1,6 +1,6 @@
 {
     'name': 'Real Estate Management',
-    'version': '1.0',
+    'version': '1.2',
     'category': 'Real Estate',
     'summary': 'Manage real estate properties and advertisements',
     'description': """
@@ -19,11 +19,24 @@ This module allows you to manage real estate properties including:
     'data': [
         'security/real_estate_security.xml',
         'security/ir.model.access.csv',
+        'data/ir_config_parameter_data.xml',
+        'data/ir_cron_data.xml',
+        'data/mailing_data.xml',
         'views/property_views.xml',
         'views/property_type_views.xml',
         'views/property_tag_views.xml',
         'views/property_offer_views.xml',
+        'views/property_image_views.xml',
+        'views/postcode_centroid_views.xml',
+        'views/import_job_views.xml',
+        'views/perf_stat_views.xml',
+        'views/property_duplicate_views.xml',
+        'views/saved_search_views.xml',
+        'views/mailing_views.xml',
         'views/res_users_views.xml',
+        'report/market_report_views.xml',
+        'wizard/property_import_views.xml',
+        'wizard/property_merge_views.xml',
         'views/menus.xml',
     ],
     'assets': {
@@ -0,0 +1,60 @@
+import optparse
+import os
+import sys
+
+import odoo
+from odoo.cli import Command
+
+
+class ImportListings(Command):
+    """Import real estate listings from a CSV or JSON Lines file"""
+    name = 'real_estate_import'
+
+    def run(self, cmdargs):
+        parser = odoo.tools.config.parser
+        parser.prog = f'{os.path.basename(sys.argv[0])} {self.name}'
+        group = optparse.OptionGroup(parser, "Listing Import Configuration")
+        group.add_option("--file", dest="import_file",
+                         help="CSV or JSON Lines file to import, read on the server")
+        group.add_option("--file-type", dest="import_file_type", default='csv',
+                         choices=['csv', 'jsonl'], help="csv (default) or jsonl")
+        group.add_option("--chunk-size", dest="import_chunk_size", type="int", default=1000,
+                         help="Number of rows created and committed together (default 1000)")
+        group.add_option("--no-bulk-mode", dest="import_bulk_mode", action="store_false", default=True,
+                         help="Keep the field tracking and chatter messages of the properties")
+        group.add_option("--resume", dest="import_resume", type="int",
+                         help="Id of a failed import to resume from its checkpoint")
+        parser.add_option_group(group)
+        opt = odoo.tools.config.parse_config(cmdargs)
+
+        dbname = odoo.tools.config['db_name']
+        if not dbname:
+            sys.exit("Missing database name, use -d/--database")
+        if not opt.import_file and not opt.import_resume:
+            sys.exit("Missing file to import, use --file or --resume")
+
+        registry = odoo.registry(dbname)
+        with registry.cursor() as cr:
+            env = odoo.api.Environment(cr, odoo.SUPERUSER_ID, {})
+            Job = env['real.estate.import.job']
+            if opt.import_resume:
+                job = Job.browse(opt.import_resume).exists()
+                if not job:
+                    sys.exit(f"No listing import with id {opt.import_resume}")
+            else:
+                job = Job.create({
+                    'name': os.path.basename(opt.import_file),
+                    'file_path': os.path.abspath(opt.import_file),
+                    'file_type': opt.import_file_type,
+                    'chunk_size': opt.import_chunk_size,
+                    'bulk_mode': opt.import_bulk_mode,
+                })
+            if not job._claim():
+                sys.exit(f"Listing import {job.id} is done or already running")
+            cr.commit()
+            job._run()
+            print(f"Listing import {job.id}: {job.state}, {job.row_count} rows, "
+                  f"{job.property_count} properties")
+            if job.state == 'failed':
+                print(job.error)
+                sys.exit(1)
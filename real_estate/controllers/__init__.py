@@ -0,0 +1,3 @@
+from . import feed
+from . import api
+from . import metrics
@@ -0,0 +1,126 @@
+from odoo import http
+from odoo.http import request
+from werkzeug.exceptions import BadRequest
+
+MAX_LIMIT = 200
+
+# Fields readable through the API, and the ones returned when the caller does
+# not select any: the long tracked text fields are only read on request
+PROPERTY_FIELDS = [
+    'name', 'state', 'property_type_id', 'tag_ids', 'expected_price', 'selling_price',
+    'best_offer', 'bedrooms', 'living_area', 'total_area', 'garage', 'garden', 'garden_area',
+    'furnished', 'postcode', 'address', 'city', 'country_id', 'latitude', 'longitude',
+    'date_availability', 'user_id', 'main_image_id', 'description', 'amenities',
+]
+PROPERTY_DEFAULT_FIELDS = [
+    'name', 'state', 'property_type_id', 'expected_price', 'best_offer', 'bedrooms',
+    'living_area', 'city',
+]
+OFFER_FIELDS = [
+    'price', 'status', 'partner_id', 'property_id', 'validity', 'date_deadline',
+    'property_state', 'property_type_id', 'create_date',
+]
+OFFER_DEFAULT_FIELDS = ['price', 'status', 'partner_id', 'property_id', 'date_deadline']
+
+
+class RealEstateApi(http.Controller):
+    """Read API for the website and mobile app.
+
+    Pages are fetched with keyset pagination: each response holds the
+    ``next`` cursor to pass as ``after`` for the following page, so deep pages
+    cost the same as the first one. Records are ordered by id or by price
+    (descending), matching the indexes of the models.
+    """
+
+    @http.route('/real_estate/api/properties', type='http', auth='user', methods=['GET'])
+    def properties(self, state=None, property_type_id=None, city=None, garden=None, garage=None,
+                   furnished=None, price_min=None, price_max=None, **kwargs):
+        domain = []
+        if state:
+            domain.append(('state', 'in', state.split(',')))
+        if property_type_id:
+            domain.append(('property_type_id', '=', self._int(property_type_id)))
+        if city:
+            domain.append(('city', '=', city))
+        for fname, value in (('garden', garden), ('garage', garage), ('furnished', furnished)):
+            if value is not None:
+                domain.append((fname, '=', value.lower() in ('1', 'true')))
+        domain += self._price_domain('expected_price', price_min, price_max)
+        return self._search_page(
+            'real.estate.property', domain, 'expected_price',
+            PROPERTY_FIELDS, PROPERTY_DEFAULT_FIELDS, **kwargs,
+        )
+
+    @http.route('/real_estate/api/offers', type='http', auth='user', methods=['GET'])
+    def offers(self, property_id=None, status=None, price_min=None, price_max=None, **kwargs):
+        # Offers have no record rule of their own: only show the offers of
+        # the properties the user can read
+        domain = [('property_id', 'in', request.env['real.estate.property']._search([]))]
+        if property_id:
+            domain.append(('property_id', '=', self._int(property_id)))
+        if status:
+            domain.append(('status', 'in', status.split(',')))
+        domain += self._price_domain('price', price_min, price_max)
+        return self._search_page(
+            'real.estate.property.offer', domain, 'price',
+            OFFER_FIELDS, OFFER_DEFAULT_FIELDS, **kwargs,
+        )
+
+    def _search_page(self, model, domain, price_field, allowed_fields, default_fields,
+                     fields=None, order='id', after=None, limit=None, **kwargs):
+        field_names = fields.split(',') if fields else default_fields
+        unknown = set(field_names) - set(allowed_fields)
+        if unknown:
+            raise BadRequest("Unknown fields: %s" % ', '.join(sorted(unknown)))
+        limit = self._int(limit) if limit else MAX_LIMIT
+        if limit <= 0:
+            raise BadRequest("Invalid limit %s, it must be positive" % limit)
+        limit = max(1, min(limit, MAX_LIMIT))
+
+        if order == 'id':
+            if after:
+                domain = domain + [('id', '<', self._int(after))]
+            sql_order = 'id desc'
+        elif order == 'price':
+            if after:
+                price, __, record_id = after.rpartition('_')
+                price, record_id = self._float(price), self._int(record_id)
+                domain = domain + [
+                    '|', (price_field, '<', price),
+                    '&', (price_field, '=', price), ('id', '<', record_id),
+                ]
+            sql_order = '%s desc, id desc' % price_field
+        else:
+            raise BadRequest("Unknown order %s, use 'id' or 'price'" % order)
+
+        records = request.env[model].search_read(
+            domain, list(set(field_names) | {price_field}), order=sql_order, limit=limit,
+        )
+        next_cursor = None
+        if len(records) == limit:
+            last = records[-1]
+            next_cursor = str(last['id']) if order == 'id' else '%r_%s' % (last[price_field], last['id'])
+        for record in records:
+            if price_field not in field_names:
+                del record[price_field]
+        return request.make_json_response({'records': records, 'next': next_cursor})
+
+    def _price_domain(self, price_field, price_min, price_max):
+        domain = []
+        if price_min:
+            domain.append((price_field, '>=', self._float(price_min)))
+        if price_max:
+            domain.append((price_field, '<=', self._float(price_max)))
+        return domain
+
+    def _int(self, value):
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise BadRequest("Invalid integer %s" % value)
+
+    def _float(self, value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise BadRequest("Invalid number %s" % value)
@@ -0,0 +1,61 @@
+from odoo import SUPERUSER_ID, api, http, registry
+from odoo.http import request
+from odoo.tools import consteq
+from werkzeug.exceptions import Forbidden, NotFound
+from werkzeug.http import http_date
+
+from odoo.addons.real_estate.models.feed import WITHDRAWN_STATES
+
+CONTENT_TYPES = {
+    'json': 'application/json; charset=utf-8',
+    'xml': 'application/xml; charset=utf-8',
+}
+
+
+class ListingFeedController(http.Controller):
+
+    @http.route('/real_estate/feed.<string:fmt>', type='http', auth='public', methods=['GET'], csrf=False)
+    def listing_feed(self, fmt, since=None, token=None, **kwargs):
+        """Delta feed of the listings changed after the ``since`` cursor, for
+        the property portals. Polls without changes get a 304."""
+        if fmt not in CONTENT_TYPES:
+            raise NotFound()
+        Feed = request.env['real.estate.feed'].sudo()
+        if not Feed._check_token(token or request.httprequest.headers.get('X-Feed-Token')):
+            raise Forbidden()
+
+        etag, last_modified = Feed._feed_state(since)
+        httprequest = request.httprequest
+        if httprequest.if_none_match.contains(etag) or (
+            not httprequest.if_none_match and last_modified and httprequest.if_modified_since
+            and last_modified.replace(microsecond=0) <= httprequest.if_modified_since.replace(tzinfo=None)
+        ):
+            return request.make_response('', status=304, headers=[('ETag', '"%s"' % etag)])
+
+        # The body is generated after the request cursor is closed, so the
+        # stream reads the listings with a cursor of its own
+        dbname = request.db
+
+        def stream():
+            with registry(dbname).cursor() as cr:
+                env = api.Environment(cr, SUPERUSER_ID, {})
+                for chunk in env['real.estate.feed']._generate_feed(since, fmt):
+                    yield chunk.encode()
+
+        headers = [('Content-Type', CONTENT_TYPES[fmt]), ('ETag', '"%s"' % etag)]
+        if last_modified:
+            headers.append(('Last-Modified', http_date(last_modified)))
+        return request.make_response(stream(), headers=headers)
+
+    @http.route('/real_estate/feed/image/<int:image_id>/<string:signature>', type='http', auth='public',
+                methods=['GET'], csrf=False)
+    def listing_feed_image(self, image_id, signature, **kwargs):
+        """Image of a published listing, at the signed URL given by the feed."""
+        Feed = request.env['real.estate.feed'].sudo()
+        image = request.env['real.estate.property.image'].sudo().browse(image_id).exists()
+        if (
+            not image or not consteq(Feed._image_signature(image), signature)
+            or not image.property_id.active or image.property_id.state in WITHDRAWN_STATES
+        ):
+            raise NotFound()
+        return request.env['ir.binary']._get_stream_from(image, 'image').get_response()
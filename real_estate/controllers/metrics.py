@@ -0,0 +1,18 @@
+from odoo import http
+from odoo.http import request
+from odoo.tools import consteq
+from werkzeug.exceptions import Forbidden
+
+
+class MetricsController(http.Controller):
+
+    @http.route('/real_estate/metrics', type='http', auth='public', methods=['GET'], csrf=False)
+    def metrics(self, token=None, **kwargs):
+        """Performance statistics of the instrumented methods, for Prometheus.
+        Protected by the ``real_estate.metrics_token`` parameter."""
+        metrics_token = request.env['ir.config_parameter'].sudo().get_param('real_estate.metrics_token')
+        token = token or request.httprequest.headers.get('X-Metrics-Token')
+        if not (metrics_token and token and consteq(metrics_token, token)):
+            raise Forbidden()
+        body = request.env['real.estate.perf.stat'].sudo()._export_prometheus()
+        return request.make_response(body, headers=[('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')])
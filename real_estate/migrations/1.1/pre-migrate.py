@@ -0,0 +1,80 @@
+"""Create the search indexes of the real estate models without locking writes.
+
+On existing databases the listing and offer tables can be large, so the
+indexes declared in ``_sql_indexes`` are built with ``CREATE INDEX
+CONCURRENTLY`` before the module update creates any missing ones the
+regular (blocking) way. Indexes on columns added by the update itself are
+skipped here, the update creates them with the columns.
+"""
+import logging
+import re
+
+from odoo import sql_db
+from odoo.tools import sql
+
+from odoo.addons.real_estate.models.property import Property
+from odoo.addons.real_estate.models.property_offer import PropertyOffer
+from odoo.addons.real_estate.models.sql_indexes import index_definition
+
+_logger = logging.getLogger(__name__)
+
+MODELS = [Property, PropertyOffer]
+
+
+def migrate(cr, version):
+    if not version:
+        return
+
+    # Only one offer per property may stay accepted: keep the latest one
+    cr.execute("""
+        UPDATE real_estate_property_offer o
+           SET status = 'refused'
+         WHERE o.status = 'accepted'
+           AND EXISTS (SELECT 1 FROM real_estate_property_offer newer
+                        WHERE newer.property_id = o.property_id
+                          AND newer.status = 'accepted'
+                          AND newer.id > o.id)
+    """)
+    if cr.rowcount:
+        _logger.warning("Refused %s extra accepted offers", cr.rowcount)
+
+    # CREATE INDEX CONCURRENTLY waits for every open transaction, including
+    # the one of the update, and cannot run inside a transaction block
+    cr.commit()
+    with sql_db.db_connect(cr.dbname).cursor() as index_cr:
+        index_cr._cnx.autocommit = True
+        try:
+            for model in MODELS:
+                tablename = model._name.replace('.', '_')
+                columns = sql.table_columns(index_cr, tablename)
+                for index in model._sql_indexes:
+                    missing = _index_columns(index) - set(columns)
+                    if missing:
+                        _logger.info(
+                            "Index %s skipped, its columns %s are added by the update",
+                            index.name, ', '.join(sorted(missing)),
+                        )
+                        continue
+                    _create_index_concurrently(index_cr, tablename, index)
+        finally:
+            index_cr._cnx.autocommit = False
+
+
+def _create_index_concurrently(cr, tablename, index):
+    # A failed concurrent build leaves an invalid index behind, drop it first
+    cr.execute("""
+        SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+         WHERE c.relname = %s AND NOT i.indisvalid
+    """, [index.name])
+    if cr.fetchone():
+        cr.execute('DROP INDEX CONCURRENTLY IF EXISTS "%s"' % index.name)
+    cr.execute(index_definition(tablename, index, concurrently=True))
+    _logger.info("Index %s created concurrently", index.name)
+
+
+def _index_columns(index):
+    """Return the columns the index refers to: the lower case names outside
+    string literals, casts and function calls, SQL keywords being in upper
+    case."""
+    text = re.sub(r"'[^']*'|::\s*\w+", '', ' '.join([*index.expressions, index.where]))
+    return set(re.findall(r'\b[a-z_][a-z0-9_]*\b(?!\s*\()', text))
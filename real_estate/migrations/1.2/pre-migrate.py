@@ -0,0 +1,25 @@
+"""Fill the stored property status and type of the offers in SQL.
+
+Left to the module update, the new related columns would be computed record
+by record in Python over the whole offer table.
+"""
+import logging
+
+from odoo.tools.sql import column_exists, create_column
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    if not version or column_exists(cr, 'real_estate_property_offer', 'property_state'):
+        return
+    create_column(cr, 'real_estate_property_offer', 'property_state', 'varchar')
+    create_column(cr, 'real_estate_property_offer', 'property_type_id', 'int4')
+    cr.execute("""
+        UPDATE real_estate_property_offer offer
+           SET property_state = property.state,
+               property_type_id = property.property_type_id
+          FROM real_estate_property property
+         WHERE property.id = offer.property_id
+    """)
+    _logger.info("Set the property status and type of %s offers", cr.rowcount)
@@ -1,4 +1,12 @@
+from . import lookup_cache
 from . import property
 from . import property_type
 from . import property_tag
 from . import property_offer
+from . import postcode_centroid
+from . import import_job
+from . import feed
+from . import perf_stat
+from . import property_duplicate
+from . import saved_search
+from . import mailing
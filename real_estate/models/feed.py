@@ -0,0 +1,185 @@
+from odoo import api, models, _
+from odoo.exceptions import UserError
+from odoo.tools import consteq
+from odoo.tools.misc import hmac
+from datetime import datetime
+from xml.sax.saxutils import escape, quoteattr
+import hashlib
+import json
+
+# Listings changed less than FEED_LAG seconds ago are left for the next run:
+# write_date is the start time of the writing transaction, which may commit
+# after a faster one with a later write_date was already served
+FEED_LAG = 60
+
+# States in which a listing is withdrawn from the portals
+WITHDRAWN_STATES = ['sold', 'canceled']
+
+
+class ListingFeed(models.AbstractModel):
+    _name = 'real.estate.feed'
+    _description = 'Real Estate Listing Feed'
+
+    @api.model
+    def _check_token(self, token):
+        feed_token = self.env['ir.config_parameter'].sudo().get_param('real_estate.feed_token')
+        return bool(feed_token and token and consteq(feed_token, token))
+
+    @api.model
+    def _parse_cursor(self, since):
+        """Return the ``(write_date, id)`` key of a feed cursor, or None to
+        start from the first listing."""
+        if not since:
+            return None
+        try:
+            write_date, __, record_id = since.rpartition('_')
+            return datetime.fromisoformat(write_date), int(record_id)
+        except ValueError:
+            raise UserError(_("Invalid feed cursor %s.", since))
+
+    @api.model
+    def _format_cursor(self, write_date, record_id):
+        return '%s_%s' % (write_date.isoformat(), record_id)
+
+    @api.model
+    def _cursor_where(self, key):
+        """Return the SQL condition and parameters selecting the listings
+        after the given ``(write_date, id)`` key, excluding the too recent
+        ones."""
+        where = ["write_date < (now() at time zone 'UTC') - interval '%s seconds'" % FEED_LAG]
+        params = []
+        if key:
+            where.append('(write_date, id) > (%s, %s)')
+            params += key
+        return ' AND '.join(where), params
+
+    @api.model
+    def _feed_state(self, since):
+        """Return the ETag and last modification date of the feed after the
+        given cursor: the last changed listing, read from the end of the
+        (write_date, id) index instead of scanning the feed."""
+        self.env['real.estate.property'].flush_model()
+        where, params = self._cursor_where(self._parse_cursor(since))
+        self.env.cr.execute(f"""
+            SELECT write_date, id
+              FROM real_estate_property
+             WHERE {where}
+          ORDER BY write_date DESC, id DESC
+             LIMIT 1
+        """, params)
+        last_modified, last_id = self.env.cr.fetchone() or (None, None)
+        etag = hashlib.sha1(f'{since}:{last_modified}:{last_id}'.encode()).hexdigest()
+        return etag, last_modified
+
+    @api.model
+    def _iter_listings(self, since, chunk_size=500):
+        """Yield the listings changed after the given cursor, oldest first, as
+        dicts. Archived, sold and canceled listings are yielded as tombstones.
+
+        Listings are read one keyset chunk at a time, and the cache is cleared
+        after each chunk, so memory does not grow with the size of the feed.
+        """
+        Property = self.env['real.estate.property'].with_context(active_test=False, bin_size=True)
+        key = self._parse_cursor(since)
+        while True:
+            where, params = self._cursor_where(key)
+            self.env.cr.execute(f"""
+                SELECT id, write_date
+                  FROM real_estate_property
+                 WHERE {where}
+              ORDER BY write_date, id
+                 LIMIT %s
+            """, params + [chunk_size])
+            rows = self.env.cr.fetchall()
+            if not rows:
+                return
+            properties = Property.browse([row[0] for row in rows])
+            for prop, (record_id, write_date) in zip(properties, rows):
+                yield self._listing_values(prop, self._format_cursor(write_date, record_id))
+            key = (rows[-1][1], rows[-1][0])
+            self.env.invalidate_all()
+
+    @api.model
+    def _listing_values(self, prop, cursor):
+        values = {
+            'id': prop.id,
+            'cursor': cursor,
+        }
+        if not prop.active or prop.state in WITHDRAWN_STATES:
+            values.update(deleted=True, reason=prop.state if prop.active else 'archived')
+            return values
+        values.update({
+            'name': prop.name,
+            'description': prop.description or '',
+            'state': prop.state,
+            'property_type': prop.property_type_id.name or '',
+            'tags': prop.tag_ids.mapped('name'),
+            'expected_price': prop.expected_price,
+            'bedrooms': prop.bedrooms,
+            'living_area': prop.living_area,
+            'total_area': prop.total_area,
+            'garage': prop.garage,
+            'garden': prop.garden,
+            'furnished': prop.furnished,
+            'amenities': prop.amenities or '',
+            'address': prop.address or '',
+            'postcode': prop.postcode or '',
+            'city': prop.city or '',
+            'country': prop.country_id.code or '',
+            'latitude': prop.latitude,
+            'longitude': prop.longitude,
+            'images': [{
+                'id': image.id,
+                'checksum': image.checksum or '',
+                'url': '/real_estate/feed/image/%s/%s' % (image.id, self._image_signature(image)),
+            } for image in prop.property_image_ids],
+        })
+        return values
+
+    @api.model
+    def _image_signature(self, image):
+        """Return the signature of the public URL of an image of the feed,
+        changed when the image is replaced."""
+        return hmac(self.env(su=True), 'real_estate.feed_image', (image.id, image.checksum or ''))
+
+    @api.model
+    def _generate_feed(self, since=None, fmt='json'):
+        """Yield the feed after the given cursor as JSON or XML text chunks,
+        ending with the cursor to pass as ``since`` on the next run."""
+        next_cursor = since or ''
+        if fmt == 'json':
+            yield '{"listings": ['
+            for index, values in enumerate(self._iter_listings(since)):
+                next_cursor = values['cursor']
+                yield (',' if index else '') + json.dumps(values)
+            yield '], "next_cursor": %s}' % json.dumps(next_cursor)
+        else:
+            yield '<?xml version="1.0" encoding="UTF-8"?>\n<listings>\n'
+            for values in self._iter_listings(since):
+                next_cursor = values['cursor']
+                yield self._listing_xml(values)
+            yield '<next_cursor>%s</next_cursor>\n</listings>\n' % escape(next_cursor)
+
+    @api.model
+    def _listing_xml(self, values):
+        if values.get('deleted'):
+            return '<deleted id="%s" reason=%s/>\n' % (values['id'], quoteattr(values['reason']))
+        parts = ['<listing id="%s">' % values['id']]
+        for key, value in values.items():
+            if key in ('id', 'tags', 'images'):
+                continue
+            parts.append('<%s>%s</%s>' % (key, escape(str(value)), key))
+        parts.append('<tags>%s</tags>' % ''.join('<tag>%s</tag>' % escape(tag) for tag in values['tags']))
+        parts.append('<images>%s</images>' % ''.join(
+            '<image id="%s" checksum=%s url=%s/>' % (image['id'], quoteattr(image['checksum']), quoteattr(image['url']))
+            for image in values['images']
+        ))
+        parts.append('</listing>\n')
+        return ''.join(parts)
+
+    @api.model
+    def export_feed(self, path, since=None, fmt='json'):
+        """Write the feed after the given cursor to a file."""
+        with open(path, 'w', encoding='utf-8') as feed_file:
+            for chunk in self._generate_feed(since, fmt):
+                feed_file.write(chunk)
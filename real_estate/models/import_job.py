@@ -0,0 +1,353 @@
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+import base64
+import csv
+import io
+import itertools
+import json
+import logging
+import threading
+
+import requests
+
+_logger = logging.getLogger(__name__)
+
+# A running import whose checkpoint is older than HEARTBEAT_TIMEOUT seconds
+# is considered dead (killed worker or command), and is resumed by the cron
+HEARTBEAT_TIMEOUT = 30 * 60
+
+# Limits of the images downloaded from the URLs of the imported rows
+IMAGE_MAX_SIZE = 20 * 1024 * 1024
+IMAGE_TIMEOUT = 10
+
+# Property fields read as is from the imported rows, with their type
+PROPERTY_FIELDS = {
+    'name': str,
+    'description': str,
+    'postcode': str,
+    'date_availability': str,
+    'expected_price': float,
+    'bedrooms': int,
+    'living_area': int,
+    'facades': int,
+    'garage': bool,
+    'garden': bool,
+    'garden_area': int,
+    'garden_orientation': str,
+    'address': str,
+    'city': str,
+    'amenities': str,
+    'furnished': bool,
+    'latitude': float,
+    'longitude': float,
+}
+
+
+class ImportJob(models.Model):
+    _name = 'real.estate.import.job'
+    _description = 'Real Estate Listing Import'
+    _order = 'id desc'
+
+    name = fields.Char(
+        string='Name',
+        required=True,
+    )
+    file_type = fields.Selection(
+        selection=[
+            ('csv', 'CSV'),
+            ('jsonl', 'JSON Lines'),
+        ],
+        string='File Type',
+        required=True,
+        default='csv',
+    )
+    attachment_id = fields.Many2one(
+        comodel_name='ir.attachment',
+        string='File',
+        readonly=True,
+    )
+    file_path = fields.Char(
+        string='Server File Path',
+        readonly=True,
+        help="File read on the server, for the imports started from the command line",
+    )
+    chunk_size = fields.Integer(
+        string='Chunk Size',
+        default=1000,
+        required=True,
+    )
+    bulk_mode = fields.Boolean(
+        string='Bulk Mode',
+        default=True,
+        help="Create the properties without field tracking and chatter messages",
+    )
+    state = fields.Selection(
+        selection=[
+            ('queued', 'Queued'),
+            ('running', 'Running'),
+            ('done', 'Done'),
+            ('failed', 'Failed'),
+        ],
+        string='Status',
+        required=True,
+        default='queued',
+        readonly=True,
+    )
+    row_count = fields.Integer(
+        string='Rows Imported',
+        readonly=True,
+        help="Checkpoint of the import: the rows before it are committed and "
+             "skipped when the import is resumed",
+    )
+    property_count = fields.Integer(
+        string='Properties Created',
+        readonly=True,
+    )
+    error = fields.Text(
+        string='Error',
+        readonly=True,
+    )
+    heartbeat = fields.Datetime(
+        string='Last Checkpoint',
+        readonly=True,
+        help="Time of the last committed chunk of a running import",
+    )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # Server files are only read for the imports of the command line
+        if not self.env.su:
+            for vals in vals_list:
+                vals.pop('file_path', None)
+        return super(ImportJob, self).create(vals_list)
+
+    def write(self, vals):
+        if not self.env.su and 'file_path' in vals:
+            vals = dict(vals)
+            vals.pop('file_path')
+        return super(ImportJob, self).write(vals)
+
+    @api.constrains('chunk_size')
+    def _check_chunk_size(self):
+        for job in self:
+            if job.chunk_size <= 0:
+                raise UserError(_("The chunk size must be positive."))
+
+    def action_resume(self):
+        self.filtered(lambda job: job.state == 'failed').write({'state': 'queued', 'error': False})
+        self.env.ref('real_estate.ir_cron_run_import_jobs')._trigger()
+        return True
+
+    @api.model
+    def _cron_run_jobs(self):
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        while True:
+            # Skip the jobs claimed by another worker or by the command line,
+            # running ones only when they stopped sending heartbeats
+            self.env.cr.execute("""
+                SELECT id FROM real_estate_import_job
+                 WHERE state = 'queued'
+                    OR (state = 'running' AND coalesce(heartbeat, create_date) < (now() at time zone 'UTC') - %s * interval '1 second')
+              ORDER BY id
+                 LIMIT 1
+                   FOR UPDATE SKIP LOCKED
+            """, [HEARTBEAT_TIMEOUT])
+            row = self.env.cr.fetchone()
+            if not row:
+                break
+            job = self.browse(row[0])
+            if not job._claim():
+                break
+            if auto_commit:
+                self.env.cr.commit()
+            job._run()
+
+    def _claim(self):
+        """Mark the import as running unless another process runs it, and
+        return whether it was claimed."""
+        self.ensure_one()
+        self.flush_recordset()
+        self.env.cr.execute("""
+            UPDATE real_estate_import_job
+               SET state = 'running', heartbeat = now() at time zone 'UTC', error = NULL
+             WHERE id = %s
+               AND (state IN ('queued', 'failed')
+                    OR (state = 'running' AND coalesce(heartbeat, create_date) < (now() at time zone 'UTC') - %s * interval '1 second'))
+        """, [self.id, HEARTBEAT_TIMEOUT])
+        self.invalidate_recordset(['state', 'heartbeat', 'error'])
+        return bool(self.env.cr.rowcount)
+
+    def _run(self):
+        """Import the file chunk by chunk, from the last checkpoint.
+
+        Each chunk is created with batched ``create`` calls and committed with
+        the new checkpoint, so a failed import can be resumed. The import must
+        have been claimed by the caller, see ``_claim``.
+        """
+        self.ensure_one()
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+
+        cache = {'types': {}, 'tags': {}, 'countries': {}, 'partners': {}}
+        try:
+            with self._open_source() as stream:
+                rows = itertools.islice(self._read_rows(stream), self.row_count, None)
+                while True:
+                    chunk = list(itertools.islice(rows, self.chunk_size))
+                    if not chunk:
+                        break
+                    properties = self._import_chunk(chunk, cache)
+                    self.write({
+                        'row_count': self.row_count + len(chunk),
+                        'property_count': self.property_count + len(properties),
+                        'heartbeat': fields.Datetime.now(),
+                    })
+                    if auto_commit:
+                        self.env.cr.commit()
+        except Exception as e:
+            if not auto_commit:
+                raise
+            _logger.exception("Listing import %s failed after %s rows", self.id, self.row_count)
+            self.env.cr.rollback()
+            self.env.clear()
+            self.write({'state': 'failed', 'error': str(e)})
+            self.env.cr.commit()
+            return
+        self.write({'state': 'done'})
+        _logger.info("Listing import %s done: %s rows, %s properties", self.id, self.row_count, self.property_count)
+
+    def _open_source(self):
+        if self.file_path:
+            return open(self.file_path, newline='', encoding='utf-8')
+        attachment = self.attachment_id.sudo()
+        if not attachment:
+            raise UserError(_("The import %s has no file.", self.name))
+        if attachment.store_fname:
+            return open(attachment._full_path(attachment.store_fname), newline='', encoding='utf-8')
+        return io.StringIO(attachment.raw.decode('utf-8'), newline='')
+
+    def _read_rows(self, stream):
+        """Yield the rows of the file one by one, normalized to a dict with
+        list values for ``tags``, ``offers`` and ``images``.
+
+        In CSV files, tags and images are separated by ``|`` and offers are
+        given as ``partner:price|partner:price``.
+        """
+        if self.file_type == 'jsonl':
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        for row in csv.DictReader(stream):
+            row['tags'] = [tag.strip() for tag in (row.get('tags') or '').split('|') if tag.strip()]
+            row['images'] = [image.strip() for image in (row.get('images') or '').split('|') if image.strip()]
+            offers = []
+            for offer in (row.get('offers') or '').split('|'):
+                if offer.strip():
+                    partner, __, price = offer.rpartition(':')
+                    offers.append({'partner': partner.strip(), 'price': float(price)})
+            row['offers'] = offers
+            yield row
+
+    def _import_chunk(self, rows, cache):
+        """Create the properties of the given rows with their offers and
+        images, one ``create`` call per model."""
+        Property = self.env['real.estate.property'].with_context(real_estate_bulk_import=self.bulk_mode)
+        self._prefetch_partners(rows, cache['partners'])
+        properties = Property.create([self._prepare_property_vals(row, cache) for row in rows])
+
+        offer_vals_list = []
+        image_vals_list = []
+        for prop, row in zip(properties, rows):
+            for offer in row.get('offers') or []:
+                offer_vals_list.append({
+                    'property_id': prop.id,
+                    'partner_id': cache['partners'][offer['partner']],
+                    'price': float(offer['price']),
+                })
+            for sequence, source in enumerate(row.get('images') or []):
+                image = self._load_image(source)
+                if image:
+                    image_vals_list.append({
+                        'property_id': prop.id,
+                        'name': source.rsplit('/', 1)[-1],
+                        'sequence': sequence,
+                        'image': image,
+                    })
+        self.env['real.estate.property.offer'].create(offer_vals_list)
+        self.env['real.estate.property.image'].create(image_vals_list)
+        return properties
+
+    def _prepare_property_vals(self, row, cache):
+        vals = {}
+        for fname, ftype in PROPERTY_FIELDS.items():
+            value = row.get(fname)
+            if value in (None, ''):
+                continue
+            if ftype is bool and isinstance(value, str):
+                value = value.strip().lower() in ('1', 'true', 'yes', 'y')
+            vals[fname] = ftype(value)
+        if row.get('property_type'):
+            vals['property_type_id'] = self._lookup(cache['types'], 'real.estate.property.type', row['property_type'])
+        if row.get('tags'):
+            vals['tag_ids'] = [
+                (6, 0, [self._lookup(cache['tags'], 'real.estate.property.tag', tag) for tag in row['tags']])
+            ]
+        if row.get('country'):
+            vals['country_id'] = self._lookup_country(cache['countries'], row['country'])
+        return vals
+
+    def _lookup(self, cache, model, name):
+        """Return the id of the record with the given name, created if
+        missing. The whole table is cached on first use."""
+        if not cache:
+            cache.update((record['name'], record['id']) for record in self.env[model].search_read([], ['name']))
+        if name not in cache:
+            cache[name] = self.env[model].create({'name': name}).id
+        return cache[name]
+
+    def _lookup_country(self, cache, code):
+        if not cache:
+            cache.update((country['code'], country['id']) for country in self.env['res.country'].search_read([], ['code']))
+        country_id = cache.get(code.upper())
+        if not country_id:
+            raise UserError(_("Unknown country code %s.", code))
+        return country_id
+
+    def _prefetch_partners(self, rows, cache):
+        """Resolve the partners of the offers of the chunk in one query, and
+        create the missing ones in one batch."""
+        names = {offer['partner'] for row in rows for offer in row.get('offers') or []} - cache.keys()
+        if not names:
+            return
+        for partner in self.env['res.partner'].search_read([('name', 'in', list(names))], ['name'], order='id'):
+            cache.setdefault(partner['name'], partner['id'])
+        missing = sorted(names - cache.keys())
+        partners = self.env['res.partner'].create([{'name': name} for name in missing])
+        cache.update(zip(missing, partners.ids))
+
+    def _load_image(self, source):
+        """Return the base64 content of the image at the given URL or path,
+        or None when it cannot be read.
+
+        Local paths are only read for the imports of the command line, the
+        uploaded files may only give http(s) URLs.
+        """
+        try:
+            if source.startswith(('http://', 'https://')):
+                with requests.get(source, timeout=IMAGE_TIMEOUT, stream=True) as response:
+                    response.raise_for_status()
+                    content = response.raw.read(IMAGE_MAX_SIZE + 1, decode_content=True)
+                if len(content) > IMAGE_MAX_SIZE:
+                    _logger.warning("Listing import %s: skipped image %s (larger than %s bytes)",
+                                    self.id, source, IMAGE_MAX_SIZE)
+                    return None
+            elif self.file_path:
+                with open(source, 'rb') as image_file:
+                    content = image_file.read()
+            else:
+                _logger.warning("Listing import %s: skipped image %s (not an http(s) URL)", self.id, source)
+                return None
+        except (OSError, requests.RequestException) as e:
+            _logger.warning("Listing import %s: skipped image %s (%s)", self.id, source, e)
+            return None
+        return base64.b64encode(content)
@@ -0,0 +1,90 @@
+import atexit
+import functools
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from odoo import SUPERUSER_ID, api, registry
+
+_logger = logging.getLogger(__name__)
+
+# Seconds between two flushes of the statistics of a process
+FLUSH_INTERVAL = 60
+
+# Statistics recorded since the last flush, by (database, model, method):
+# [calls, records, queries, duration, max duration]
+_stats = defaultdict(lambda: [0, 0, 0, 0.0, 0.0])
+_stats_lock = threading.Lock()
+# Thread flushing the statistics of the process, started on the first call
+_flush_thread = None
+
+
+def instrumented(method):
+    """Record the wall time, the number of queries and the batch size of the
+    calls of ``method`` when the ``real_estate.instrumentation`` parameter is
+    set. The statistics are aggregated in memory and flushed to
+    ``real.estate.perf.stat`` every ``FLUSH_INTERVAL`` seconds by a thread of
+    the process, and when the process exits.
+
+    Apply it below the ORM decorators (``api.depends``,
+    ``api.model_create_multi``), so that they wrap the instrumented method.
+    Nested instrumented calls are included in the figures of their caller.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        # Cached by ir.config_parameter, the disabled case costs no query
+        if not self.env['ir.config_parameter'].sudo().get_param('real_estate.instrumentation'):
+            return method(self, *args, **kwargs)
+        cr = self.env.cr
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            # ``create`` is called on an empty recordset with a list of values
+            size = len(self) or (len(args[0]) if args and isinstance(args[0], list) else 0)
+            _record(cr.dbname, self._name, method.__name__, size,
+                    cr.sql_log_count - queries, time.perf_counter() - start)
+    return wrapper
+
+
+def _record(dbname, model, method, size, queries, duration):
+    global _flush_thread
+    with _stats_lock:
+        stat = _stats[dbname, model, method]
+        stat[0] += 1
+        stat[1] += size
+        stat[2] += queries
+        stat[3] += duration
+        stat[4] = max(stat[4], duration)
+        # Not alive either in a worker forked after it was started
+        if _flush_thread is None or not _flush_thread.is_alive():
+            _flush_thread = threading.Thread(target=_flush_loop, name='real_estate.instrumentation', daemon=True)
+            _flush_thread.start()
+
+
+def _flush_loop():
+    """Flush the statistics periodically, also when no instrumented method
+    is called anymore."""
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        flush()
+
+
+@atexit.register
+def flush():
+    """Write the statistics recorded by this process, with a cursor of its
+    own: they are kept even if the current transaction is rolled back."""
+    with _stats_lock:
+        stats = dict(_stats)
+        _stats.clear()
+    rows_by_db = defaultdict(list)
+    for (dbname, model, method), values in stats.items():
+        rows_by_db[dbname].append((model, method, *values))
+    for dbname, rows in rows_by_db.items():
+        try:
+            with registry(dbname).cursor() as cr:
+                api.Environment(cr, SUPERUSER_ID, {})['real.estate.perf.stat']._add_stats(rows)
+        except Exception:
+            _logger.warning("Could not flush the real estate performance statistics", exc_info=True)
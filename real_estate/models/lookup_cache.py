@@ -0,0 +1,157 @@
+from odoo import api, models, tools
+
+
+class LookupMixin(models.AbstractModel):
+    """Cache the display values of small, nearly static tables.
+
+    Every listing card and row shows the name and color of its type and tags:
+    they are served from a process-wide ormcache instead of being read again
+    for each page.
+
+    Changes only drop the lookup of their model, not the whole ormcache. The
+    other workers are told to clear their caches only when cached values
+    change or records are deleted: the records they do not know yet (created
+    since) are read from the database.
+    """
+    _name = 'real.estate.lookup.mixin'
+    _description = 'Real Estate Cached Lookup'
+
+    # Fields kept in the cache, missing ones are ignored
+    _lookup_fields = ['name', 'color', 'sequence']
+
+    @api.model
+    def _get_lookup_fields(self):
+        return [fname for fname in self._lookup_fields if fname in self._fields]
+
+    @api.model
+    @tools.ormcache()
+    def _get_lookup(self):
+        """Return the cached values of every record, as ``{id: {field: value}}``.
+        The result is shared between requests and must not be modified."""
+        fnames = self._get_lookup_fields()
+        self.flush_model(fnames)
+        self.env.cr.execute('SELECT id, {} FROM "{}"'.format(
+            ', '.join('"%s"' % fname for fname in fnames), self._table,
+        ))
+        return {
+            row[0]: tools.frozendict(zip(fnames, row[1:]))
+            for row in self.env.cr.fetchall()
+        }
+
+    def _lookup(self):
+        """Return the cached values of the records, or None when one of them
+        is not in the cache (new record, or created by another worker)."""
+        lookup = self._get_lookup()
+        if not all(record_id in lookup for record_id in self._ids):
+            return None
+        return [lookup[record_id] for record_id in self._ids]
+
+    def _can_read_lookup(self):
+        """Whether the cache may answer a read: the records are readable and
+        no record rule applies."""
+        return (
+            self.check_access_rights('read', raise_exception=False)
+            and not self.env['ir.rule']._compute_domain(self._name, 'read')
+        )
+
+    @api.model
+    def _clear_lookup(self, signal=True):
+        """Drop the cached lookup of the model, also when the transaction is
+        rolled back, and with ``signal`` in the other workers too."""
+        cache = self.pool._Registry__cache
+        key = (self._name, self._get_lookup.__cache__.method)
+
+        def clear():
+            try:
+                del cache[key]
+            except KeyError:
+                pass
+
+        clear()
+        self.env.cr.postrollback.add(clear)
+        if signal:
+            # Signaled at the end of the request, the other workers then clear
+            # their whole ormcache: there is no finer signal
+            self.pool.cache_invalidated = True
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super(LookupMixin, self).create(vals_list)
+        self._clear_lookup(signal=False)
+        return records
+
+    def write(self, vals):
+        # Stored computes (counts, ...) do not invalidate the lookup
+        fnames = [fname for fname in self._get_lookup_fields() if fname in vals]
+        changed = fnames and self.filtered(lambda record: any(record[fname] != vals[fname] for fname in fnames))
+        res = super(LookupMixin, self).write(vals)
+        if changed:
+            self._clear_lookup()
+        return res
+
+    def unlink(self):
+        res = super(LookupMixin, self).unlink()
+        self._clear_lookup()
+        return res
+
+    def name_get(self):
+        values = self._lookup()
+        if values is None:
+            return super(LookupMixin, self).name_get()
+        return [(record_id, value['name']) for record_id, value in zip(self._ids, values)]
+
+    def read(self, fields=None, load='_classic_read'):
+        # Relational widgets (many2many tags, ...) only read the name and color
+        lookup_fields = self._get_lookup_fields()
+        if not fields or not set(fields) <= {'id', 'display_name', *lookup_fields}:
+            return super(LookupMixin, self).read(fields, load=load)
+        values = self._lookup()
+        if values is None or not self._can_read_lookup():
+            return super(LookupMixin, self).read(fields, load=load)
+        result = []
+        for record_id, value in zip(self._ids, values):
+            row = {'id': record_id}
+            for fname in fields:
+                if fname == 'display_name':
+                    row[fname] = value['name']
+                elif fname != 'id':
+                    row[fname] = value[fname]
+            result.append(row)
+        return result
+
+    @api.model
+    def _name_search(self, name, args=None, operator='ilike', limit=100, name_get_uid=None):
+        # Plain name searches only, the rest goes through the database
+        name = name or ''
+        if args or operator not in ('ilike', '=') or '%' in name or '_' in name:
+            return super(LookupMixin, self)._name_search(
+                name, args=args, operator=operator, limit=limit, name_get_uid=name_get_uid,
+            )
+        model = self.with_user(name_get_uid) if name_get_uid else self
+        # Same order as the database, nulls last, on the cached fields of _order
+        order = [part.split()[0] for part in self._order.split(',')]
+        lookup = self._get_lookup()
+        # Records created by another worker since the lookup was cached are
+        # found by the database only: probe the end of the primary key
+        if (
+            not model._can_read_lookup() or not set(order) <= set(self._get_lookup_fields())
+            or self.search_count([('id', '>', max(lookup, default=0))], limit=1)
+        ):
+            return super(LookupMixin, self)._name_search(
+                name, args=args, operator=operator, limit=limit, name_get_uid=name_get_uid,
+            )
+        if operator == 'ilike':
+            name = name.lower()
+            matches = [
+                (record_id, value) for record_id, value in lookup.items()
+                if name in (value['name'] or '').lower()
+            ]
+        else:
+            matches = [
+                (record_id, value) for record_id, value in lookup.items()
+                if value['name'] == name
+            ]
+        matches.sort(key=lambda match: tuple(
+            (match[1][fname] is None, match[1][fname]) for fname in order
+        ) + (match[0],))
+        return [record_id for record_id, __ in matches[:limit]]
@@ -0,0 +1,209 @@
+from odoo import api, fields, models, _
+from datetime import timedelta
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+# Mails sent per minute when real_estate.mailing_rate is not set
+DEFAULT_MAILING_RATE = 60
+
+
+class Mailing(models.Model):
+    """Listing sent by email to interested partners, queued and delivered in
+    rate-limited batches by ``_cron_send``."""
+    _name = 'real.estate.mailing'
+    _description = 'Real Estate Mailing'
+    _order = 'id desc'
+
+    name = fields.Char(
+        string='Reference',
+        required=True,
+        readonly=True,
+        copy=False,
+        default=lambda self: _("New"),
+    )
+    property_id = fields.Many2one(
+        comodel_name='real.estate.property',
+        string='Property',
+        required=True,
+        ondelete='cascade',
+        index=True,
+    )
+    template_id = fields.Many2one(
+        comodel_name='mail.template',
+        string='Template',
+        required=True,
+        domain="[('model', '=', 'real.estate.mailing.recipient')]",
+    )
+    user_id = fields.Many2one(
+        comodel_name='res.users',
+        string='Sent By',
+        default=lambda self: self.env.user,
+        readonly=True,
+    )
+    state = fields.Selection(
+        selection=[
+            ('queued', 'Queued'),
+            ('sending', 'Sending'),
+            ('done', 'Done'),
+        ],
+        string='Status',
+        default='queued',
+        required=True,
+        readonly=True,
+    )
+    recipient_ids = fields.One2many(
+        comodel_name='real.estate.mailing.recipient',
+        inverse_name='mailing_id',
+        string='Recipients',
+        readonly=True,
+    )
+    recipient_count = fields.Integer(
+        string='Recipients',
+        compute='_compute_statistics',
+    )
+    sent_count = fields.Integer(
+        string='Sent',
+        compute='_compute_statistics',
+    )
+    failed_count = fields.Integer(
+        string='Failed',
+        compute='_compute_statistics',
+    )
+
+    @api.depends('recipient_ids.state')
+    def _compute_statistics(self):
+        counts = {
+            (group['mailing_id'][0], group['state']): group['__count']
+            for group in self.env['real.estate.mailing.recipient'].read_group(
+                [('mailing_id', 'in', self.ids)], ['mailing_id'], ['mailing_id', 'state'], lazy=False,
+            )
+        } if self.ids else {}
+        for mailing in self:
+            mailing.sent_count = counts.get((mailing.id, 'sent'), 0)
+            mailing.failed_count = counts.get((mailing.id, 'failed'), 0)
+            mailing.recipient_count = mailing.sent_count + mailing.failed_count + counts.get((mailing.id, 'queued'), 0)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if vals.get('name', _("New")) == _("New"):
+                vals['name'] = self.env['ir.sequence'].next_by_code('real.estate.mailing') or _("New")
+        return super(Mailing, self).create(vals_list)
+
+    @api.model
+    def _cron_send(self, batch_size=50):
+        """Render and send the queued recipients, one committed batch at a
+        time, at most ``real_estate.mailing_rate`` mails over the last minute:
+        the runs triggered by each new mailing share the same quota. The cron
+        is triggered again a minute later while recipients remain."""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        rate = int(self.env['ir.config_parameter'].sudo().get_param(
+            'real_estate.mailing_rate', DEFAULT_MAILING_RATE,
+        ) or DEFAULT_MAILING_RATE)
+        Recipient = self.env['real.estate.mailing.recipient']
+        budget = rate - Recipient.search_count([
+            ('date_sent', '>', fields.Datetime.now() - timedelta(minutes=1)),
+        ])
+        while budget > 0:
+            recipients = Recipient.search([('state', '=', 'queued')], order='id', limit=min(batch_size, budget))
+            if not recipients:
+                break
+            recipients.mailing_id.filtered(lambda mailing: mailing.state == 'queued').write({'state': 'sending'})
+            recipients._send()
+            budget -= len(recipients)
+            self._update_states(recipients.mailing_id)
+            if auto_commit:
+                self.env.cr.commit()
+        if Recipient.search_count([('state', '=', 'queued')], limit=1):
+            self.env.ref('real_estate.ir_cron_send_mailings')._trigger(fields.Datetime.now() + timedelta(minutes=1))
+
+    @api.model
+    def _update_states(self, mailings):
+        queued = {
+            group['mailing_id'][0]
+            for group in self.env['real.estate.mailing.recipient'].read_group(
+                [('mailing_id', 'in', mailings.ids), ('state', '=', 'queued')], ['mailing_id'], ['mailing_id'],
+            )
+        }
+        mailings.filtered(lambda mailing: mailing.id not in queued).write({'state': 'done'})
+
+
+class MailingRecipient(models.Model):
+    """Partner a mailing is sent to, with its delivery status."""
+    _name = 'real.estate.mailing.recipient'
+    _description = 'Real Estate Mailing Recipient'
+    _order = 'id'
+    _rec_name = 'partner_id'
+
+    mailing_id = fields.Many2one(
+        comodel_name='real.estate.mailing',
+        string='Mailing',
+        required=True,
+        ondelete='cascade',
+        index=True,
+    )
+    partner_id = fields.Many2one(
+        comodel_name='res.partner',
+        string='Recipient',
+        required=True,
+        ondelete='cascade',
+    )
+    email = fields.Char(
+        string='Email',
+        related='partner_id.email',
+    )
+    state = fields.Selection(
+        selection=[
+            ('queued', 'Queued'),
+            ('sent', 'Sent'),
+            ('failed', 'Failed'),
+        ],
+        string='Status',
+        default='queued',
+        required=True,
+        index=True,
+    )
+    date_sent = fields.Datetime(
+        string='Sent On',
+        readonly=True,
+        index=True,
+        help="Date of the delivery attempt, failed ones included.",
+    )
+    error = fields.Text(
+        string='Error',
+        readonly=True,
+    )
+
+    def _send(self):
+        """Render the template of each recipient, in one call per mailing,
+        and send the mails right away, recording each delivery status."""
+        Mail = self.env['mail.mail'].sudo()
+        mail_by_recipient = {}
+        for mailing in self.mailing_id:
+            recipients = self.filtered(lambda recipient: recipient.mailing_id == mailing)
+            rendered = mailing.template_id.generate_email(recipients.ids, ['subject', 'body_html', 'email_from'])
+            mails = Mail.create([{
+                'subject': rendered[recipient.id]['subject'],
+                'body_html': rendered[recipient.id]['body_html'],
+                'email_from': rendered[recipient.id]['email_from'],
+                'recipient_ids': [(4, recipient.partner_id.id)],
+                'model': mailing.property_id._name,
+                'res_id': mailing.property_id.id,
+                'auto_delete': True,
+            } for recipient in recipients])
+            mail_by_recipient.update(zip(recipients, mails))
+        Mail.union(*mail_by_recipient.values()).send(auto_commit=False, raise_exception=False)
+
+        # Sent mails are deleted, failed ones are kept with their reason. Both
+        # count in the rate of the mailings.
+        now = fields.Datetime.now()
+        sent = self.browse()
+        for recipient, mail in mail_by_recipient.items():
+            mail = mail.exists()
+            if mail and mail.state == 'exception':
+                recipient.write({'state': 'failed', 'error': mail.failure_reason, 'date_sent': now})
+            else:
+                sent |= recipient
+        sent.write({'state': 'sent', 'date_sent': now})
@@ -0,0 +1,177 @@
+from odoo import api, fields, models
+from datetime import timedelta
+
+
+class PerfStat(models.Model):
+    """Timing and query statistics of the instrumented business methods, per
+    method and hour, filled by ``instrumentation.flush``."""
+    _name = 'real.estate.perf.stat'
+    _description = 'Real Estate Performance Statistics'
+    _order = 'date desc, duration desc'
+    _rec_name = 'method'
+
+    date = fields.Datetime(
+        string='Hour',
+        required=True,
+        readonly=True,
+    )
+    model = fields.Char(
+        string='Model',
+        required=True,
+        readonly=True,
+    )
+    method = fields.Char(
+        string='Method',
+        required=True,
+        readonly=True,
+    )
+    call_count = fields.Integer(
+        string='Calls',
+        readonly=True,
+    )
+    record_count = fields.Integer(
+        string='Records',
+        readonly=True,
+    )
+    query_count = fields.Integer(
+        string='Queries',
+        readonly=True,
+    )
+    duration = fields.Float(
+        string='Duration (s)',
+        digits=(16, 3),
+        readonly=True,
+    )
+    max_duration = fields.Float(
+        string='Max Duration (s)',
+        digits=(16, 3),
+        readonly=True,
+        group_operator='max',
+    )
+    avg_duration = fields.Float(
+        string='Avg Duration (ms)',
+        compute='_compute_averages',
+        digits=(16, 1),
+    )
+    avg_query_count = fields.Float(
+        string='Avg Queries',
+        compute='_compute_averages',
+        digits=(16, 1),
+    )
+
+    _sql_constraints = [
+        ('method_date_uniq', 'unique(model, method, date)', 'Statistics are aggregated per method and hour.'),
+    ]
+
+    @api.depends('call_count', 'duration', 'query_count')
+    def _compute_averages(self):
+        for stat in self:
+            calls = stat.call_count or 1
+            stat.avg_duration = stat.duration * 1000 / calls
+            stat.avg_query_count = stat.query_count / calls
+
+    @api.model
+    def _add_stats(self, rows):
+        """Add ``(model, method, calls, records, queries, duration, max
+        duration)`` rows to the statistics of the current hour, and to the
+        totals of the methods."""
+        values = ', '.join(['%s'] * len(rows))
+        self.env.cr.execute("""
+            INSERT INTO real_estate_perf_stat AS stat
+                   (date, model, method, call_count, record_count, query_count, duration, max_duration)
+            SELECT date_trunc('hour', now() AT TIME ZONE 'UTC'), data.*
+              FROM (VALUES {values}) AS data
+                ON CONFLICT (model, method, date) DO UPDATE
+               SET call_count = stat.call_count + EXCLUDED.call_count,
+                   record_count = stat.record_count + EXCLUDED.record_count,
+                   query_count = stat.query_count + EXCLUDED.query_count,
+                   duration = stat.duration + EXCLUDED.duration,
+                   max_duration = GREATEST(stat.max_duration, EXCLUDED.max_duration)
+        """.format(values=values), rows)
+        self.env.cr.execute("""
+            INSERT INTO real_estate_perf_counter AS counter
+                   (model, method, call_count, record_count, query_count, duration)
+            SELECT model, method, call_count, record_count, query_count, duration
+              FROM (VALUES {values})
+                   AS data(model, method, call_count, record_count, query_count, duration, max_duration)
+                ON CONFLICT (model, method) DO UPDATE
+               SET call_count = counter.call_count + EXCLUDED.call_count,
+                   record_count = counter.record_count + EXCLUDED.record_count,
+                   query_count = counter.query_count + EXCLUDED.query_count,
+                   duration = counter.duration + EXCLUDED.duration
+        """.format(values=values), rows)
+        self.invalidate_model()
+        self.env['real.estate.perf.counter'].invalidate_model()
+
+    @api.model
+    def _export_prometheus(self):
+        """Return the totals of the methods as Prometheus counters, in the
+        text exposition format."""
+        self.env['real.estate.perf.counter'].flush_model()
+        self.env.cr.execute("""
+            SELECT model, method, call_count, record_count, query_count, duration
+              FROM real_estate_perf_counter
+          ORDER BY model, method
+        """)
+        rows = self.env.cr.fetchall()
+        metrics = [
+            ('real_estate_method_calls_total', 'Calls of the method.', 2),
+            ('real_estate_method_records_total', 'Records processed by the method.', 3),
+            ('real_estate_method_queries_total', 'SQL queries run by the method.', 4),
+            ('real_estate_method_duration_seconds_total', 'Wall time spent in the method.', 5),
+        ]
+        lines = []
+        for name, help_text, column in metrics:
+            lines.append('# HELP %s %s' % (name, help_text))
+            lines.append('# TYPE %s counter' % name)
+            for row in rows:
+                lines.append('%s{model="%s",method="%s"} %s' % (name, row[0], row[1], row[column]))
+        return '\n'.join(lines) + '\n'
+
+    @api.autovacuum
+    def _gc_stats(self):
+        """Keep three months of statistics, the totals are kept."""
+        limit = fields.Datetime.now() - timedelta(days=90)
+        self.search([('date', '<', limit)]).unlink()
+
+
+class PerfCounter(models.Model):
+    """Totals of the instrumented business methods since the instrumentation
+    was enabled, exported as Prometheus counters. Unlike the hourly
+    statistics, they are never deleted, so the counters never decrease."""
+    _name = 'real.estate.perf.counter'
+    _description = 'Real Estate Performance Counter'
+    _order = 'model, method'
+    _rec_name = 'method'
+
+    model = fields.Char(
+        string='Model',
+        required=True,
+        readonly=True,
+    )
+    method = fields.Char(
+        string='Method',
+        required=True,
+        readonly=True,
+    )
+    call_count = fields.Integer(
+        string='Calls',
+        readonly=True,
+    )
+    record_count = fields.Integer(
+        string='Records',
+        readonly=True,
+    )
+    query_count = fields.Integer(
+        string='Queries',
+        readonly=True,
+    )
+    duration = fields.Float(
+        string='Duration (s)',
+        digits=(16, 3),
+        readonly=True,
+    )
+
+    _sql_constraints = [
+        ('model_method_uniq', 'unique(model, method)', 'Counters are aggregated per method.'),
+    ]
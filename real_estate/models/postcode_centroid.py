@@ -0,0 +1,64 @@
+from odoo import api, fields, models
+import re
+
+
+def normalize_postcode(postcode):
+    """Return the postcode without spaces and in upper case, as stored in the
+    centroid table."""
+    return re.sub(r'\s+', '', postcode or '').upper()
+
+
+class PostcodeCentroid(models.Model):
+    _name = 'real.estate.postcode.centroid'
+    _description = 'Postcode Centroid'
+    _order = 'country_id, postcode'
+    _rec_name = 'postcode'
+
+    postcode = fields.Char(
+        string='Postcode',
+        required=True,
+    )
+    country_id = fields.Many2one(
+        comodel_name='res.country',
+        string='Country',
+    )
+    latitude = fields.Float(
+        string='Latitude',
+        digits=(10, 7),
+        required=True,
+    )
+    longitude = fields.Float(
+        string='Longitude',
+        digits=(10, 7),
+        required=True,
+    )
+
+    _sql_constraints = [
+        ('postcode_country_uniq', 'unique(postcode, country_id)', 'This postcode already has a centroid for this country!'),
+    ]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if vals.get('postcode'):
+                vals['postcode'] = normalize_postcode(vals['postcode'])
+        return super(PostcodeCentroid, self).create(vals_list)
+
+    def write(self, vals):
+        if vals.get('postcode'):
+            vals = dict(vals, postcode=normalize_postcode(vals['postcode']))
+        return super(PostcodeCentroid, self).write(vals)
+
+    @api.model
+    def _get_centroids(self, postcodes):
+        """Return the centroids of the given postcodes, as a dict
+        ``{(country_id or False, postcode): (latitude, longitude)}``."""
+        centroids = self.search_read(
+            [('postcode', 'in', [normalize_postcode(postcode) for postcode in postcodes])],
+            ['postcode', 'country_id', 'latitude', 'longitude'],
+        )
+        return {
+            (centroid['country_id'] and centroid['country_id'][0], centroid['postcode']):
+                (centroid['latitude'], centroid['longitude'])
+            for centroid in centroids
+        }
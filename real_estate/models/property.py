@@ -1,6 +1,42 @@
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError, ValidationError
+from odoo.tools.misc import human_size
+from collections import defaultdict
 from datetime import timedelta
+import base64
+import hashlib
+import math
+import os
+import threading
+
+from .instrumentation import instrumented
+from .postcode_centroid import normalize_postcode
+from .property_duplicate import get_address_key
+from .saved_search import MATCHING_FIELDS
+from .sql_indexes import SqlIndex, create_indexes
+
+# Context of the bulk import mode, enabled with the ``real_estate_bulk_import``
+# key: no field tracking, creation log or auto-subscription per record
+BULK_IMPORT_CONTEXT = {
+    'tracking_disable': True,
+    'mail_create_nolog': True,
+    'mail_create_nosubscribe': True,
+    'mail_notrack': True,
+}
+
+# Text fields of the full-text search document, by decreasing weight
+FULLTEXT_FIELDS = ['name', 'city', 'address', 'amenities', 'description']
+
+# Minimum trigram similarity of the address keys of duplicate listings
+DUPLICATE_SIMILARITY = 0.6
+
+# Image fields naming the files read and written on the server, only set by
+# the module itself
+PROTECTED_IMAGE_FIELDS = {'checksum', 'cold_storage_path'}
+
+# Mean radius of the Earth and length of one degree of latitude, in km
+EARTH_RADIUS = 6371.0088
+DEGREE_LENGTH = 111.195
 
 
 class Property(models.Model):
@@ -8,6 +44,22 @@ class Property(models.Model):
     _description = 'Real Estate Property'
     _inherit = ['mail.thread', 'mail.activity.mixin']
     _order = 'id desc'
+    # Indexes matching the search view filters and groupings, the salesperson
+    # record rule and ``_order``, restricted to the active listings
+    _sql_indexes = [
+        SqlIndex('real_estate_property_state_idx', ['state', 'id DESC'], where='active'),
+        SqlIndex('real_estate_property_type_state_idx', ['property_type_id', 'state'], where='active'),
+        SqlIndex('real_estate_property_city_idx', ['city'], where='active'),
+        SqlIndex('real_estate_property_user_idx', ['user_id', 'id DESC'], where='active'),
+        SqlIndex('real_estate_property_no_user_idx', ['id DESC'], where='active AND user_id IS NULL'),
+        SqlIndex('real_estate_property_garden_idx', ['id DESC'], where='active AND garden'),
+        SqlIndex('real_estate_property_garage_idx', ['id DESC'], where='active AND garage'),
+        SqlIndex('real_estate_property_furnished_idx', ['id DESC'], where='active AND furnished'),
+        SqlIndex('real_estate_property_search_vector_idx', ['search_vector'], method='gin'),
+        SqlIndex('real_estate_property_location_idx', ['latitude', 'longitude'], where='active'),
+        SqlIndex('real_estate_property_write_date_idx', ['write_date', 'id']),
+        SqlIndex('real_estate_property_price_idx', ['expected_price DESC', 'id DESC'], where='active'),
+    ]
 
     name = fields.Char(
         string='Title',
@@ -110,6 +162,11 @@ class Property(models.Model):
         copy=False,
         tracking=True,
     )
+    date_sold = fields.Date(
+        string='Sold On',
+        readonly=True,
+        copy=False,
+    )
     tag_ids = fields.Many2many(
         comodel_name='real.estate.property.tag',
         string='Tags',
@@ -129,6 +186,27 @@ class Property(models.Model):
         compute='_compute_best_offer',
         store=True,
     )
+    # Summary of the refused offers deleted when the listing was archived
+    refused_offer_count = fields.Integer(
+        string='Archived Refused Offers',
+        readonly=True,
+        copy=False,
+    )
+    refused_offer_min_price = fields.Float(
+        string='Lowest Refused Offer',
+        readonly=True,
+        copy=False,
+    )
+    refused_offer_max_price = fields.Float(
+        string='Highest Refused Offer',
+        readonly=True,
+        copy=False,
+    )
+    refused_offer_avg_price = fields.Float(
+        string='Average Refused Offer',
+        readonly=True,
+        copy=False,
+    )
     address = fields.Char(
         string='Address',
         tracking=True,
@@ -142,6 +220,13 @@ class Property(models.Model):
         string='Country',
         tracking=True,
     )
+    address_key = fields.Char(
+        string='Address Key',
+        compute='_compute_address_key',
+        store=True,
+        index='trigram',
+        help="Normalized postcode and address, on which duplicate listings are matched.",
+    )
     property_image_ids = fields.One2many(
         comodel_name='real.estate.property.image',
         inverse_name='property_id',
@@ -161,19 +246,175 @@ class Property(models.Model):
         string='Furnished',
         tracking=True,
     )
-    
+    latitude = fields.Float(
+        string='Latitude',
+        digits=(10, 7),
+    )
+    longitude = fields.Float(
+        string='Longitude',
+        digits=(10, 7),
+    )
+    map_bounds = fields.Char(
+        string='Map Bounds',
+        compute='_compute_map_bounds',
+        search='_search_map_bounds',
+        help="Search the properties located in a box given as 'south,west,north,east'",
+    )
+    fulltext = fields.Char(
+        string='Full Text',
+        compute='_compute_fulltext',
+        search='_search_fulltext',
+        help="Search the title, address, city, amenities and description",
+    )
+
+    def init(self):
+        # Weighted full-text document, kept up to date by PostgreSQL whenever
+        # one of its fields is written
+        self._cr.execute("""
+            ALTER TABLE real_estate_property
+            ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(city, '') || ' ' || coalesce(address, '')), 'B') ||
+                setweight(to_tsvector('simple', coalesce(amenities, '')), 'C') ||
+                setweight(to_tsvector('simple', coalesce(description, '')), 'D')
+            ) STORED
+        """)
+        create_indexes(self._cr, self._table, self._sql_indexes)
+
+    def _compute_map_bounds(self):
+        self.map_bounds = False
+
+    def _search_map_bounds(self, operator, value):
+        if operator not in ('=', 'ilike'):
+            raise UserError(_("The map bounds only support searching for a box."))
+        try:
+            if isinstance(value, str):
+                value = value.split(',')
+            south, west, north, east = (float(bound) for bound in value)
+        except (TypeError, ValueError):
+            raise UserError(_("The map bounds must be given as 'south,west,north,east'."))
+        domain = [('latitude', '>=', south), ('latitude', '<=', north)]
+        if west <= east:
+            return domain + [('longitude', '>=', west), ('longitude', '<=', east)]
+        # The box crosses the antimeridian
+        return domain + ['|', ('longitude', '>=', west), ('longitude', '<=', east)]
+
+    def _compute_fulltext(self):
+        self.fulltext = False
+
+    def _search_fulltext(self, operator, value):
+        if operator not in ('=', 'ilike') or not isinstance(value, str):
+            raise UserError(_("The full-text search only supports searching for a text."))
+        self.flush_model(FULLTEXT_FIELDS)
+        return [('id', 'inselect', (
+            "SELECT id FROM real_estate_property WHERE search_vector @@ websearch_to_tsquery('simple', %s)",
+            [value],
+        ))]
+
+    @api.model
+    def search_fulltext(self, query, limit=80):
+        """Return the properties matching the full-text ``query`` (web search
+        syntax), the most relevant first."""
+        self.flush_model(FULLTEXT_FIELDS)
+        visible_query, visible_params = self._search([]).subselect()
+        self.env.cr.execute(f"""
+            SELECT id
+              FROM real_estate_property, websearch_to_tsquery('simple', %s) AS query
+             WHERE search_vector @@ query
+               AND id IN ({visible_query})
+          ORDER BY ts_rank(search_vector, query) DESC, id DESC
+             LIMIT %s
+        """, [query, *visible_params, limit])
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
     @api.depends('living_area', 'garden_area')
+    @instrumented
     def _compute_total_area(self):
         for record in self:
             record.total_area = record.living_area + record.garden_area
 
-    @api.depends('offer_ids.price')
+    @api.depends('offer_ids.price', 'refused_offer_max_price')
+    @instrumented
     def _compute_best_offer(self):
+        # Saved records get their best offer from one aggregate query, unsaved
+        # ones (e.g. in onchange) from the offers in cache. The refused offers
+        # of archived listings only remain in their summary.
+        saved = self.filtered(lambda record: not isinstance(record.id, models.NewId))
+        best_offers = {
+            group['property_id'][0]: group['price']
+            for group in self.env['real.estate.property.offer'].read_group(
+                [('property_id', 'in', saved.ids)], ['price:max'], ['property_id'],
+            )
+        } if saved else {}
+        for record in saved:
+            record.best_offer = max(best_offers.get(record.id, 0.0), record.refused_offer_max_price)
+        for record in self - saved:
+            record.best_offer = max(record.offer_ids.mapped('price'), default=record.refused_offer_max_price)
+
+    @api.depends('postcode', 'address', 'city')
+    def _compute_address_key(self):
         for record in self:
-            if record.offer_ids:
-                record.best_offer = max(record.offer_ids.mapped('price'))
-            else:
-                record.best_offer = 0.0
+            record.address_key = get_address_key(record.postcode, record.address, record.city)
+
+    def _find_duplicates(self, limit=5):
+        """Return the ids of the active listings likely to be the same
+        property as each record, as ``{record_id: [candidate_ids]}``."""
+        records = self.filtered('address_key')
+        if not records:
+            return {}
+        return self._query_duplicates(
+            "SELECT id, address_key FROM real_estate_property WHERE id IN %s",
+            [tuple(records.ids)], limit,
+        )
+
+    @api.model
+    def _query_duplicates(self, records_query, records_params, limit):
+        """Match the ``(id, address_key)`` rows of ``records_query`` with
+        the active listings, from the trigram index of the address keys (the
+        exact key without pg_trgm), in one query."""
+        self.flush_model(['address_key', 'active'])
+        if self.env.registry.has_trigram:
+            # ``%`` uses the index, with pg_trgm's default threshold of 0.3
+            match = "candidate.address_key %% record.address_key AND similarity(candidate.address_key, record.address_key) >= %s"
+            rank = "similarity(candidate.address_key, record.address_key) DESC"
+            params = [DUPLICATE_SIMILARITY]
+        else:
+            match = "candidate.address_key = record.address_key"
+            rank = "candidate.id"
+            params = []
+        self.env.cr.execute(f"""
+            SELECT record.id, candidate.id
+              FROM ({records_query}) AS record(id, address_key)
+              CROSS JOIN LATERAL (
+                    SELECT candidate.id
+                      FROM real_estate_property candidate
+                     WHERE {match}
+                       AND candidate.id IS DISTINCT FROM record.id
+                       AND candidate.active
+                  ORDER BY {rank}
+                     LIMIT %s
+              ) candidate
+        """, [*records_params, *params, limit])
+        duplicates = {}
+        for record_id, candidate_id in self.env.cr.fetchall():
+            duplicates.setdefault(record_id, []).append(candidate_id)
+        return duplicates
+
+    @api.onchange('address', 'postcode', 'city')
+    def _onchange_address_duplicates(self):
+        key = get_address_key(self.postcode, self.address, self.city)
+        if not key or not self.address:
+            return
+        duplicates = self._query_duplicates(
+            "VALUES (%s::integer, %s::varchar)", [self._origin.id or None, key], 5,
+        )
+        # Listings of other salespeople are duplicates too
+        duplicates = self.sudo().browse(duplicates.get(self._origin.id or None, []))
+        if duplicates:
+            return {'warning': {
+                'title': _("Possible duplicate"),
+                'message': _("This address looks like the one of: %s", ', '.join(duplicates.mapped('name'))),
+            }}
 
     @api.onchange('garden')
     def _onchange_garden(self):
@@ -184,15 +425,17 @@ class Property(models.Model):
             self.garden_area = 0
             self.garden_orientation = False
 
+    @instrumented
     def action_sold(self):
         for record in self:
             if record.state == 'canceled':
                 raise UserError(_("Canceled properties cannot be sold."))
             if not record.buyer_id:
                 raise UserError(_("You cannot sell a property without a buyer."))
-            record.state = 'sold'
+        self.write({'state': 'sold', 'date_sold': fields.Date.context_today(self)})
         return True
 
+    @instrumented
     def action_cancel(self):
         for record in self:
             if record.state == 'sold':
@@ -200,6 +443,7 @@ class Property(models.Model):
             record.state = 'canceled'
         return True
     
+    @instrumented
     def action_mark_as_rented(self):
         for record in self:
             if record.state in ['sold', 'canceled']:
@@ -218,14 +462,207 @@ class Property(models.Model):
         for record in self:
             if record.state in ['sold', 'offer_accepted']:
                 raise UserError(_("You cannot delete a property that is sold or has an accepted offer."))
+
+    @api.model_create_multi
+    @instrumented
+    def create(self, vals_list):
+        if self.env.context.get('real_estate_bulk_import'):
+            properties = super(Property, self.with_context(**BULK_IMPORT_CONTEXT)).create(vals_list)
+            # Log one summary note for the whole batch instead of one per record
+            if properties:
+                properties[:1]._message_log(
+                    body=_("Bulk import: %(count)s properties created (ids %(first)s to %(last)s).",
+                           count=len(properties), first=min(properties.ids), last=max(properties.ids)),
+                )
+            properties = properties.with_context(self.env.context)
+        else:
+            properties = super(Property, self).create(vals_list)
+            # Imports look for duplicates in the batch job instead
+            duplicates = properties._find_duplicates()
+            for prop in properties.filtered(lambda prop: prop.id in duplicates):
+                prop._message_log(body=_(
+                    "Possible duplicate of: %s",
+                    ', '.join(self.sudo().browse(duplicates[prop.id]).mapped('display_name')),
+                ))
+        properties._geocode_from_postcodes()
+        self.env['real.estate.saved.search']._match_properties(properties)
+        return properties
+
+    def write(self, vals):
+        if self.env.context.get('real_estate_bulk_import'):
+            res = super(Property, self.with_context(**BULK_IMPORT_CONTEXT)).write(vals)
+        else:
+            res = super(Property, self).write(vals)
+        if {'postcode', 'country_id'} & vals.keys() and not {'latitude', 'longitude'} & vals.keys():
+            self._geocode_from_postcodes(force=True)
+        if not vals.keys().isdisjoint(MATCHING_FIELDS):
+            self.env['real.estate.saved.search']._match_properties(self)
+        return res
+
+    def _geocode_from_postcodes(self, force=False):
+        """Locate the properties at the centroid of their postcode, read from
+        the local centroid table. Unless ``force`` is set, the properties that
+        already have coordinates are left untouched."""
+        properties = self.filtered(
+            lambda prop: prop.postcode and (force or not (prop.latitude or prop.longitude))
+        )
+        if not properties:
+            return
+        centroids = self.env['real.estate.postcode.centroid']._get_centroids(properties.mapped('postcode'))
+        # One write per centroid, shared by the properties of a postcode
+        properties_by_location = defaultdict(list)
+        for prop in properties:
+            postcode = normalize_postcode(prop.postcode)
+            location = centroids.get((prop.country_id.id, postcode)) or centroids.get((False, postcode))
+            if location:
+                properties_by_location[location].append(prop.id)
+            elif force:
+                properties_by_location[(0.0, 0.0)].append(prop.id)
+        for (latitude, longitude), property_ids in properties_by_location.items():
+            self.browse(property_ids).write({'latitude': latitude, 'longitude': longitude})
+
+    @api.model
+    def _cron_geocode(self, batch_size=1000):
+        """Locate the properties without coordinates, one committed batch at a
+        time."""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        last_id = 0
+        while True:
+            properties = self.with_context(active_test=False).search([
+                ('postcode', '!=', False),
+                ('latitude', 'in', [False, 0.0]),
+                ('longitude', 'in', [False, 0.0]),
+                ('id', '>', last_id),
+            ], order='id', limit=batch_size)
+            if not properties:
+                break
+            properties._geocode_from_postcodes()
+            last_id = properties[-1].id
+            if auto_commit:
+                self.env.cr.commit()
+
+    @api.model
+    def search_nearby(self, latitude, longitude, radius_km, limit=None):
+        """Return the properties within ``radius_km`` of the given point, the
+        closest first.
+
+        A bounding box around the point is looked up through the location
+        index, then the great-circle distance filters and sorts its content.
+        """
+        delta_lat = radius_km / DEGREE_LENGTH
+        delta_lon = radius_km / (DEGREE_LENGTH * max(math.cos(math.radians(latitude)), 1e-6))
+        where = ['latitude BETWEEN %s AND %s']
+        params = [latitude - delta_lat, latitude + delta_lat]
+        if longitude - delta_lon >= -180 and longitude + delta_lon <= 180:
+            where.append('longitude BETWEEN %s AND %s')
+            params += [longitude - delta_lon, longitude + delta_lon]
+
+        self.flush_model(['latitude', 'longitude'])
+        visible_query, visible_params = self._search([]).subselect()
+        self.env.cr.execute(f"""
+            SELECT id FROM (
+                SELECT id, 2 * %s * asin(sqrt(
+                           power(sin(radians(latitude - %s) / 2), 2)
+                           + cos(radians(%s)) * cos(radians(latitude))
+                           * power(sin(radians(longitude - %s) / 2), 2)
+                       )) AS distance
+                  FROM real_estate_property
+                 WHERE {' AND '.join(where)}
+                   AND active
+                   AND (latitude != 0 OR longitude != 0)
+                   AND id IN ({visible_query})
+            ) AS nearby
+             WHERE distance <= %s
+          ORDER BY distance, id
+             LIMIT %s
+        """, [EARTH_RADIUS, latitude, latitude, longitude, *params, *visible_params, radius_km, limit])
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
                 
+    @api.model
+    def _cron_archive_closed(self, batch_size=1000):
+        """Archive the sold and canceled listings closed for more than
+        ``real_estate.archive_after_days`` days, one committed batch at a time."""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        params = self.env['ir.config_parameter'].sudo()
+        days = int(params.get_param('real_estate.archive_after_days', 0) or 0)
+        if days <= 0:
+            return
+        cold_storage_path = params.get_param('real_estate.cold_storage_path')
+        limit = fields.Date.context_today(self) - timedelta(days=days)
+        # Canceled listings have no closing date, their last change is used
+        domain = [
+            ('state', 'in', ['sold', 'canceled']),
+            '|', ('date_sold', '<', limit),
+            '&', ('date_sold', '=', False), ('write_date', '<', limit),
+        ]
+        while True:
+            properties = self.search(domain, order='id', limit=batch_size)
+            if not properties:
+                break
+            properties._archive_closed(cold_storage_path)
+            if auto_commit:
+                self.env.cr.commit()
+
+    def _archive_closed(self, cold_storage_path=None):
+        """Archive the listings, replace their refused offers by a summary
+        and move their full-size images to cold storage, if configured."""
+        Offer = self.env['real.estate.property.offer']
+        refused_domain = [('property_id', 'in', self.ids), ('status', '=', 'refused')]
+        summaries = {
+            group['property_id'][0]: group
+            for group in Offer.read_group(
+                refused_domain,
+                ['min_price:min(price)', 'max_price:max(price)', 'sum_price:sum(price)'],
+                ['property_id'],
+            )
+        }
+        for record in self.filtered(lambda record: record.id in summaries):
+            summary = summaries[record.id]
+            count = record.refused_offer_count + summary['property_id_count']
+            total = record.refused_offer_avg_price * record.refused_offer_count + summary['sum_price']
+            record.write({
+                'refused_offer_count': count,
+                'refused_offer_min_price': min(
+                    summary['min_price'], record.refused_offer_min_price or summary['min_price'],
+                ),
+                'refused_offer_max_price': max(summary['max_price'], record.refused_offer_max_price),
+                'refused_offer_avg_price': total / count,
+            })
+        Offer.search(refused_domain).unlink()
+        if cold_storage_path:
+            self.property_image_ids._move_to_cold_storage(cold_storage_path)
+        self.write({'active': False})
+
+    def action_restore_archived(self):
+        """Unarchive the listings and bring their images back from cold
+        storage. Refused offers only remain in their summary."""
+        self.property_image_ids.filtered('cold_storage_path')._restore_from_cold_storage()
+        self.write({'active': True})
+        return True
+
     def action_send_email(self):
-        """Send email about this property to interested parties"""
+        """Queue the listing for the interested partners: its bidders and the
+        buyers whose saved searches match it. The mails are rendered and sent
+        by a rate-limited cron, so that this returns at once."""
         self.ensure_one()
-        # This would be implemented with email templates and email sending logic
-        # For now, it's just a placeholder
+        matches = self.env['real.estate.saved.search.match'].sudo().search([('property_id', '=', self.id)])
+        partners = (self.offer_ids.partner_id | matches.partner_id).filtered('email')
+        if not partners:
+            raise UserError(_("No interested partner with an email address for this property."))
+        mailing = self.env['real.estate.mailing'].create({
+            'property_id': self.id,
+            'template_id': self.env.ref('real_estate.mail_template_property_listing').id,
+            'recipient_ids': [(0, 0, {'partner_id': partner.id}) for partner in partners],
+        })
+        self.env.ref('real_estate.ir_cron_send_mailings')._trigger()
         return {
-            'type': 'ir.actions.act_window_close'
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _("Mailing Queued"),
+                'message': _("%(name)s will be sent to %(count)s partners.", name=mailing.name, count=len(partners)),
+                'type': 'success',
+            },
         }
 
 
@@ -242,11 +679,26 @@ class PropertyImage(models.Model):
         string='Sequence',
         default=10,
     )
-    image = fields.Binary(
+    image = fields.Image(
         string='Image',
-        attachment=True,
+        max_width=1920,
+        max_height=1920,
         required=True,
     )
+    # Resized variants, generated once at upload time, for the views that do
+    # not need the full-size image
+    image_512 = fields.Image(
+        string='Image 512',
+        max_width=512,
+        max_height=512,
+        readonly=True,
+    )
+    image_128 = fields.Image(
+        string='Image 128',
+        max_width=128,
+        max_height=128,
+        readonly=True,
+    )
     property_id = fields.Many2one(
         comodel_name='real.estate.property',
         string='Property',
@@ -256,3 +708,234 @@ class PropertyImage(models.Model):
     description = fields.Text(
         string='Description',
     )
+    checksum = fields.Char(
+        string='Checksum',
+        readonly=True,
+        copy=False,
+        index=True,
+        help="SHA1 of the uploaded image. Identical uploads reuse the variants "
+             "of the first copy and share its files in the filestore.",
+    )
+    cold_storage_path = fields.Char(
+        string='Cold Storage File',
+        readonly=True,
+        copy=False,
+        help="File of the full-size image once moved to cold storage, the image "
+             "is then its 512px variant until restored.",
+    )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        if not self.env.su:
+            for vals in vals_list:
+                for fname in PROTECTED_IMAGE_FIELDS:
+                    vals.pop(fname, None)
+        self._prepare_image_vals(vals_list)
+        return super(PropertyImage, self).create(vals_list)
+
+    def write(self, vals):
+        if not self.env.su and PROTECTED_IMAGE_FIELDS & vals.keys():
+            vals = {fname: value for fname, value in vals.items() if fname not in PROTECTED_IMAGE_FIELDS}
+        if 'image' in vals:
+            vals = dict(vals)
+            self._prepare_image_vals([vals])
+        return super(PropertyImage, self).write(vals)
+
+    @api.model
+    def _prepare_image_vals(self, vals_list):
+        """Set the checksum and the resized variants of the uploaded images.
+
+        The filestore is content-addressed: attachments with the same content
+        share one file, which is only garbage-collected once no attachment
+        refers to it anymore. Uploads already known by their checksum take the
+        stored variants of the first copy, so that they are not resized again
+        and end up pointing to the same files.
+        """
+        for vals in vals_list:
+            if 'image' in vals:
+                vals['checksum'] = vals['image'] and self._image_checksum(vals['image'])
+        checksums = {vals['checksum'] for vals in vals_list if vals.get('checksum')}
+        # Images in cold storage only keep their 512px variant
+        sources = {
+            group['checksum']: group['id']
+            for group in self.read_group(
+                [('checksum', 'in', list(checksums)), ('cold_storage_path', '=', False)],
+                ['id:min'], ['checksum'],
+            )
+        } if checksums else {}
+        source_images = {
+            image.id: image
+            for image in self.browse(sources.values()).with_context(bin_size=False)
+        }
+        for vals in vals_list:
+            if 'image' not in vals:
+                continue
+            source = source_images.get(sources.get(vals['checksum']))
+            if source and source.image_128:
+                vals.update(image=source.image, image_512=source.image_512, image_128=source.image_128)
+            else:
+                vals.update(image_512=vals['image'], image_128=vals['image'])
+
+    @api.model
+    def _image_checksum(self, image):
+        return hashlib.sha1(base64.b64decode(image)).hexdigest()
+
+    @api.model
+    def _cron_generate_image_variants(self, batch_size=100):
+        """Generate the resized variants of the images uploaded before they
+        existed, one committed batch at a time."""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        last_id = 0
+        while True:
+            images = self.search([
+                ('image_128', '=', False),
+                ('id', '>', last_id),
+            ], order='id', limit=batch_size)
+            if not images:
+                break
+            for image in images.with_context(bin_size=False):
+                image.write({'image_512': image.image, 'image_128': image.image})
+            last_id = images[-1].id
+            if auto_commit:
+                self.env.cr.commit()
+
+    @api.model
+    def _cold_storage_file(self, path, filename):
+        """Return the real path of ``filename``, which must be a file of the
+        cold storage directory ``path`` of the database."""
+        if not path:
+            raise UserError(_("No cold storage directory is configured."))
+        directory = os.path.realpath(os.path.join(path, self.env.cr.dbname))
+        filename = os.path.realpath(os.path.join(directory, filename))
+        if os.path.commonpath([directory, filename]) != directory:
+            raise UserError(_("The file %s is not in the cold storage directory.", filename))
+        return filename
+
+    def _move_to_cold_storage(self, path):
+        """Write the full-size images to files under ``path``, named by
+        checksum, and keep their 512px variant as image."""
+        for image in self.filtered(lambda image: not image.cold_storage_path).with_context(bin_size=False):
+            if not image.image:
+                continue
+            content = base64.b64decode(image.image)
+            # Computed from the content: the stored one names the file
+            checksum = hashlib.sha1(content).hexdigest()
+            filename = self._cold_storage_file(path, os.path.join(checksum[:2], checksum))
+            if not os.path.exists(filename):
+                os.makedirs(os.path.dirname(filename), exist_ok=True)
+                with open(filename, 'wb') as cold_file:
+                    cold_file.write(content)
+            # Bypass _prepare_image_vals: the checksum and variants are those
+            # of the full-size image
+            super(PropertyImage, image).write({
+                'image': image.image_512 or image.image,
+                'cold_storage_path': filename,
+                'checksum': checksum,
+            })
+
+    def _restore_from_cold_storage(self):
+        path = self.env['ir.config_parameter'].sudo().get_param('real_estate.cold_storage_path')
+        for image in self.filtered('cold_storage_path'):
+            filename = self._cold_storage_file(path, image.cold_storage_path)
+            try:
+                with open(filename, 'rb') as cold_file:
+                    content = cold_file.read()
+            except OSError:
+                raise UserError(_("The full-size file of image %s is missing from cold storage: %s",
+                                  image.name, filename))
+            if hashlib.sha1(content).hexdigest() != os.path.basename(filename):
+                raise UserError(_("The full-size file of image %s does not match its content: %s",
+                                  image.name, filename))
+            super(PropertyImage, image).write({
+                'image': base64.b64encode(content),
+                'cold_storage_path': False,
+            })
+
+    @api.model
+    def _get_storage_report(self):
+        """Return the size of the image attachments and of the files actually
+        stored for them, identical contents being stored once."""
+        self.env['ir.attachment'].flush_model()
+        self.env.cr.execute("""
+            SELECT count(*), count(DISTINCT checksum), coalesce(sum(file_size), 0)
+              FROM ir_attachment
+             WHERE res_model = %s AND res_field IS NOT NULL
+        """, [self._name])
+        attachment_count, blob_count, total_size = self.env.cr.fetchone()
+        self.env.cr.execute("""
+            SELECT coalesce(sum(file_size), 0)
+              FROM (SELECT DISTINCT ON (checksum) file_size
+                      FROM ir_attachment
+                     WHERE res_model = %s AND res_field IS NOT NULL
+                  ORDER BY checksum) AS blobs
+        """, [self._name])
+        stored_size = self.env.cr.fetchone()[0]
+        return {
+            'attachments': attachment_count,
+            'blobs': blob_count,
+            'total_size': total_size,
+            'stored_size': stored_size,
+            'saved_size': total_size - stored_size,
+        }
+
+    @api.model
+    def action_storage_report(self):
+        report = self._get_storage_report()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _("Image Storage"),
+                'message': _(
+                    "%(attachments)s image files for %(blobs)s distinct contents: "
+                    "%(stored)s stored instead of %(total)s, %(saved)s saved.",
+                    attachments=report['attachments'], blobs=report['blobs'],
+                    stored=human_size(report['stored_size']), total=human_size(report['total_size']),
+                    saved=human_size(report['saved_size']),
+                ),
+                'sticky': True,
+            },
+        }
+
+    @api.model
+    def _cron_deduplicate_images(self, batch_size=1000):
+        """Move the image attachments that do not share the file of their
+        content yet (stored in database, or written under another name) to the
+        content-addressed file, and set the checksum of older images."""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        Attachment = self.env['ir.attachment'].sudo()
+        if Attachment._storage() != 'file':
+            return
+
+        self.env.cr.execute("""
+            UPDATE real_estate_property_image image
+               SET checksum = attachment.checksum
+              FROM ir_attachment attachment
+             WHERE attachment.res_model = %s
+               AND attachment.res_field = 'image'
+               AND attachment.res_id = image.id
+               AND image.checksum IS NULL
+        """, [self._name])
+        self.invalidate_model(['checksum'])
+        if auto_commit:
+            self.env.cr.commit()
+
+        last_id = 0
+        while True:
+            self.env.cr.execute("""
+                SELECT id FROM ir_attachment
+                 WHERE res_model = %s AND res_field IS NOT NULL AND id > %s
+                   AND (store_fname IS NULL OR store_fname != substr(checksum, 1, 2) || '/' || checksum)
+              ORDER BY id
+                 LIMIT %s
+            """, [self._name, last_id, batch_size])
+            attachment_ids = [row[0] for row in self.env.cr.fetchall()]
+            if not attachment_ids:
+                break
+            for attachment in Attachment.browse(attachment_ids):
+                # Same as ir.attachment._migrate(): rewriting the content
+                # stores it under its checksum and releases the old file
+                attachment.write({'raw': attachment.raw, 'mimetype': attachment.mimetype})
+            last_id = attachment_ids[-1]
+            if auto_commit:
+                self.env.cr.commit()
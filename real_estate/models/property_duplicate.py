@@ -0,0 +1,149 @@
+from odoo import api, fields, models, _
+import re
+import threading
+import unicodedata
+
+from .postcode_centroid import normalize_postcode
+
+# Street words written in full or abbreviated by the agents
+ADDRESS_ABBREVIATIONS = {
+    'street': 'st',
+    'avenue': 'ave',
+    'av': 'ave',
+    'road': 'rd',
+    'boulevard': 'blvd',
+    'drive': 'dr',
+    'lane': 'ln',
+    'place': 'pl',
+    'square': 'sq',
+    'court': 'ct',
+    'apartment': 'apt',
+    'north': 'n',
+    'south': 's',
+    'east': 'e',
+    'west': 'w',
+}
+
+
+def normalize_address(address):
+    """Return the address in lower case, without accents or punctuation, and
+    with the usual street words abbreviated."""
+    address = unicodedata.normalize('NFKD', address or '').encode('ascii', 'ignore').decode().lower()
+    words = re.findall(r'[a-z0-9]+', address)
+    return ' '.join(ADDRESS_ABBREVIATIONS.get(word, word) for word in words)
+
+
+def get_address_key(postcode, address, city):
+    """Return the key the duplicate listings are matched on: the normalized
+    postcode, or the city without postcode, then the normalized address."""
+    prefix = normalize_postcode(postcode).lower() or normalize_address(city)
+    return ' '.join(part for part in [prefix, normalize_address(address)] if part) or False
+
+
+class PropertyDuplicate(models.Model):
+    """Cluster of listings likely to be the same property, found by
+    ``_cron_detect_duplicates`` and resolved with the merge wizard."""
+    _name = 'real.estate.property.duplicate'
+    _description = 'Duplicate Listings'
+    _order = 'id desc'
+
+    name = fields.Char(
+        string='Address',
+        required=True,
+    )
+    property_ids = fields.Many2many(
+        comodel_name='real.estate.property',
+        string='Listings',
+        context={'active_test': False},
+    )
+    property_count = fields.Integer(
+        string='Listing Count',
+        compute='_compute_property_count',
+    )
+    state = fields.Selection(
+        selection=[
+            ('open', 'To Review'),
+            ('merged', 'Merged'),
+            ('dismissed', 'Not Duplicates'),
+        ],
+        string='Status',
+        default='open',
+        required=True,
+    )
+
+    @api.depends('property_ids')
+    def _compute_property_count(self):
+        for cluster in self:
+            cluster.property_count = len(cluster.property_ids)
+
+    def action_merge(self):
+        self.ensure_one()
+        return {
+            'name': _("Merge Listings"),
+            'type': 'ir.actions.act_window',
+            'res_model': 'real.estate.property.merge',
+            'view_mode': 'form',
+            'target': 'new',
+            'context': {'default_duplicate_id': self.id},
+        }
+
+    def action_dismiss(self):
+        self.write({'state': 'dismissed'})
+        return True
+
+    @api.model
+    def _cron_detect_duplicates(self, batch_size=1000):
+        """Cluster the active listings with similar address keys, one
+        committed batch of listings at a time. Clusters sharing listings are
+        merged, and the listings of a dismissed cluster are not proposed
+        together again."""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        Property = self.env['real.estate.property']
+        last_id = 0
+        while True:
+            properties = Property.search([
+                ('address_key', '!=', False),
+                ('id', '>', last_id),
+            ], order='id', limit=batch_size)
+            if not properties:
+                break
+            self._add_pairs(properties._find_duplicates())
+            last_id = properties[-1].id
+            if auto_commit:
+                self.env.cr.commit()
+
+    @api.model
+    def _add_pairs(self, duplicates):
+        """Add the ``{property_id: candidate_ids}`` pairs to the clusters."""
+        # Connected components of the pairs
+        parents = {}
+
+        def find(node):
+            while parents.setdefault(node, node) != node:
+                parents[node] = parents[parents[node]]
+                node = parents[node]
+            return node
+
+        for property_id, candidate_ids in duplicates.items():
+            for candidate_id in candidate_ids:
+                parents[find(candidate_id)] = find(property_id)
+        components = {}
+        for node in parents:
+            components.setdefault(find(node), set()).add(node)
+
+        dismissed = self.search([('state', '=', 'dismissed'), ('property_ids', 'in', list(parents))])
+        dismissed_sets = [set(cluster.property_ids.ids) for cluster in dismissed]
+        for members in components.values():
+            if any(members <= dismissed_set for dismissed_set in dismissed_sets):
+                continue
+            clusters = self.search([('state', '=', 'open'), ('property_ids', 'in', list(members))])
+            if clusters:
+                members |= set(clusters.property_ids.ids)
+                clusters[1:].unlink()
+                clusters[:1].write({'property_ids': [(6, 0, sorted(members))]})
+            else:
+                first = self.env['real.estate.property'].browse(min(members))
+                self.create({
+                    'name': first.address or first.name,
+                    'property_ids': [(6, 0, sorted(members))],
+                })
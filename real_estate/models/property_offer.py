@@ -1,6 +1,15 @@
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
+from collections import defaultdict
 from datetime import timedelta
+import logging
+import threading
+import time
+
+from .instrumentation import instrumented
+from .sql_indexes import SqlIndex, create_indexes
+
+_logger = logging.getLogger(__name__)
 
 
 class PropertyOffer(models.Model):
@@ -8,6 +17,17 @@ class PropertyOffer(models.Model):
     _description = 'Real Estate Property Offer'
     _order = 'price desc'
     _rec_name = 'partner_id'
+    # The offers of a property are read in ``_order`` and aggregated by price,
+    # the offer list is filtered on status
+    _sql_indexes = [
+        SqlIndex('real_estate_property_offer_property_price_idx', ['property_id', 'price DESC']),
+        SqlIndex('real_estate_property_offer_status_idx', ['status', 'price DESC']),
+        SqlIndex('real_estate_property_offer_deadline_idx', ['status', 'date_deadline']),
+        SqlIndex(
+            'real_estate_property_offer_accepted_uniq', ['property_id'],
+            where="status = 'accepted'", unique=True,
+        ),
+    ]
 
     price = fields.Float(
         string='Price',
@@ -50,16 +70,26 @@ class PropertyOffer(models.Model):
         readonly=True,
     )
     
+    # Stored to filter and group the offer list without joining the listings,
+    # recomputed by the ORM in one write per value when listings change
     property_state = fields.Selection(
         related='property_id.state',
         string='Property Status',
+        store=True,
+        index=True,
     )
     property_type_id = fields.Many2one(
         related='property_id.property_type_id',
         string='Property Type',
+        store=True,
+        index=True,
     )
 
+    def init(self):
+        create_indexes(self._cr, self._table, self._sql_indexes)
+
     @api.depends('create_date', 'validity')
+    @instrumented
     def _compute_date_deadline(self):
         for offer in self:
             if offer.create_date:
@@ -74,45 +104,146 @@ class PropertyOffer(models.Model):
                 create_date = fields.Date.from_string(offer.create_date)
                 offer.validity = (offer.date_deadline - create_date).days
 
+    @instrumented
     def action_accept(self):
-        for offer in self:
-            # Check if there's already an accepted offer for this property
-            if any(o.status == 'accepted' and o.id != offer.id for o in offer.property_id.offer_ids):
-                raise UserError(_("Another offer has already been accepted for this property."))
-            
-            offer.status = 'accepted'
-            offer.property_id.write({
-                'state': 'offer_accepted',
-                'selling_price': offer.price,
-                'buyer_id': offer.partner_id.id,
-            })
-            # Set other offers as refused
-            (offer.property_id.offer_ids - offer).write({'status': 'refused'})
+        if not self:
+            return True
+        properties = self.property_id
+        if len(properties) != len(self):
+            raise UserError(_("You can only accept one offer per property."))
+
+        # Lock the properties, so that concurrent accepts on the same property
+        # are serialized instead of both passing the check below
+        self.env.cr.execute(
+            'SELECT id FROM real_estate_property WHERE id IN %s FOR UPDATE',
+            [tuple(properties.ids)],
+        )
+
+        # Check if there's already an accepted offer for these properties
+        if self.search_count([
+            ('property_id', 'in', properties.ids),
+            ('status', '=', 'accepted'),
+            ('id', 'not in', self.ids),
+        ]):
+            raise UserError(_("Another offer has already been accepted for this property."))
+
+        # Set other offers as refused
+        self.search([
+            ('property_id', 'in', properties.ids),
+            ('status', '!=', 'refused'),
+            ('id', 'not in', self.ids),
+        ]).write({'status': 'refused'})
+        self.write({'status': 'accepted'})
+        properties.write({'state': 'offer_accepted'})
+
+        # The selling price and buyer differ per property: set them in one
+        # statement, keeping their tracking and the selling price constraint
+        if not self.env.context.get('tracking_disable') and not self.env.context.get('mail_notrack'):
+            properties._track_prepare(['selling_price', 'buyer_id'])
+        self.flush_recordset(['property_id', 'price', 'partner_id'])
+        properties.flush_recordset(['selling_price', 'buyer_id'])
+        self.env.cr.execute("""
+            UPDATE real_estate_property p
+               SET selling_price = o.price, buyer_id = o.partner_id
+              FROM real_estate_property_offer o
+             WHERE o.id IN %s AND o.property_id = p.id
+        """, [tuple(self.ids)])
+        properties.invalidate_recordset(['selling_price', 'buyer_id'])
+        properties._check_selling_price()
         return True
 
+    @instrumented
     def action_refuse(self):
-        for offer in self:
-            offer.status = 'refused'
+        self.write({'status': 'refused'})
         return True
 
-    @api.model
-    def create(self, vals):
-        property_id = self.env['real.estate.property'].browse(vals.get('property_id'))
-        
-        # Check if property is in a valid state to receive offers
-        if property_id.state in ['sold', 'canceled']:
+    @api.model_create_multi
+    @instrumented
+    def create(self, vals_list):
+        properties = self.env['real.estate.property'].browse(
+            {vals['property_id'] for vals in vals_list if vals.get('property_id')}
+        )
+
+        # Check if properties are in a valid state to receive offers
+        if any(prop.state in ['sold', 'canceled'] for prop in properties):
             raise UserError(_("You cannot make an offer for a sold or canceled property."))
-        
-        # Check if the offer price is higher than existing offers
-        if property_id.offer_ids:
-            max_offer = max(property_id.offer_ids.mapped('price'))
-            if vals.get('price', 0) <= max_offer:
-                raise UserError(_("The offer must be higher than %.2f") % max_offer)
-        
-        offer = super(PropertyOffer, self).create(vals)
-        
+
+        # Fetch the current best offer of every affected property in one query
+        max_offers = {
+            group['property_id'][0]: group['price']
+            for group in self.read_group(
+                [('property_id', 'in', properties.ids)], ['price:max'], ['property_id'],
+            )
+        }
+
+        # Check the offer prices in ascending order per property, so that each
+        # offer is higher than the existing ones and the lower ones of the batch
+        prices_by_property = defaultdict(list)
+        for vals in vals_list:
+            if vals.get('property_id'):
+                prices_by_property[vals['property_id']].append(vals.get('price', 0))
+        for property_id, prices in prices_by_property.items():
+            max_offer = max_offers.get(property_id)
+            for price in sorted(prices):
+                if max_offer is not None and price <= max_offer:
+                    raise UserError(_("The offer must be higher than %.2f") % max_offer)
+                max_offer = price
+
+        offers = super(PropertyOffer, self).create(vals_list)
+
         # Update property state when receiving first offer
-        if property_id.state == 'new':
-            property_id.state = 'offer_received'
-        
-        return offer
+        properties.filtered(lambda prop: prop.state == 'new').write({'state': 'offer_received'})
+
+        return offers
+
+    @api.model
+    def _cron_expire_offers(self, batch_size=1000):
+        """Refuse the pending offers past their deadline, chunk by chunk.
+
+        Each chunk is committed: the refused offers are no longer pending, so
+        an interrupted run resumes where it stopped without a saved position.
+        Properties left without pending or accepted offers go back to 'new'.
+        """
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        start = time.monotonic()
+        last_id = 0
+        today = fields.Date.context_today(self)
+        summary = {'offers': 0, 'properties': 0, 'chunks': 0, 'last_id': last_id}
+
+        while True:
+            offers = self.search([
+                ('status', '=', 'pending'),
+                ('date_deadline', '<', today),
+                ('id', '>', last_id),
+            ], order='id', limit=batch_size)
+            if not offers:
+                break
+
+            properties = offers.property_id
+            offers.action_refuse()
+            live_property_ids = {
+                group['property_id'][0]
+                for group in self.read_group(
+                    [('property_id', 'in', properties.ids), ('status', 'in', ['pending', 'accepted'])],
+                    ['property_id'], ['property_id'],
+                )
+            }
+            stale_properties = properties.filtered(
+                lambda prop: prop.state == 'offer_received' and prop.id not in live_property_ids
+            )
+            stale_properties.write({'state': 'new'})
+
+            last_id = offers[-1].id
+            summary['offers'] += len(offers)
+            summary['properties'] += len(stale_properties)
+            summary['chunks'] += 1
+            summary['last_id'] = last_id
+            if auto_commit:
+                self.env.cr.commit()
+
+        summary['duration'] = round(time.monotonic() - start, 3)
+        _logger.info(
+            "Expired %(offers)s offers in %(chunks)s chunks, %(properties)s properties back to new "
+            "(last offer id %(last_id)s, %(duration)ss)", summary,
+        )
+        return summary
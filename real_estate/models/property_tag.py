@@ -3,6 +3,7 @@ from odoo import fields, models
 
 class PropertyTag(models.Model):
     _name = 'real.estate.property.tag'
+    _inherit = ['real.estate.lookup.mixin']
     _description = 'Real Estate Property Tag'
     _order = 'name'
 
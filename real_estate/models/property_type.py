@@ -1,8 +1,11 @@
 from odoo import api, fields, models
 
+from .instrumentation import instrumented
+
 
 class PropertyType(models.Model):
     _name = 'real.estate.property.type'
+    _inherit = ['real.estate.lookup.mixin']
     _description = 'Real Estate Property Type'
     _order = 'sequence, name'
 
@@ -22,6 +25,7 @@ class PropertyType(models.Model):
     property_count = fields.Integer(
         string='Property Count',
         compute='_compute_property_count',
+        store=True,
     )
     description = fields.Text(
         string='Description',
@@ -34,10 +38,19 @@ class PropertyType(models.Model):
         ('name_uniq', 'unique(name)', 'Property type name already exists!'),
     ]
 
-    @api.depends('property_ids')
+    @api.depends('property_ids', 'property_ids.active')
+    @instrumented
     def _compute_property_count(self):
+        # Stored value: count every active property, regardless of record rules
+        counts = {
+            group['property_type_id'][0]: group['property_type_id_count']
+            for group in self.env['real.estate.property'].sudo().read_group(
+                [('property_type_id', 'in', self.ids), ('active', '=', True)],
+                ['property_type_id'], ['property_type_id'],
+            )
+        } if self.ids else {}
         for record in self:
-            record.property_count = len(record.property_ids)
+            record.property_count = counts.get(record.id, 0)
 
     def action_view_properties(self):
         self.ensure_one()
@@ -0,0 +1,252 @@
+from odoo import api, fields, models, _
+from collections import defaultdict
+from markupsafe import Markup
+import threading
+
+from .sql_indexes import SqlIndex, create_indexes
+
+# Listings the buyers are told about
+MATCHING_STATES = ('new', 'offer_received')
+
+# Property fields of the criteria, a new match is looked for when they change
+MATCHING_FIELDS = [
+    'expected_price', 'bedrooms', 'living_area', 'property_type_id', 'tag_ids',
+    'city', 'garden', 'garage', 'furnished', 'active',
+]
+
+
+class SavedSearch(models.Model):
+    """Criteria of the listings a buyer wants to be told about."""
+    _name = 'real.estate.saved.search'
+    _description = 'Saved Search'
+    _order = 'id desc'
+    # A listing is matched against the searches of its city (or without
+    # city) and type (or without type), and whose price range contains its
+    # price; the other criteria filter these candidates
+    _sql_indexes = [
+        SqlIndex(
+            'real_estate_saved_search_city_type_idx', ['city_key', 'property_type_id'], where='active',
+        ),
+        SqlIndex(
+            'real_estate_saved_search_price_idx',
+            ["numrange(price_min::numeric, nullif(price_max, 0)::numeric, '[]')"],
+            method='gist', where='active',
+        ),
+    ]
+
+    name = fields.Char(
+        string='Name',
+        required=True,
+    )
+    partner_id = fields.Many2one(
+        comodel_name='res.partner',
+        string='Buyer',
+        required=True,
+        ondelete='cascade',
+        index=True,
+    )
+    active = fields.Boolean(
+        string='Active',
+        default=True,
+    )
+    price_min = fields.Float(
+        string='Minimum Price',
+    )
+    price_max = fields.Float(
+        string='Maximum Price',
+        help="Leave empty for no maximum.",
+    )
+    bedrooms_min = fields.Integer(
+        string='Minimum Bedrooms',
+    )
+    living_area_min = fields.Integer(
+        string='Minimum Living Area (sqm)',
+    )
+    property_type_id = fields.Many2one(
+        comodel_name='real.estate.property.type',
+        string='Property Type',
+    )
+    tag_ids = fields.Many2many(
+        comodel_name='real.estate.property.tag',
+        relation='real_estate_saved_search_tag_rel',
+        column1='search_id',
+        column2='tag_id',
+        string='Tags',
+        help="The listings must have all these tags.",
+    )
+    city = fields.Char(
+        string='City',
+    )
+    city_key = fields.Char(
+        string='City Key',
+        compute='_compute_city_key',
+        store=True,
+    )
+    garden = fields.Boolean(
+        string='Garden',
+    )
+    garage = fields.Boolean(
+        string='Garage',
+    )
+    furnished = fields.Boolean(
+        string='Furnished',
+    )
+    match_ids = fields.One2many(
+        comodel_name='real.estate.saved.search.match',
+        inverse_name='search_id',
+        string='Matches',
+    )
+
+    # Also keeps the price range of the index valid
+    _sql_constraints = [
+        ('price_range_check', 'CHECK(price_max = 0 OR price_min <= price_max)',
+         'The minimum price cannot be higher than the maximum price.'),
+    ]
+
+    def init(self):
+        create_indexes(self._cr, self._table, self._sql_indexes)
+
+    @api.depends('city')
+    def _compute_city_key(self):
+        # Empty for any city, so that the listings find the searches of their
+        # city and those without city with one equality test
+        for search in self:
+            search.city_key = (search.city or '').strip().lower()
+
+    @api.model
+    def _match_properties(self, properties):
+        """Queue the matches of the given listings with the active searches,
+        in one query. Listings already matched by a search are skipped."""
+        properties = properties.filtered(lambda prop: prop.active and prop.state in MATCHING_STATES)
+        if not properties:
+            return
+        self.flush_model()
+        properties.flush_recordset()
+        tags = properties._fields['tag_ids']
+        self.env.cr.execute(f"""
+            INSERT INTO real_estate_saved_search_match
+                   (search_id, property_id, partner_id, state, create_uid, create_date, write_uid, write_date)
+            SELECT search.id, property.id, search.partner_id, 'queued',
+                   %(uid)s, now() AT TIME ZONE 'UTC', %(uid)s, now() AT TIME ZONE 'UTC'
+              FROM real_estate_property property
+              JOIN real_estate_saved_search search
+                ON search.active
+               AND search.city_key IN ('', lower(trim(coalesce(property.city, ''))))
+               AND (search.property_type_id = property.property_type_id OR search.property_type_id IS NULL)
+               AND numrange(search.price_min::numeric, nullif(search.price_max, 0)::numeric, '[]')
+                   @> property.expected_price::numeric
+               AND search.bedrooms_min <= coalesce(property.bedrooms, 0)
+               AND search.living_area_min <= coalesce(property.living_area, 0)
+               AND (property.garden OR NOT search.garden)
+               AND (property.garage OR NOT search.garage)
+               AND (property.furnished OR NOT search.furnished)
+               AND NOT EXISTS (
+                    SELECT 1
+                      FROM real_estate_saved_search_tag_rel search_tag
+                     WHERE search_tag.search_id = search.id
+                       AND search_tag.tag_id NOT IN (
+                            SELECT property_tag.{tags.column2}
+                              FROM {tags.relation} property_tag
+                             WHERE property_tag.{tags.column1} = property.id
+                       )
+               )
+             WHERE property.id IN %(ids)s
+                ON CONFLICT (search_id, property_id) DO NOTHING
+        """, {'uid': self.env.uid, 'ids': tuple(properties.ids)})
+        self.env['real.estate.saved.search.match'].invalidate_model()
+
+
+class SavedSearchMatch(models.Model):
+    """Listing matching a saved search, queued until the buyer is told."""
+    _name = 'real.estate.saved.search.match'
+    _description = 'Saved Search Match'
+    _order = 'id desc'
+    _sql_indexes = [
+        SqlIndex(
+            'real_estate_saved_search_match_queued_idx', ['partner_id', 'id'], where="state = 'queued'",
+        ),
+    ]
+
+    search_id = fields.Many2one(
+        comodel_name='real.estate.saved.search',
+        string='Saved Search',
+        required=True,
+        ondelete='cascade',
+    )
+    property_id = fields.Many2one(
+        comodel_name='real.estate.property',
+        string='Property',
+        required=True,
+        ondelete='cascade',
+        index=True,
+    )
+    partner_id = fields.Many2one(
+        comodel_name='res.partner',
+        string='Buyer',
+        required=True,
+        ondelete='cascade',
+    )
+    state = fields.Selection(
+        selection=[
+            ('queued', 'Queued'),
+            ('notified', 'Notified'),
+            ('canceled', 'Canceled'),
+        ],
+        string='Status',
+        default='queued',
+        required=True,
+    )
+
+    _sql_constraints = [
+        ('search_property_uniq', 'unique(search_id, property_id)', 'A listing matches a saved search once.'),
+    ]
+
+    def init(self):
+        create_indexes(self._cr, self._table, self._sql_indexes)
+
+    @api.model
+    def _cron_notify_matches(self, batch_size=500):
+        """Send each buyer one email listing their queued matches, one
+        committed batch of buyers at a time. Matches whose listing is no
+        longer available, or whose buyer has no email address, are canceled."""
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        while True:
+            partner_groups = self.read_group(
+                [('state', '=', 'queued')], ['partner_id'], ['partner_id'], limit=batch_size,
+            )
+            if not partner_groups:
+                break
+            matches = self.search([
+                ('state', '=', 'queued'),
+                ('partner_id', 'in', [group['partner_id'][0] for group in partner_groups]),
+            ])
+            available = matches.filtered(
+                lambda match: match.property_id.active and match.property_id.state in MATCHING_STATES
+                and match.partner_id.email
+            )
+            (matches - available).write({'state': 'canceled'})
+            properties_by_partner = defaultdict(lambda: self.env['real.estate.property'])
+            for match in available:
+                properties_by_partner[match.partner_id] |= match.property_id
+            self.env['mail.mail'].sudo().create([
+                self._prepare_mail_values(partner, properties)
+                for partner, properties in properties_by_partner.items()
+            ])
+            available.write({'state': 'notified'})
+            if auto_commit:
+                self.env.cr.commit()
+
+    @api.model
+    def _prepare_mail_values(self, partner, properties):
+        rows = Markup('').join(
+            Markup('<li>%s, %s: %s</li>') % (prop.name, prop.city or '', prop.expected_price)
+            for prop in properties
+        )
+        return {
+            'subject': _("%s new listings match your searches", len(properties)),
+            'body_html': Markup('<p>%s</p><ul>%s</ul>') % (
+                _("Hello %s, these listings match your saved searches:", partner.name), rows,
+            ),
+            'recipient_ids': [(4, partner.id)],
+            'auto_delete': True,
+        }
@@ -0,0 +1,31 @@
+from collections import namedtuple
+
+from odoo.tools import sql
+
+# Index declared on a model through its ``_sql_indexes`` attribute, for the
+# indexes the ORM cannot express (composite, partial, unique or non-btree).
+SqlIndex = namedtuple(
+    'SqlIndex',
+    ['name', 'expressions', 'method', 'where', 'unique'],
+    defaults=['btree', '', False],
+)
+
+
+def index_definition(tablename, index, concurrently=False):
+    """Return the ``CREATE INDEX`` statement of the given index."""
+    return 'CREATE {unique}INDEX {concurrently}IF NOT EXISTS "{name}" ON "{table}" USING {method} ({expressions}){where}'.format(
+        unique='UNIQUE ' if index.unique else '',
+        concurrently='CONCURRENTLY ' if concurrently else '',
+        name=index.name,
+        table=tablename,
+        method=index.method,
+        expressions=', '.join(index.expressions),
+        where=' WHERE %s' % index.where if index.where else '',
+    )
+
+
+def create_indexes(cr, tablename, indexes):
+    """Create the given indexes unless they exist."""
+    for index in indexes:
+        if not sql.index_exists(cr, index.name):
+            cr.execute(index_definition(tablename, index))
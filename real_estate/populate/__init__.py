@@ -0,0 +1,5 @@
+from . import property_type
+from . import property_tag
+from . import property
+from . import property_offer
+from . import property_image
@@ -0,0 +1,68 @@
+from odoo import models
+from odoo.tools import populate
+
+# A few large cities hold most of the listings
+CITIES = [
+    'London', 'Paris', 'New York', 'Berlin', 'Madrid', 'Brussels', 'Lisbon', 'Harare',
+    'Cape Town', 'Lyon', 'Porto', 'Ghent', 'Bulawayo', 'Leeds', 'Namur', 'Seville',
+]
+CITY_WEIGHTS = [30, 25, 20, 12, 10, 8, 6, 5, 4, 3, 3, 2, 2, 2, 1, 1]
+
+STREETS = ['Main St', 'High Street', 'Station Road', 'Church Lane', 'Park Avenue', 'Mill Road']
+
+
+class Property(models.Model):
+    _inherit = 'real.estate.property'
+    _populate_sizes = {'small': 10_000, 'medium': 100_000, 'large': 1_000_000}
+    _populate_dependencies = ['real.estate.property.type', 'real.estate.property.tag', 'res.users']
+
+    def _populate(self, size):
+        # Generated listings do not need tracking values and chatter messages
+        return super(Property, self.with_context(real_estate_bulk_import=True))._populate(size)
+
+    def _populate_factories(self):
+        type_ids = self.env.registry.populated_models['real.estate.property.type']
+        tag_ids = self.env.registry.populated_models['real.estate.property.tag']
+        user_ids = self.env.registry.populated_models['res.users']
+        country_ids = self.env['res.country'].search([], limit=10).ids
+
+        def get_address(random=None, **kwargs):
+            return '%s %s' % (random.randint(1, 300), random.choice(STREETS))
+
+        def get_postcode(random=None, **kwargs):
+            return '%05d' % random.randint(1000, 99999)
+
+        def get_expected_price(values=None, random=None, **kwargs):
+            return round(values['living_area'] * random.uniform(1500, 9000), -3)
+
+        def get_garden_area(values=None, random=None, **kwargs):
+            return random.randint(10, 500) if values['garden'] else 0
+
+        def get_garden_orientation(values=None, random=None, **kwargs):
+            return values['garden'] and random.choice(['north', 'south', 'east', 'west'])
+
+        def get_tags(random=None, **kwargs):
+            count = random.choices([0, 1, 2, 3, 4], [20, 30, 25, 15, 10])[0]
+            return [(6, 0, random.sample(tag_ids, min(count, len(tag_ids))))]
+
+        return [
+            ('name', populate.constant('Listing {counter}')),
+            ('description', populate.constant('Generated listing {counter}, close to shops and schools.')),
+            ('property_type_id', populate.randomize(type_ids)),
+            ('city', populate.randomize(CITIES, CITY_WEIGHTS)),
+            ('address', populate.compute(get_address)),
+            ('postcode', populate.compute(get_postcode)),
+            ('country_id', populate.randomize(country_ids)),
+            ('user_id', populate.randomize(user_ids + [False])),
+            ('bedrooms', populate.randomize([1, 2, 3, 4, 5, 6], [10, 25, 30, 20, 10, 5])),
+            ('living_area', populate.randint(30, 400)),
+            ('expected_price', populate.compute(get_expected_price)),
+            ('facades', populate.randint(1, 4)),
+            ('garage', populate.randomize([True, False], [4, 6])),
+            ('garden', populate.randomize([True, False], [3, 7])),
+            ('garden_area', populate.compute(get_garden_area)),
+            ('garden_orientation', populate.compute(get_garden_orientation)),
+            ('furnished', populate.randomize([True, False], [2, 8])),
+            ('amenities', populate.randomize(['', 'Pool', 'Air conditioning, Alarm', 'Elevator, Concierge'])),
+            ('tag_ids', populate.compute(get_tags)),
+        ]
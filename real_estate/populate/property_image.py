@@ -0,0 +1,32 @@
+import base64
+import io
+
+from PIL import Image
+
+from odoo import models
+from odoo.tools import populate
+
+COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f']
+
+
+class PropertyImage(models.Model):
+    _inherit = 'real.estate.property.image'
+    _populate_sizes = {'small': 5_000, 'medium': 50_000, 'large': 500_000}
+    _populate_dependencies = ['real.estate.property']
+
+    def _populate_factories(self):
+        property_ids = self.env.registry.populated_models['real.estate.property']
+
+        # A few distinct pictures, shared like the floor plans of a development
+        images = []
+        for color in COLORS:
+            output = io.BytesIO()
+            Image.new('RGB', (800, 600), color).save(output, format='PNG')
+            images.append(base64.b64encode(output.getvalue()))
+
+        return [
+            ('property_id', populate.randomize(property_ids)),
+            ('name', populate.constant('Picture {counter}')),
+            ('sequence', populate.randint(1, 20)),
+            ('image', populate.randomize(images)),
+        ]
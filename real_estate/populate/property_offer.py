@@ -0,0 +1,50 @@
+from odoo import models
+from odoo.tools import populate
+
+
+class PropertyOffer(models.Model):
+    _inherit = 'real.estate.property.offer'
+    _populate_sizes = {'small': 30_000, 'medium': 300_000, 'large': 3_000_000}
+    _populate_dependencies = ['real.estate.property', 'res.partner']
+
+    def _populate(self, size):
+        offers = super()._populate(size)
+
+        # Accept the best offer of one property out of five with offers, and
+        # sell half of them
+        best_offers = {}
+        for offer in offers:
+            best = best_offers.get(offer.property_id.id)
+            if not best or offer.price > best.price:
+                best_offers[offer.property_id.id] = offer
+        random = populate.Random('real.estate.property.offer+accept')
+        accepted = self.browse([
+            offer.id for property_id, offer in sorted(best_offers.items()) if random.random() < 0.2
+        ])
+        accepted.action_accept()
+        accepted.property_id.filtered(lambda prop: random.random() < 0.5).action_sold()
+        return offers
+
+    def _populate_factories(self):
+        property_ids = self.env.registry.populated_models['real.estate.property']
+        partner_ids = self.env.registry.populated_models['res.partner']
+
+        expected_prices = {
+            prop['id']: prop['expected_price']
+            for prop in self.env['real.estate.property'].browse(property_ids).read(['expected_price'])
+        }
+
+        def get_price(values=None, counter=None, random=None, **kwargs):
+            # From 90% of the expected price upwards, so that the best offers
+            # can be accepted, and strictly increasing, so that every offer
+            # beats the previous offers of its property
+            counter = int(counter)
+            ratio = 0.9 + 0.2 * counter / (counter + 10_000)
+            return round(expected_prices[values['property_id']] * ratio) + counter * 10 + random.randint(0, 9)
+
+        return [
+            ('property_id', populate.randomize(property_ids)),
+            ('partner_id', populate.randomize(partner_ids)),
+            ('price', populate.compute(get_price)),
+            ('validity', populate.randomize([7, 14, 30], [6, 3, 1])),
+        ]
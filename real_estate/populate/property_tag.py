@@ -0,0 +1,13 @@
+from odoo import models
+from odoo.tools import populate
+
+
+class PropertyTag(models.Model):
+    _inherit = 'real.estate.property.tag'
+    _populate_sizes = {'small': 20, 'medium': 50, 'large': 100}
+
+    def _populate_factories(self):
+        return [
+            ('name', populate.constant('Tag {counter}')),
+            ('color', populate.randint(0, 11)),
+        ]
@@ -0,0 +1,14 @@
+from odoo import models
+from odoo.tools import populate
+
+
+class PropertyType(models.Model):
+    _inherit = 'real.estate.property.type'
+    _populate_sizes = {'small': 10, 'medium': 20, 'large': 40}
+
+    def _populate_factories(self):
+        return [
+            ('name', populate.constant('Type {counter}')),
+            ('sequence', populate.randint(1, 100)),
+            ('color', populate.randint(0, 11)),
+        ]
@@ -0,0 +1,170 @@
+from odoo import api, fields, models
+
+# Ratio columns, as their numerator and denominator columns: a rolled up
+# ratio is the ratio of the sums, not the average of the row ratios
+RATIO_FIELDS = {
+    'price_per_sqm': ('price_per_sqm_sum', 'area_count'),
+    'days_to_sell': ('days_to_sell_sum', 'days_to_sell_count'),
+    'best_offer_ratio': ('best_offer_ratio_sum', 'best_offer_count'),
+    'conversion_rate': ('sold_count', 'property_count'),
+}
+
+
+class MarketReport(models.Model):
+    """Market analytics per city, property type, salesperson and month.
+
+    Backed by a materialized view refreshed on a schedule, so that the
+    dashboards read precomputed rows instead of aggregating the listing and
+    offer tables on every request.
+    """
+    _name = 'real.estate.market.report'
+    _description = 'Real Estate Market Analysis'
+    _auto = False
+    _order = 'month desc'
+
+    month = fields.Date(
+        string='Month',
+        readonly=True,
+    )
+    city = fields.Char(
+        string='City',
+        readonly=True,
+    )
+    property_type_id = fields.Many2one(
+        comodel_name='real.estate.property.type',
+        string='Property Type',
+        readonly=True,
+    )
+    user_id = fields.Many2one(
+        comodel_name='res.users',
+        string='Salesperson',
+        readonly=True,
+    )
+    property_count = fields.Integer(
+        string='Properties',
+        readonly=True,
+    )
+    sold_count = fields.Integer(
+        string='Sold',
+        readonly=True,
+    )
+    offer_count = fields.Integer(
+        string='Offers',
+        readonly=True,
+    )
+    expected_price = fields.Float(
+        string='Expected Price',
+        readonly=True,
+    )
+    price_per_sqm = fields.Float(
+        string='Price per sqm',
+        readonly=True,
+    )
+    days_to_sell = fields.Float(
+        string='Days to Sell',
+        readonly=True,
+    )
+    best_offer_ratio = fields.Float(
+        string='Best Offer / Expected Price',
+        readonly=True,
+    )
+    conversion_rate = fields.Float(
+        string='Conversion Rate',
+        readonly=True,
+    )
+    # Terms of the ratios, summed when rows are rolled up
+    price_per_sqm_sum = fields.Float(
+        string='Sum of Prices per sqm',
+        readonly=True,
+    )
+    area_count = fields.Integer(
+        string='Properties with Area',
+        readonly=True,
+    )
+    days_to_sell_sum = fields.Float(
+        string='Sum of Days to Sell',
+        readonly=True,
+    )
+    days_to_sell_count = fields.Integer(
+        string='Sold with Date',
+        readonly=True,
+    )
+    best_offer_ratio_sum = fields.Float(
+        string='Sum of Best Offer Ratios',
+        readonly=True,
+    )
+    best_offer_count = fields.Integer(
+        string='Properties with Offers',
+        readonly=True,
+    )
+
+    def init(self):
+        self.env.cr.execute('DROP MATERIALIZED VIEW IF EXISTS %s' % self._table)
+        self.env.cr.execute("""
+            CREATE MATERIALIZED VIEW {table} AS (
+                SELECT {id} AS id,
+                       date_trunc('month', p.create_date)::date AS month,
+                       p.city,
+                       p.property_type_id,
+                       p.user_id,
+                       count(*) AS property_count,
+                       count(*) FILTER (WHERE p.state = 'sold') AS sold_count,
+                       sum(coalesce(o.offer_count, 0)) AS offer_count,
+                       sum(p.expected_price) AS expected_price,
+                       {price_per_sqm} AS price_per_sqm_sum,
+                       {area} AS area_count,
+                       {price_per_sqm} / nullif({area}, 0) AS price_per_sqm,
+                       {days_to_sell} AS days_to_sell_sum,
+                       {sold_dated} AS days_to_sell_count,
+                       {days_to_sell} / nullif({sold_dated}, 0) AS days_to_sell,
+                       {best_offer_ratio} AS best_offer_ratio_sum,
+                       {offered} AS best_offer_count,
+                       {best_offer_ratio} / nullif({offered}, 0) AS best_offer_ratio,
+                       count(*) FILTER (WHERE p.state = 'sold')::float / count(*) AS conversion_rate
+                  FROM real_estate_property p
+             LEFT JOIN (SELECT property_id, count(*) AS offer_count
+                          FROM real_estate_property_offer
+                      GROUP BY property_id) o ON o.property_id = p.id
+              GROUP BY date_trunc('month', p.create_date), p.city, p.property_type_id, p.user_id
+            )
+        """.format(
+            table=self._table,
+            # Stable across refreshes, unlike a row number: a hash of the
+            # grouping keys, kept within the integers exact in JavaScript
+            id="""(hashtextextended(format('%L|%L|%L|%L', date_trunc('month', p.create_date),
+                                       p.city, p.property_type_id, p.user_id), 0)
+                   & ((1::bigint << 52) - 1))""",
+            price_per_sqm='sum(p.expected_price / p.living_area) FILTER (WHERE p.living_area > 0)',
+            area='count(*) FILTER (WHERE p.living_area > 0)',
+            days_to_sell="(sum(p.date_sold - p.create_date::date) FILTER (WHERE p.state = 'sold'))::float",
+            sold_dated="count(p.date_sold) FILTER (WHERE p.state = 'sold')",
+            best_offer_ratio='sum(p.best_offer / p.expected_price) FILTER (WHERE p.best_offer > 0 AND p.expected_price > 0)',
+            offered='count(*) FILTER (WHERE p.best_offer > 0 AND p.expected_price > 0)',
+        ))
+        # Required to refresh the view concurrently
+        self.env.cr.execute('CREATE UNIQUE INDEX %s_id_idx ON %s (id)' % (self._table, self._table))
+
+    @api.model
+    def read_group(self, domain, fields, groupby, offset=0, limit=None, orderby=False, lazy=True):
+        fnames = [spec.split(':')[0] for spec in fields]
+        ratios = [fname for fname in RATIO_FIELDS if fname in fnames]
+        fields = [spec for spec, fname in zip(fields, fnames) if fname not in ratios]
+        for fname in ratios:
+            fields += ['%s:sum' % term for term in RATIO_FIELDS[fname] if term not in fnames]
+            fnames += RATIO_FIELDS[fname]
+        groups = super(MarketReport, self).read_group(
+            domain, fields, groupby, offset=offset, limit=limit, orderby=orderby, lazy=lazy,
+        )
+        for group in groups:
+            for fname in ratios:
+                numerator, denominator = RATIO_FIELDS[fname]
+                group[fname] = (group[numerator] or 0.0) / group[denominator] if group[denominator] else 0.0
+        return groups
+
+    @api.model
+    def _cron_refresh(self):
+        """Recompute the report rows without blocking the readers."""
+        self.env['real.estate.property'].flush_model()
+        self.env['real.estate.property.offer'].flush_model()
+        self.env.cr.execute('REFRESH MATERIALIZED VIEW CONCURRENTLY %s' % self._table)
+        self.invalidate_model()
@@ -0,0 +1,9 @@
+from . import test_benchmarks
+from . import test_query_counts
+from . import test_mailing
+from . import test_lookup_cache
+from . import test_query_plans
+from . import test_api
+from . import test_property_image
+from . import test_populate
+from . import test_saved_search
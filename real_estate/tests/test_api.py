@@ -0,0 +1,83 @@
+from odoo.tests.common import HttpCase, new_test_user, tagged
+
+CITY = 'Apiville'
+
+
+@tagged('post_install', '-at_install')
+class TestApi(HttpCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        groups = 'base.group_user,real_estate.group_real_estate_user'
+        cls.salesperson = new_test_user(cls.env, login='api_salesperson', groups=groups)
+        cls.other_salesperson = new_test_user(cls.env, login='api_other_salesperson', groups=groups)
+        # Equal prices, so that the price pages are ordered by id within them
+        cls.properties = cls.env['real.estate.property'].create([{
+            'name': 'API Listing %s' % index,
+            'expected_price': 100_000 + index // 2 * 1000,
+            'city': CITY,
+            'user_id': (cls.salesperson.id, cls.other_salesperson.id, False)[index % 3],
+        } for index in range(7)])
+        cls.partner = cls.env['res.partner'].create({'name': 'API Buyer'})
+        cls.offers = cls.env['real.estate.property.offer'].create([
+            {'property_id': prop.id, 'partner_id': cls.partner.id, 'price': 95_000} for prop in cls.properties
+        ])
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate('admin', 'admin')
+
+    def _pages(self, url):
+        """Return the pages of ``url``, following their cursors."""
+        pages = []
+        cursor = None
+        while True:
+            response = self.url_open(url + ('&after=%s' % cursor if cursor else ''))
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.json()['records'])
+            cursor = response.json()['next']
+            if not cursor:
+                return pages
+
+    def test_limit(self):
+        response = self.url_open('/real_estate/api/properties?limit=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['records']), 2)
+        self.assertTrue(response.json()['next'])
+
+    def test_non_positive_limit(self):
+        for limit in ('0', '-1'):
+            response = self.url_open('/real_estate/api/properties?limit=%s' % limit)
+            self.assertEqual(response.status_code, 400, "limit=%s must be rejected" % limit)
+
+    def test_pagination_by_id(self):
+        pages = self._pages('/real_estate/api/properties?city=%s&limit=3' % CITY)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        ids = [record['id'] for page in pages for record in page]
+        self.assertEqual(ids, sorted(self.properties.ids, reverse=True))
+
+    def test_pagination_by_price(self):
+        pages = self._pages('/real_estate/api/properties?city=%s&limit=2&order=price' % CITY)
+        records = [record for page in pages for record in page]
+        # Every listing once, the pages cut through the equal prices
+        self.assertEqual(
+            [(record['expected_price'], record['id']) for record in records],
+            sorted(((prop.expected_price, prop.id) for prop in self.properties), reverse=True),
+        )
+
+    def test_record_rules(self):
+        self.authenticate('api_salesperson', 'api_salesperson')
+        visible = self.properties.filtered(lambda prop: not prop.user_id or prop.user_id == self.salesperson)
+
+        pages = self._pages('/real_estate/api/properties?city=%s&limit=2' % CITY)
+        self.assertEqual({record['id'] for page in pages for record in page}, set(visible.ids))
+
+        pages = self._pages('/real_estate/api/offers?limit=2&status=pending')
+        offer_ids = {record['id'] for page in pages for record in page}
+        self.assertEqual(offer_ids & set(self.offers.ids), set(self.offers.filtered(
+            lambda offer: offer.property_id in visible
+        ).ids))
+        self.assertTrue(offer_ids.isdisjoint(self.offers.filtered(
+            lambda offer: offer.property_id not in visible
+        ).ids))
@@ -0,0 +1,195 @@
+"""Benchmarks of the core real estate flows, on a populated database.
+
+They are not part of the standard test run. Populate a database with
+realistic volumes, then run them and compare the result files::
+
+    odoo-bin populate -d bench --models 'real.estate.property.offer,real.estate.property.image' --size medium
+    REAL_ESTATE_BENCH_OUTPUT=bench.json odoo-bin -d bench --test-tags /real_estate:real_estate_bench --stop-after-init
+
+Each benchmark records its wall time and query count in the JSON output file
+(``real_estate_bench.json`` by default).
+"""
+from contextlib import contextmanager
+import json
+import os
+import time
+import unittest
+
+from odoo import fields
+from odoo.tests.common import TransactionCase, tagged
+
+MIN_PROPERTIES = 1000
+OUTPUT_FILE = os.environ.get('REAL_ESTATE_BENCH_OUTPUT', 'real_estate_bench.json')
+
+# Fields read by the property list and kanban views
+LIST_FIELDS = [
+    'name', 'property_type_id', 'postcode', 'city', 'tag_ids', 'bedrooms', 'living_area',
+    'expected_price', 'selling_price', 'date_availability', 'state',
+]
+KANBAN_FIELDS = [
+    'name', 'property_type_id', 'tag_ids', 'expected_price', 'selling_price', 'state',
+    'bedrooms', 'living_area', 'city', 'user_id', 'main_image_id',
+]
+AVAILABLE_DOMAIN = [('state', 'in', ['new', 'offer_received'])]
+# Indexes serving the list query of a salesperson: by state, or by owner
+# under the record rule
+LIST_INDEXES = [
+    'real_estate_property_state_idx',
+    'real_estate_property_user_idx',
+    'real_estate_property_no_user_idx',
+]
+
+
+@tagged('-standard', '-at_install', 'post_install', 'real_estate_bench')
+class TestBenchmarks(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Property = cls.env['real.estate.property']
+        cls.Offer = cls.env['real.estate.property.offer']
+        cls.property_count = cls.Property.search_count([])
+        if cls.property_count < MIN_PROPERTIES:
+            raise unittest.SkipTest(
+                "The benchmarks need a populated database (odoo-bin populate --models 'real.estate.*')"
+            )
+        cls.results = []
+
+        # A salesperson owning listings, restricted by the record rule
+        cls.salesperson = cls.Property.search([('user_id', '!=', False)], limit=1).user_id
+        cls.salesperson.groups_id = [(4, cls.env.ref('real_estate.group_real_estate_user').id)]
+
+    @classmethod
+    def tearDownClass(cls):
+        if hasattr(cls, 'results'):
+            with open(OUTPUT_FILE, 'w') as output:
+                json.dump({
+                    'date': fields.Datetime.to_string(fields.Datetime.now()),
+                    'database': cls.env.cr.dbname,
+                    'properties': cls.property_count,
+                    'offers': cls.Offer.search_count([]),
+                    'results': cls.results,
+                }, output, indent=2)
+        super().tearDownClass()
+
+    @contextmanager
+    def measure(self, name, records=1):
+        """Record the wall time and query count of the block, flush included,
+        starting from an empty cache."""
+        self.env.flush_all()
+        self.env.invalidate_all()
+        queries = self.env.cr.sql_log_count
+        start = time.perf_counter()
+        yield
+        self.env.flush_all()
+        duration = time.perf_counter() - start
+        self.results.append({
+            'name': name,
+            'records': records,
+            'duration': round(duration, 6),
+            'queries': self.env.cr.sql_log_count - queries,
+            'records_per_second': round(records / duration, 1) if duration else None,
+        })
+
+    def _pending_offers(self, count):
+        """Return the best pending offer of ``count`` properties."""
+        offers = self.Offer.search([('status', '=', 'pending'), ('property_state', '=', 'offer_received')], limit=count * 5)
+        best = {}
+        for offer in offers:
+            best.setdefault(offer.property_id.id, offer)
+        return self.Offer.browse([offer.id for offer in best.values()][:count])
+
+    def test_property_list_and_kanban(self):
+        for user in (self.env.user, self.salesperson):
+            Property = self.Property.with_user(user)
+            with self.measure('property_list_%s' % user.login, 80):
+                Property.search_read(AVAILABLE_DOMAIN, LIST_FIELDS, limit=80)
+            with self.measure('property_kanban_%s' % user.login, 40):
+                groups = Property.read_group(AVAILABLE_DOMAIN, ['state'], ['state'])
+                for group in groups:
+                    cards = Property.search_read(group['__domain'], KANBAN_FIELDS, limit=40)
+                    tag_ids = {tag_id for card in cards for tag_id in card['tag_ids']}
+                    self.env['real.estate.property.tag'].with_user(user).browse(tag_ids).read(['display_name', 'color'])
+            with self.measure('property_count_%s' % user.login):
+                Property.search_count(AVAILABLE_DOMAIN)
+
+    def test_list_query_plan(self):
+        """The list query of a salesperson is served by the indexes."""
+        query = self.Property.with_user(self.salesperson)._search(AVAILABLE_DOMAIN, limit=80)
+        sql, params = query.select()
+        self.env.cr.execute('EXPLAIN ' + sql, params)
+        plan = '\n'.join(row[0] for row in self.env.cr.fetchall())
+        self.results.append({'name': 'property_list_plan', 'plan': plan})
+        self.assertTrue(
+            any(index in plan for index in LIST_INDEXES),
+            "The list query uses none of %s:\n%s" % (', '.join(LIST_INDEXES), plan),
+        )
+        self.assertNotIn('Seq Scan on real_estate_property ', plan)
+
+    def test_offer_create(self):
+        properties = self.Property.search(AVAILABLE_DOMAIN, limit=100)
+        partner = self.env['res.partner'].search([], limit=1)
+        vals_list = [{
+            'property_id': prop.id,
+            'partner_id': partner.id,
+            'price': prop.best_offer + 1000,
+        } for prop in properties]
+        with self.measure('offer_create', len(vals_list)):
+            self.Offer.create(vals_list)
+
+    def test_offer_accept_and_sold(self):
+        offers = self._pending_offers(50)
+        with self.measure('offer_action_accept', len(offers)):
+            offers.action_accept()
+        with self.measure('property_action_sold', len(offers)):
+            offers.property_id.action_sold()
+
+    def test_offer_grouping(self):
+        """The offer list and pivot group on the stored property status and
+        type, without joining the listings."""
+        with self.measure('offer_group_by_property_state'):
+            self.Offer.read_group([('status', '=', 'pending')], ['price:avg'], ['property_state'])
+        with self.measure('offer_group_by_property_type'):
+            self.Offer.read_group(
+                [('property_state', 'in', ['new', 'offer_received'])], ['price:avg'], ['property_type_id'],
+            )
+        with self.measure('offer_pivot', 80):
+            self.Offer.read_group([], ['price:avg'], ['property_type_id', 'property_state'], lazy=False)
+        with self.measure('offer_list_open_listings', 80):
+            self.Offer.search_read([('property_state', '=', 'offer_received')], ['property_id', 'price'], limit=80)
+
+    def test_compute_best_offer(self):
+        properties = self.Property.search([], limit=1000)
+        with self.measure('property_compute_best_offer', len(properties)):
+            properties._compute_best_offer()
+
+    def test_compute_property_count(self):
+        types = self.env['real.estate.property.type'].search([])
+        with self.measure('type_compute_property_count', len(types)):
+            types._compute_property_count()
+
+    def test_record_rule(self):
+        for user in (self.env.user, self.salesperson):
+            with self.measure('record_rule_search_%s' % user.login):
+                self.Property.with_user(user).search([], limit=80)
+
+    def test_bulk_import_mode(self):
+        vals_list = [{
+            'name': 'Benchmark listing %s' % index,
+            'expected_price': 100_000 + index,
+            'city': 'London',
+            'description': 'Benchmark listing',
+        } for index in range(500)]
+        with self.measure('property_create', len(vals_list)):
+            self.Property.create(vals_list)
+        with self.measure('property_create_bulk_mode', len(vals_list)):
+            self.Property.with_context(real_estate_bulk_import=True).create(vals_list)
+
+    def test_fulltext_search(self):
+        with self.measure('property_search_ilike', 80):
+            self.Property.search([
+                '|', '|', ('description', 'ilike', 'schools'), ('amenities', 'ilike', 'schools'),
+                ('city', 'ilike', 'schools'),
+            ], limit=80)
+        with self.measure('property_search_fulltext', 80):
+            self.Property.search_fulltext('schools', limit=80)
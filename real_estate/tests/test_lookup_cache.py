@@ -0,0 +1,71 @@
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestLookupCache(TransactionCase):
+    """Cached names and colors of the property types and tags."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.PropertyType = cls.env['real.estate.property.type']
+        cls.Tag = cls.env['real.estate.property.tag']
+        cls.types = cls.PropertyType.create([
+            {'name': 'Lookup Loft', 'sequence': 2},
+            {'name': 'Lookup Barn', 'sequence': 1},
+        ])
+        cls.tag = cls.Tag.create({'name': 'Lookup Garden', 'color': 3})
+
+    def test_read_from_cache(self):
+        # Fill the caches
+        self.Tag.browse(self.tag.ids).read(['display_name', 'color'])
+        self.types.name_get()
+        with self.assertQueryCount(0):
+            result = self.Tag.browse(self.tag.ids).read(['display_name', 'color'])
+            names = self.types.name_get()
+        self.assertEqual(result, [{'id': self.tag.id, 'display_name': 'Lookup Garden', 'color': 3}])
+        self.assertEqual(names, [(self.types[0].id, 'Lookup Loft'), (self.types[1].id, 'Lookup Barn')])
+
+    def test_invalidation(self):
+        self.tag.name_get()
+        self.tag.write({'name': 'Lookup Orchard', 'color': 5})
+        self.assertEqual(self.tag.name_get(), [(self.tag.id, 'Lookup Orchard')])
+        self.assertEqual(self.tag.read(['color']), [{'id': self.tag.id, 'color': 5}])
+
+        new_tag = self.Tag.create({'name': 'Lookup Pool'})
+        self.assertEqual(self.Tag.name_search('lookup pool'), [(new_tag.id, 'Lookup Pool')])
+        new_tag.unlink()
+        self.assertFalse(self.Tag.name_search('lookup pool'))
+
+    def test_name_search_order(self):
+        # Types are ordered by sequence, then name, as in the database
+        self.assertEqual(
+            [record_id for record_id, __ in self.PropertyType.name_search('lookup')],
+            self.PropertyType.search([('name', 'ilike', 'lookup')]).ids,
+        )
+        self.assertEqual(
+            self.PropertyType.name_search('Lookup Loft', operator='='),
+            [(self.types[0].id, 'Lookup Loft')],
+        )
+
+    def test_invalidation_scope(self):
+        self.tag.name_get()
+        self.registry.cache_invalidated = False
+        # A new tag does not clear the caches of the other workers
+        new_tag = self.Tag.create({'name': 'Lookup Terrace'})
+        self.assertFalse(self.registry.cache_invalidated)
+        self.assertEqual(new_tag.name_get(), [(new_tag.id, 'Lookup Terrace')])
+        # Neither does a write that leaves the cached values unchanged
+        self.tag.write({'color': self.tag.color})
+        self.assertFalse(self.registry.cache_invalidated)
+        self.tag.write({'color': 7})
+        self.assertTrue(self.registry.cache_invalidated)
+
+    def test_name_search_created_elsewhere(self):
+        # Created by another worker: not in the cached lookup of this one
+        self.Tag.name_search('lookup')
+        self.env.cr.execute(
+            "INSERT INTO real_estate_property_tag (name, color) VALUES ('Lookup Balcony', 1) RETURNING id"
+        )
+        tag_id = self.env.cr.fetchone()[0]
+        self.assertIn((tag_id, 'Lookup Balcony'), self.Tag.name_search('lookup balcony'))
@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from odoo.exceptions import UserError
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestMailing(TransactionCase):
+    """Queued mailings of a listing. Odoo does not connect to SMTP servers in
+    tests: run ``_cron_send`` on a database pointed at a local SMTP stub to
+    check the actual delivery."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.property = cls.env['real.estate.property'].create({
+            'name': 'Mailing Listing',
+            'expected_price': 100_000,
+        })
+        cls.partners = cls.env['res.partner'].create([
+            {'name': 'Bidder %s' % index, 'email': 'bidder%s@example.com' % index} for index in range(3)
+        ])
+        cls.env['real.estate.property.offer'].create([
+            {'property_id': cls.property.id, 'partner_id': partner.id, 'price': 90_000 + index * 1000}
+            for index, partner in enumerate(cls.partners)
+        ])
+        cls.env['ir.config_parameter'].set_param('real_estate.mailing_rate', 2)
+
+    def test_send_email_queues_mailing(self):
+        Mail = self.env['mail.mail']
+        mail_count = Mail.search_count([])
+        action = self.property.action_send_email()
+        self.assertEqual(action['tag'], 'display_notification')
+
+        mailing = self.env['real.estate.mailing'].search([('property_id', '=', self.property.id)])
+        self.assertEqual(mailing.state, 'queued')
+        self.assertEqual(mailing.recipient_ids.partner_id, self.partners)
+        self.assertEqual(set(mailing.recipient_ids.mapped('state')), {'queued'})
+        # Nothing is rendered nor sent in the request
+        self.assertEqual(Mail.search_count([]), mail_count)
+
+    def test_cron_send_rate_limit(self):
+        self.property.action_send_email()
+        mailing = self.env['real.estate.mailing'].search([('property_id', '=', self.property.id)])
+
+        Mailing = self.env['real.estate.mailing']
+        Mailing._cron_send()
+        self.assertEqual(mailing.sent_count, 2)
+        self.assertEqual(mailing.state, 'sending')
+
+        # The quota of the minute is spent, also for the runs triggered by
+        # other mailings
+        Mailing._cron_send()
+        self.assertEqual(mailing.sent_count, 2)
+
+        self._age_deliveries(mailing)
+        Mailing._cron_send()
+        self.assertEqual(mailing.sent_count, 3)
+        self.assertEqual(mailing.failed_count, 0)
+        self.assertEqual(mailing.state, 'done')
+        self.assertTrue(all(mailing.recipient_ids.mapped('date_sent')))
+
+    def test_cron_send_rate_shared_by_mailings(self):
+        listing = self.env['real.estate.property'].create({
+            'name': 'Second Mailing Listing',
+            'expected_price': 100_000,
+        })
+        self.env['real.estate.property.offer'].create([
+            {'property_id': listing.id, 'partner_id': partner.id, 'price': 90_000 + index * 1000}
+            for index, partner in enumerate(self.partners)
+        ])
+        Mailing = self.env['real.estate.mailing']
+        self.property.action_send_email()
+        Mailing._cron_send()
+        listing.action_send_email()
+        Mailing._cron_send()
+
+        recipients = Mailing.search([('property_id', 'in', [self.property.id, listing.id])]).recipient_ids
+        self.assertEqual(len(recipients.filtered(lambda recipient: recipient.state == 'sent')), 2)
+
+    def _age_deliveries(self, mailings):
+        """Move the deliveries of the mailings out of the rate window."""
+        recipients = mailings.recipient_ids.filtered('date_sent')
+        for recipient in recipients:
+            recipient.date_sent -= timedelta(minutes=2)
+
+    def test_send_email_without_partners(self):
+        listing = self.env['real.estate.property'].create({
+            'name': 'No Bidder Listing',
+            'expected_price': 100_000,
+        })
+        with self.assertRaises(UserError):
+            listing.action_send_email()
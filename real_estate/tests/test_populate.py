@@ -0,0 +1,20 @@
+from unittest.mock import patch
+
+from odoo.cli.populate import Populate
+from odoo.tests.common import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestPopulate(TransactionCase):
+
+    def test_populate_small(self):
+        """The generated offers can be accepted and their listings sold."""
+        with patch.object(self.env.cr, 'commit'):
+            Populate.populate(self.env, 'small', ['real.estate.property.offer'])
+
+        accepted = self.env['real.estate.property.offer'].search([('status', '=', 'accepted')])
+        self.assertTrue(accepted)
+        for offer in accepted:
+            self.assertEqual(offer.property_id.selling_price, offer.price)
+            self.assertGreaterEqual(offer.price, offer.property_id.expected_price * 0.9)
+        self.assertTrue(self.env['real.estate.property'].search_count([('state', '=', 'sold')]))
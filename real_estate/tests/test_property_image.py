@@ -0,0 +1,65 @@
+import base64
+import io
+import shutil
+import tempfile
+
+from PIL import Image
+
+from odoo.exceptions import UserError
+from odoo.tests.common import TransactionCase, new_test_user, tagged
+from odoo.tools.image import base64_to_image
+
+
+@tagged('post_install', '-at_install')
+class TestPropertyImage(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Image = cls.env['real.estate.property.image']
+        cls.property = cls.env['real.estate.property'].create({
+            'name': 'Image Listing',
+            'expected_price': 100_000,
+        })
+        # Larger than the 512px variant kept in cold storage
+        stream = io.BytesIO()
+        Image.new('RGB', (1024, 768), 'teal').save(stream, format='PNG')
+        cls.content = base64.b64encode(stream.getvalue())
+
+    def setUp(self):
+        super().setUp()
+        self.cold_storage_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cold_storage_path)
+        self.env['ir.config_parameter'].set_param('real_estate.cold_storage_path', self.cold_storage_path)
+
+    def _create_image(self):
+        return self.Image.create({'name': 'front.png', 'property_id': self.property.id, 'image': self.content})
+
+    def test_upload_after_cold_storage(self):
+        cold_image = self._create_image()
+        cold_image._move_to_cold_storage(self.cold_storage_path)
+        self.assertTrue(cold_image.cold_storage_path)
+
+        # The same upload keeps its full size, not the variant in cold storage
+        image = self._create_image().with_context(bin_size=False)
+        self.assertEqual(base64_to_image(image.image).size, (1024, 768))
+
+        cold_image._restore_from_cold_storage()
+        self.assertEqual(base64_to_image(cold_image.with_context(bin_size=False).image).size, (1024, 768))
+
+    def test_cold_storage_path_outside_directory(self):
+        image = self._create_image()
+        image._move_to_cold_storage(self.cold_storage_path)
+        image.write({'cold_storage_path': '/etc/passwd'})
+        with self.assertRaises(UserError):
+            image._restore_from_cold_storage()
+
+    def test_protected_fields(self):
+        salesperson = new_test_user(
+            self.env, login='image_salesperson', groups='base.group_user,real_estate.group_real_estate_user',
+        )
+        image = self._create_image()
+        checksum = image.checksum
+        image.with_user(salesperson).write({'checksum': '../../x', 'cold_storage_path': '/etc/passwd'})
+        self.assertEqual(image.checksum, checksum)
+        self.assertFalse(image.cold_storage_path)
@@ -0,0 +1,276 @@
+import json
+import logging
+import os
+
+from odoo.tests.common import TransactionCase, tagged
+
+from odoo.addons.real_estate.models.property import BULK_IMPORT_CONTEXT
+
+_logger = logging.getLogger(__name__)
+
+SIZES = [1, 10, 100]
+# Set to a file name to write the measured counts there, to pin them below
+OUTPUT_FILE = os.environ.get('REAL_ESTATE_QUERY_COUNTS_OUTPUT')
+
+# Number of queries of each action and compute, flush included. They do not
+# depend on the number of records: every method of the module must be
+# set-based, so the runs on 10 and 100 records must take exactly the same
+# number of queries, and one query per record fails the test.
+# More queries fail the test, fewer log a warning: pin the counts to the ones
+# measured (REAL_ESTATE_QUERY_COUNTS_OUTPUT), and only raise one with a reason.
+QUERY_COUNTS = {
+    'property_create': 11,
+    'property_action_sold': 7,
+    'property_action_cancel': 7,
+    'property_action_mark_as_rented': 7,
+    'property_compute_total_area': 3,
+    'property_compute_best_offer': 4,
+    'offer_create': 12,
+    'offer_action_accept': 12,
+    'offer_action_refuse': 4,
+    'offer_compute_date_deadline': 3,
+    'type_compute_property_count': 3,
+    'type_action_view_properties': 2,
+    'property_kanban_page': 4,
+    'property_kanban_page_cold': 6,
+    'property_geocode': 6,
+}
+
+# Postcodes of the test centroids, shared by the listings in turn
+POSTCODES = ['QC1 1AA', 'QC2 2BB', 'QC3 3CC']
+
+# Fields of the kanban cards, the type and tags are shown with their color
+KANBAN_FIELDS = ['name', 'property_type_id', 'tag_ids', 'expected_price', 'state']
+
+
+@tagged('post_install', '-at_install')
+class TestQueryCounts(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Mail tracking has a per-record cost of its own, only the queries of
+        # the module are counted here
+        cls.env = cls.env(context=dict(cls.env.context, **BULK_IMPORT_CONTEXT))
+        cls.Property = cls.env['real.estate.property']
+        cls.Offer = cls.env['real.estate.property.offer']
+        cls.PropertyType = cls.env['real.estate.property.type']
+        cls.property_type = cls.PropertyType.create({'name': 'Query Count Type'})
+        cls.partners = cls.env['res.partner'].create([
+            {'name': 'Query Count Buyer %s' % index} for index in range(max(SIZES))
+        ])
+        cls.env['real.estate.postcode.centroid'].create([
+            {'postcode': postcode, 'latitude': 51.5 + index, 'longitude': -0.1 - index}
+            for index, postcode in enumerate(POSTCODES)
+        ])
+        cls.tags = cls.env['real.estate.property.tag'].create([
+            {'name': 'Query Count Tag %s' % index, 'color': index} for index in range(3)
+        ])
+
+    def _create_properties(self, count):
+        # Distinct values, so that per-record writes are not grouped away
+        return self.Property.create([{
+            'name': 'Query Count Listing %s' % index,
+            'expected_price': 100_000 + index * 1000,
+            'living_area': 80 + index,
+            'property_type_id': self.property_type.id,
+        } for index in range(count)])
+
+    def _create_offers_on(self, properties, price=95_000):
+        # Distinct prices and buyers, above 90% of the expected prices
+        return self.Offer.create([{
+            'property_id': prop.id,
+            'partner_id': self.partners[index].id,
+            'price': price + index * 1000,
+        } for index, prop in enumerate(properties)])
+
+    def _create_offers(self, count, price=95_000):
+        return self._create_offers_on(self._create_properties(count), price)
+
+    def _create_accepted_properties(self, count):
+        offers = self._create_offers(count)
+        offers.action_accept()
+        return offers.property_id
+
+    def _recompute(self, records, fname):
+        self.env.add_to_compute(records._fields[fname], records)
+
+    def assertQueryCounts(self, operation, prepare, run):
+        """Check the query count of ``run(records)`` on the records returned
+        by ``prepare(size)``, for each size."""
+        # Warm up the ormcaches (access rights, ...)
+        run(prepare(1))
+        self.env.flush_all()
+        counts = {}
+        for size in SIZES:
+            records = prepare(size)
+            self.env.flush_all()
+            self.env.invalidate_all()
+            queries = self.cr.sql_log_count
+            run(records)
+            self.env.flush_all()
+            counts[size] = self.cr.sql_log_count - queries
+        self._record_counts(operation, counts)
+        # A single record may skip some queries, larger batches may not differ
+        self.assertEqual(
+            counts[SIZES[-2]], counts[SIZES[-1]],
+            "%s takes more queries on more records: %s" % (operation, counts),
+        )
+        self.assertQueryCountPinned(operation, max(counts.values()))
+
+    def assertQueryCountPinned(self, operation, count):
+        self.assertLessEqual(
+            count, QUERY_COUNTS[operation],
+            "%s took %s queries, expected %s" % (operation, count, QUERY_COUNTS[operation]),
+        )
+        if count < QUERY_COUNTS[operation]:
+            _logger.warning(
+                "%s took %s queries instead of %s, lower its count",
+                operation, count, QUERY_COUNTS[operation],
+            )
+
+    def _record_counts(self, operation, counts):
+        """Add the measured counts of ``operation`` to the output file."""
+        if not OUTPUT_FILE:
+            return
+        measured = {}
+        if os.path.exists(OUTPUT_FILE):
+            with open(OUTPUT_FILE) as output:
+                measured = json.load(output)
+        measured[operation] = {str(size): count for size, count in counts.items()}
+        with open(OUTPUT_FILE, 'w') as output:
+            json.dump(measured, output, indent=2, sort_keys=True)
+
+    def test_property_create(self):
+        self.assertQueryCounts('property_create', lambda size: size, self._create_properties)
+
+    def test_property_action_sold(self):
+        self.assertQueryCounts(
+            'property_action_sold', self._create_accepted_properties,
+            lambda properties: properties.action_sold(),
+        )
+
+    def test_property_action_cancel(self):
+        self.assertQueryCounts(
+            'property_action_cancel', self._create_properties,
+            lambda properties: properties.action_cancel(),
+        )
+
+    def test_property_action_mark_as_rented(self):
+        self.assertQueryCounts(
+            'property_action_mark_as_rented', self._create_properties,
+            lambda properties: properties.action_mark_as_rented(),
+        )
+
+    def test_property_compute_total_area(self):
+        self.assertQueryCounts(
+            'property_compute_total_area', self._create_properties,
+            lambda properties: self._recompute(properties, 'total_area'),
+        )
+
+    def test_property_compute_best_offer(self):
+        self.assertQueryCounts(
+            'property_compute_best_offer', lambda size: self._create_offers(size).property_id,
+            lambda properties: self._recompute(properties, 'best_offer'),
+        )
+
+    def test_offer_create(self):
+        self.assertQueryCounts('offer_create', self._create_properties, self._create_offers_on)
+
+    def test_offer_action_accept(self):
+        refused = self.Offer
+
+        def prepare(size):
+            nonlocal refused
+            properties = self._create_properties(size)
+            # Lower offers on the same properties, refused when accepting
+            refused |= self._create_offers_on(properties, price=90_000)
+            return self._create_offers_on(properties, price=95_000)
+
+        self.assertQueryCounts('offer_action_accept', prepare, lambda offers: offers.action_accept())
+        self.assertEqual(set(refused.mapped('status')), {'refused'})
+
+    def test_offer_action_refuse(self):
+        self.assertQueryCounts(
+            'offer_action_refuse', self._create_offers, lambda offers: offers.action_refuse(),
+        )
+
+    def test_offer_compute_date_deadline(self):
+        self.assertQueryCounts(
+            'offer_compute_date_deadline', self._create_offers,
+            lambda offers: self._recompute(offers, 'date_deadline'),
+        )
+
+    def test_type_compute_property_count(self):
+        def prepare(size):
+            types = self.PropertyType.create([
+                {'name': 'Query Count Type %s-%s' % (size, index)} for index in range(size)
+            ])
+            self.Property.create([{
+                'name': 'Query Count Listing',
+                'expected_price': 100_000,
+                'property_type_id': property_type.id,
+            } for property_type in types])
+            return types
+
+        self.assertQueryCounts(
+            'type_compute_property_count', prepare,
+            lambda types: self._recompute(types, 'property_count'),
+        )
+
+    def test_type_action_view_properties(self):
+        # A single-record action, measured on one record only
+        self.property_type.invalidate_recordset()
+        queries = self.cr.sql_log_count
+        self.property_type.action_view_properties()
+        count = self.cr.sql_log_count - queries
+        self._record_counts('type_action_view_properties', {1: count})
+        self.assertQueryCountPinned('type_action_view_properties', count)
+
+    def test_property_kanban_page(self):
+        def prepare(size):
+            properties = self._create_properties(size)
+            properties.tag_ids = self.tags
+            return properties
+
+        def render(properties):
+            # Reads of the web client: the cards, then the names and colors
+            # of their tags, the type names and the tags are cached
+            records = self.Property.web_search_read([('id', 'in', properties.ids)], KANBAN_FIELDS, limit=80)
+            tag_ids = {tag_id for record in records['records'] for tag_id in record['tag_ids']}
+            self.env['real.estate.property.tag'].browse(tag_ids).read(['display_name', 'color'])
+
+        def render_cold(properties):
+            # The type and tag lookups are read again
+            self.PropertyType._clear_lookup(signal=False)
+            self.env['real.estate.property.tag']._clear_lookup(signal=False)
+            render(properties)
+
+        self.assertQueryCounts('property_kanban_page', prepare, render)
+        self.assertQueryCounts('property_kanban_page_cold', prepare, render_cold)
+
+        # The cached lookups save the reads of the type and tag names
+        properties = prepare(10)
+        counts = {}
+        for name, run in (('cold', render_cold), ('warm', render)):
+            self.env.flush_all()
+            self.env.invalidate_all()
+            queries = self.cr.sql_log_count
+            run(properties)
+            counts[name] = self.cr.sql_log_count - queries
+        self.assertLess(counts['warm'], counts['cold'], counts)
+
+    def test_property_geocode(self):
+        def prepare(size):
+            properties = self.Property.create([{
+                'name': 'Query Count Listing %s' % index,
+                'expected_price': 100_000 + index * 1000,
+                'postcode': POSTCODES[index % len(POSTCODES)],
+            } for index in range(size)])
+            properties.write({'latitude': 0.0, 'longitude': 0.0})
+            return properties
+
+        # One write per centroid: bounded by the number of postcodes
+        self.assertQueryCounts(
+            'property_geocode', prepare, lambda properties: properties._geocode_from_postcodes(),
+        )
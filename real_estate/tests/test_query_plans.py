@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase, new_test_user, tagged
+
+from .test_benchmarks import AVAILABLE_DOMAIN, LIST_INDEXES
+
+
+@tagged('post_install', '-at_install')
+class TestQueryPlans(TransactionCase):
+    """The list and kanban queries can be served by the declared indexes.
+
+    The test tables are tiny, so sequential scans are disabled: the planner
+    then picks an index whenever one matches the query, and falls back to a
+    (very costly) sequential scan otherwise.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.Property = cls.env['real.estate.property']
+        cls.salesperson = new_test_user(
+            cls.env, login='plan_salesperson', groups='base.group_user,real_estate.group_real_estate_user',
+        )
+        cls.properties = cls.Property.create([{
+            'name': 'Query Plan Listing %s' % index,
+            'expected_price': 100_000 + index,
+            'user_id': cls.salesperson.id if index % 2 else False,
+        } for index in range(20)])
+
+    def setUp(self):
+        super().setUp()
+        self.env.flush_all()
+        self.env.cr.execute('SET enable_seqscan = off')
+        self.addCleanup(self.env.cr.execute, 'RESET enable_seqscan')
+
+    @contextmanager
+    def capture_queries(self):
+        """Collect the ``(query, params)`` executed in the block."""
+        queries = []
+        execute = self.env.cr.execute
+
+        def capture(query, params=None, *args, **kwargs):
+            queries.append((query, params))
+            return execute(query, params, *args, **kwargs)
+
+        with patch.object(self.env.cr, 'execute', capture):
+            yield queries
+
+    def explain(self, query, params):
+        self.env.cr.execute('EXPLAIN ' + query, params)
+        return '\n'.join(row[0] for row in self.env.cr.fetchall())
+
+    def assertUsesIndex(self, plan, indexes):
+        self.assertTrue(
+            any(index in plan for index in indexes),
+            "The query uses none of %s:\n%s" % (', '.join(indexes), plan),
+        )
+        self.assertNotIn('Seq Scan on real_estate_property ', plan)
+
+    def test_list_query_plan(self):
+        query = self.Property.with_user(self.salesperson)._search(AVAILABLE_DOMAIN, limit=80)
+        self.assertUsesIndex(self.explain(*query.select()), LIST_INDEXES)
+
+    def test_kanban_read_group_plan(self):
+        # The kanban columns of a manager: grouped by state, no record rule
+        with self.capture_queries() as queries:
+            self.Property.read_group(AVAILABLE_DOMAIN, ['state'], ['state'])
+        query, params = next((query, params) for query, params in queries if 'GROUP BY' in query)
+        self.assertUsesIndex(self.explain(query, params), ['real_estate_property_state_idx'])
+
+    def test_offer_list_plan(self):
+        query = self.env['real.estate.property.offer']._search([('property_id', '=', self.properties[0].id)])
+        plan = self.explain(*query.select())
+        self.assertIn('real_estate_property_offer_property_price_idx', plan)
@@ -0,0 +1,39 @@
+from psycopg2 import IntegrityError
+
+from odoo.tests.common import TransactionCase, tagged
+from odoo.tools import mute_logger
+
+
+@tagged('post_install', '-at_install')
+class TestSavedSearch(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.partner = cls.env['res.partner'].create({'name': 'Buyer', 'email': 'buyer@example.com'})
+        cls.search = cls.env['real.estate.saved.search'].create({
+            'name': 'Family home',
+            'partner_id': cls.partner.id,
+            'price_min': 200_000,
+        })
+
+    def test_price_range(self):
+        # No maximum
+        self.assertEqual(self.search.price_max, 0)
+        self.search.price_max = 300_000
+
+        with mute_logger('odoo.sql_db'), self.assertRaises(IntegrityError), self.env.cr.savepoint():
+            self.env['real.estate.saved.search'].create({
+                'name': 'Typo',
+                'partner_id': self.partner.id,
+                'price_min': 500_000,
+                'price_max': 300_000,
+            })
+        with mute_logger('odoo.sql_db'), self.assertRaises(IntegrityError), self.env.cr.savepoint():
+            self.search.price_min = 400_000
+            self.search.flush_recordset()
+
+    def test_match_properties(self):
+        prop = self.env['real.estate.property'].create({'name': 'Match', 'expected_price': 250_000})
+        self.env['real.estate.saved.search']._match_properties(prop)
+        self.assertEqual(self.search.match_ids.property_id, prop)
@@ -0,0 +1,2 @@
+from . import property_import
+from . import property_merge
@@ -0,0 +1,60 @@
+from odoo import fields, models, _
+from odoo.exceptions import UserError
+
+
+class PropertyImport(models.TransientModel):
+    _name = 'real.estate.property.import'
+    _description = 'Import Real Estate Listings'
+
+    file = fields.Binary(
+        string='File',
+        required=True,
+    )
+    filename = fields.Char(
+        string='File Name',
+    )
+    file_type = fields.Selection(
+        selection=[
+            ('csv', 'CSV'),
+            ('jsonl', 'JSON Lines'),
+        ],
+        string='File Type',
+        required=True,
+        default='csv',
+    )
+    chunk_size = fields.Integer(
+        string='Chunk Size',
+        default=1000,
+        required=True,
+    )
+    bulk_mode = fields.Boolean(
+        string='Bulk Mode',
+        default=True,
+        help="Create the properties without field tracking and chatter messages",
+    )
+
+    def action_import(self):
+        """Queue the import of the file and open its progress."""
+        self.ensure_one()
+        if not self.file:
+            raise UserError(_("Please select a file to import."))
+        job = self.env['real.estate.import.job'].create({
+            'name': self.filename or _("Listing Import"),
+            'file_type': self.file_type,
+            'chunk_size': self.chunk_size,
+            'bulk_mode': self.bulk_mode,
+        })
+        job.attachment_id = self.env['ir.attachment'].create({
+            'name': self.filename or job.name,
+            'datas': self.file,
+            'res_model': job._name,
+            'res_id': job.id,
+        })
+        self.env.ref('real_estate.ir_cron_run_import_jobs')._trigger()
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': job._name,
+            'res_id': job.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
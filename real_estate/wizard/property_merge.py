@@ -0,0 +1,78 @@
+from odoo import api, fields, models, _
+from odoo.exceptions import UserError
+
+
+class PropertyMerge(models.TransientModel):
+    _name = 'real.estate.property.merge'
+    _description = 'Merge Duplicate Listings'
+
+    duplicate_id = fields.Many2one(
+        comodel_name='real.estate.property.duplicate',
+        string='Duplicates',
+    )
+    property_ids = fields.Many2many(
+        comodel_name='real.estate.property',
+        string='Listings',
+        required=True,
+    )
+    target_id = fields.Many2one(
+        comodel_name='real.estate.property',
+        string='Keep',
+        required=True,
+        domain="[('id', 'in', property_ids)]",
+        help="The listing receiving the offers, images and tags of the others, which are archived.",
+    )
+
+    @api.model
+    def default_get(self, fields_list):
+        res = super(PropertyMerge, self).default_get(fields_list)
+        if res.get('duplicate_id'):
+            properties = self.env['real.estate.property.duplicate'].browse(res['duplicate_id']).property_ids
+        elif self.env.context.get('active_model') == 'real.estate.property':
+            properties = self.env['real.estate.property'].browse(self.env.context.get('active_ids'))
+        else:
+            return res
+        res['property_ids'] = [(6, 0, properties.ids)]
+        # Keep the most advanced listing, then the oldest
+        states = ['sold', 'offer_accepted', 'offer_received', 'new']
+        target = min(properties, key=lambda prop: (
+            states.index(prop.state) if prop.state in states else len(states), prop.id,
+        ), default=None)
+        if target:
+            res['target_id'] = target.id
+        return res
+
+    def action_merge(self):
+        """Move the offers, images and tags of the listings onto the kept
+        one, and archive the others."""
+        self.ensure_one()
+        target = self.target_id
+        sources = self.property_ids - target
+        if not sources:
+            raise UserError(_("Select at least two listings to merge."))
+        if target not in self.property_ids:
+            raise UserError(_("The listing to keep must be one of the merged listings."))
+        if sources.filtered(lambda prop: prop.state in ['offer_accepted', 'sold']):
+            raise UserError(_("Listings with an accepted offer or sold can only be kept, not merged into another one."))
+
+        sources.offer_ids.write({'property_id': target.id})
+        sources.property_image_ids.write({'property_id': target.id})
+        values = {'tag_ids': [(4, tag.id) for tag in sources.tag_ids - target.tag_ids]}
+        if not target.main_image_id:
+            values['main_image_id'] = sources.main_image_id[:1].id
+        if target.state == 'new' and target.offer_ids:
+            values['state'] = 'offer_received'
+        target.write(values)
+
+        target._message_log(body=_("Merged listings: %s", ', '.join(sources.mapped('display_name'))))
+        for source in sources:
+            source._message_log(body=_("Merged into %s", target.display_name))
+        sources.write({'active': False})
+        if self.duplicate_id:
+            self.duplicate_id.state = 'merged'
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': 'real.estate.property',
+            'res_id': target.id,
+            'view_mode': 'form',
+        }
@@ -0,0 +1,346 @@
+"""
+Concurrent Bidding Simulator
+============================
+
+Many bidders place offers and accept them concurrently on a few properties, to stress the
+"offer must be higher than the best one" rule and the accept logic of the Real Estate module.
+
+The simulator runs against the mock models of demo_real_estate.py, where each server call is a
+check followed by a write with a simulated database round trip in between, with one of these
+locking strategies:
+
+- none: the check and the write are not serialized
+- pessimistic: the property is locked from the check to the write (SELECT ... FOR UPDATE)
+- optimistic: the write fails when the property changed since the check, and the call is retried
+
+It can also run against a local Odoo over XML-RPC, which uses the locking of the module itself.
+It reports the accepted throughput, serialization failures, lost updates and latency percentiles.
+
+    python simulate_bidding.py --strategy all --bidders 32 --properties 20
+    python simulate_bidding.py --odoo http://localhost:8069 --db realestate --user admin --password admin
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import xmlrpc.client
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from demo_real_estate import Environment, Property, PropertyOffer
+
+STRATEGIES = ['none', 'pessimistic', 'optimistic']
+
+# Outcomes of a call
+ACCEPTED = 'accepted'
+REJECTED = 'rejected'
+SERIALIZATION_FAILURE = 'serialization_failure'
+
+# PostgreSQL errors of concurrent transactions, by pgcode, as named in the
+# tracebacks of the XML-RPC faults (psycopg2.errors.<name>)
+CONCURRENCY_ERRORS = {
+    '40001': 'SerializationFailure',
+    '40P01': 'DeadlockDetected',
+    '55P03': 'LockNotAvailable',
+}
+
+
+# ----------------------------------------------------------------------------------
+# Backends
+# ----------------------------------------------------------------------------------
+
+class MockBackend:
+    """Offers placed and accepted on the mock models, with a locking strategy"""
+
+    def __init__(self, strategy, property_count, latency=0.001, max_retries=5):
+        self.strategy = strategy
+        self.latency = latency
+        self.max_retries = max_retries
+        self.env = Environment()
+        self.property_ids = [
+            self.env.create(Property, {'name': f'Bidding Property {index}', 'expected_price': 100_000.0}).id
+            for index in range(1, property_count + 1)
+        ]
+        # Row locks of the pessimistic strategy, versions of the optimistic one
+        self._locks = {property_id: threading.Lock() for property_id in self.property_ids}
+        self._versions = Counter()
+        # Mutations of the shared environment (indexes, sequences) are atomic
+        self._write_lock = threading.Lock()
+
+    def best_offer(self, property_id):
+        return self.env.browse(Property, property_id).best_offer
+
+    def _round_trip(self):
+        time.sleep(self.latency)
+
+    def _transaction(self, property_id, check, write):
+        """Run ``check`` then ``write`` on the property with the locking
+        strategy, return the outcome and the number of retries"""
+        prop = self.env.browse(Property, property_id)
+        if self.strategy == 'pessimistic':
+            with self._locks[property_id]:
+                if not check(prop):
+                    return REJECTED, 0
+                self._round_trip()
+                with self._write_lock:
+                    write(prop)
+                return ACCEPTED, 0
+
+        for retry in range(self.max_retries + 1):
+            version = self._versions[property_id]
+            if not check(prop):
+                return REJECTED, retry
+            self._round_trip()
+            with self._write_lock:
+                if self.strategy == 'optimistic' and self._versions[property_id] != version:
+                    continue
+                write(prop)
+                self._versions[property_id] += 1
+                return ACCEPTED, retry
+        return SERIALIZATION_FAILURE, self.max_retries
+
+    def place_bid(self, property_id, partner, price):
+        # The offer rules of the demo models, split around the round trip
+        def check(prop):
+            return prop._check_offer(price) is None
+
+        def write(prop):
+            prop._add_offer(price, partner)
+
+        return self._transaction(property_id, check, write)
+
+    def accept_best(self, property_id):
+        offers = []
+
+        def check(prop):
+            pending = [offer for offer in prop.offers if offer.status == 'pending']
+            offers[:] = pending and [max(pending, key=lambda offer: offer.price)]
+            return bool(offers) and offers[0]._check_accept() is None
+
+        def write(prop):
+            offers[0]._accept()
+
+        return self._transaction(property_id, check, write)
+
+    def offers(self):
+        """``(property_id, price, status)`` of the offers, in creation order"""
+        return [
+            (offer.property_id, offer.price, offer.status)
+            for offer in sorted(self.env.records[PropertyOffer._name].values(), key=lambda offer: offer.id)
+        ]
+
+
+class OdooBackend:
+    """Offers placed and accepted on an Odoo database over XML-RPC"""
+
+    strategy = 'odoo'
+
+    def __init__(self, url, db, user, password, property_count):
+        self.url, self.db, self.password = url, db, password
+        self.uid = xmlrpc.client.ServerProxy(f'{url}/xmlrpc/2/common').authenticate(db, user, password, {})
+        if not self.uid:
+            raise SystemExit("Odoo authentication failed")
+        self._local = threading.local()
+        self.property_ids = self._execute('real.estate.property', 'create', [
+            {'name': f'Bidding Property {index}', 'expected_price': 100_000.0}
+            for index in range(1, property_count + 1)
+        ])
+        self._partners = {}
+        self._partners_lock = threading.Lock()
+
+    def _execute(self, model, method, *args, **kwargs):
+        # ServerProxy objects are not thread-safe, one per thread
+        if not hasattr(self._local, 'proxy'):
+            self._local.proxy = xmlrpc.client.ServerProxy(f'{self.url}/xmlrpc/2/object', allow_none=True)
+        return self._local.proxy.execute_kw(self.db, self.uid, self.password, model, method, list(args), kwargs)
+
+    def _call(self, model, method, *args):
+        try:
+            self._execute(model, method, *args)
+        except xmlrpc.client.Fault as error:
+            if any(f'psycopg2.errors.{name}' in error.faultString for name in CONCURRENCY_ERRORS.values()):
+                return SERIALIZATION_FAILURE, 0
+            return REJECTED, 0
+        return ACCEPTED, 0
+
+    def partner_id(self, partner):
+        # Held during the creation, so that a partner is created only once
+        with self._partners_lock:
+            if partner not in self._partners:
+                self._partners[partner] = self._execute('res.partner', 'create', {'name': partner})
+            return self._partners[partner]
+
+    def best_offer(self, property_id):
+        return self._execute('real.estate.property', 'read', [property_id], ['best_offer'])[0]['best_offer']
+
+    def place_bid(self, property_id, partner, price):
+        return self._call('real.estate.property.offer', 'create', {
+            'property_id': property_id,
+            'partner_id': self.partner_id(partner),
+            'price': price,
+        })
+
+    def accept_best(self, property_id):
+        offer_ids = self._execute(
+            'real.estate.property.offer', 'search',
+            [('property_id', '=', property_id), ('status', '=', 'pending')], limit=1, order='price desc',
+        )
+        if not offer_ids:
+            return REJECTED, 0
+        return self._call('real.estate.property.offer', 'action_accept', offer_ids)
+
+    def offers(self):
+        return [
+            (offer['property_id'][0], offer['price'], offer['status'])
+            for offer in self._execute(
+                'real.estate.property.offer', 'search_read',
+                [('property_id', 'in', self.property_ids)], ['property_id', 'price', 'status'], order='id',
+            )
+        ]
+
+
+# ----------------------------------------------------------------------------------
+# Simulation
+# ----------------------------------------------------------------------------------
+
+def percentile(values, ratio):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(ratio * len(values)))]
+
+
+def count_lost_updates(offers):
+    """Offers created below a better offer of their property, and second
+    accepted offers of a property: writes that ignored a concurrent one"""
+    best = defaultdict(float)
+    accepted = Counter()
+    lost = 0
+    for property_id, price, status in offers:
+        if price <= best[property_id]:
+            lost += 1
+        best[property_id] = max(best[property_id], price)
+        if status == 'accepted':
+            accepted[property_id] += 1
+    return lost + sum(count - 1 for count in accepted.values() if count > 1)
+
+
+def run_bidders(backend, bidders, bids, accept_ratio=0.002, seed=0):
+    """Run ``bidders`` concurrent bidders placing ``bids`` calls each, and
+    return the report of the run"""
+    outcomes = Counter()
+    retries = Counter()
+    latencies = defaultdict(list)
+    lock = threading.Lock()
+
+    def bidder(number):
+        rng = random.Random(seed * 100_003 + number)
+        partner = f'Bidder {number}'
+        local_outcomes, local_retries, local_latencies = Counter(), Counter(), defaultdict(list)
+        for __ in range(bids):
+            property_id = rng.choice(backend.property_ids)
+            if rng.random() < accept_ratio:
+                operation = 'accept'
+                start = time.perf_counter()
+                outcome, retry = backend.accept_best(property_id)
+            else:
+                operation = 'bid'
+                # The bidder outbids the best offer it has seen
+                price = round(max(backend.best_offer(property_id), 90_000.0) * (1 + rng.uniform(0.001, 0.02)), 2)
+                start = time.perf_counter()
+                outcome, retry = backend.place_bid(property_id, partner, price)
+            local_latencies[operation].append(time.perf_counter() - start)
+            local_outcomes[operation, outcome] += 1
+            local_retries[operation] += retry
+        with lock:
+            outcomes.update(local_outcomes)
+            retries.update(local_retries)
+            for operation, values in local_latencies.items():
+                latencies[operation].extend(values)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=bidders) as executor:
+        list(executor.map(bidder, range(1, bidders + 1)))
+    elapsed = time.perf_counter() - start
+
+    accepted = outcomes['bid', ACCEPTED] + outcomes['accept', ACCEPTED]
+    return {
+        'strategy': backend.strategy,
+        'bidders': bidders,
+        'calls': sum(outcomes.values()),
+        'elapsed': round(elapsed, 3),
+        'accepted_per_second': round(accepted / elapsed, 1) if elapsed else 0.0,
+        'outcomes': {f'{operation}_{outcome}': count for (operation, outcome), count in sorted(outcomes.items())},
+        'retries': dict(retries),
+        'serialization_failures': outcomes['bid', SERIALIZATION_FAILURE] + outcomes['accept', SERIALIZATION_FAILURE],
+        'lost_updates': count_lost_updates(backend.offers()),
+        'latency_ms': {
+            operation: {
+                f'p{int(ratio * 100)}': round(percentile(values, ratio) * 1000, 2)
+                for ratio in (0.5, 0.95, 0.99)
+            }
+            for operation, values in sorted(latencies.items())
+        },
+    }
+
+
+def print_report(report):
+    """Display a run report in a formatted way"""
+    print("=" * 60)
+    print(f"🔨 {report['strategy']}: {report['calls']:,} calls by {report['bidders']} bidders "
+          f"in {report['elapsed']:.2f}s")
+    print("=" * 60)
+    print(f"Accepted: {report['accepted_per_second']:,} calls/s")
+    print("Outcomes: " + ", ".join(f"{name} {count:,}" for name, count in report['outcomes'].items()))
+    print(f"Serialization failures: {report['serialization_failures']:,} - "
+          f"Retries: {sum(report['retries'].values()):,}")
+    print(f"Lost updates: {report['lost_updates']:,}")
+    for operation, values in report['latency_ms'].items():
+        print(f"Latency {operation}: " + ", ".join(f"{name} {value}ms" for name, value in values.items()))
+    print()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Stress the offer rules with concurrent bidders.")
+    parser.add_argument('--strategy', choices=STRATEGIES + ['all'], default='all',
+                        help="locking strategy of the mock backend (default: all)")
+    parser.add_argument('--bidders', type=int, default=16, help="concurrent bidders (default: 16)")
+    parser.add_argument('--bids', type=int, default=200, help="calls per bidder (default: 200)")
+    parser.add_argument('--properties', type=int, default=10,
+                        help="properties bid on, fewer means more contention (default: 10)")
+    parser.add_argument('--accept-ratio', type=float, default=0.002,
+                        help="share of the calls accepting the best offer, which closes the bidding on "
+                             "the property (default: 0.002)")
+    parser.add_argument('--latency', type=float, default=1.0,
+                        help="simulated database round trip of the mock backend, in ms (default: 1)")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    parser.add_argument('--json', action='store_true', help="print the reports as JSON lines")
+    parser.add_argument('--odoo', metavar='URL', help="run against this Odoo server instead of the mock models")
+    parser.add_argument('--db', help="Odoo database")
+    parser.add_argument('--user', default='admin', help="Odoo login (default: admin)")
+    parser.add_argument('--password', default='admin', help="Odoo password (default: admin)")
+    args = parser.parse_args(argv)
+
+    if args.odoo:
+        if not args.db:
+            parser.error("--db is required with --odoo")
+        backends = [OdooBackend(args.odoo, args.db, args.user, args.password, args.properties)]
+    else:
+        strategies = STRATEGIES if args.strategy == 'all' else [args.strategy]
+        backends = [MockBackend(strategy, args.properties, latency=args.latency / 1000) for strategy in strategies]
+
+    for backend in backends:
+        report = run_bidders(backend, args.bidders, args.bids, accept_ratio=args.accept_ratio, seed=args.seed)
+        if args.json:
+            print(json.dumps(report), flush=True)
+        else:
+            print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())